@@ -1,6 +1,7 @@
 # Date-wise & centre-wise breakdowns
 
 from ..db.connection import DatabaseConnection
+from ..utils.timeutils import range_bound_ordinal
 
 class BreakdownAggregator:
     """
@@ -39,14 +40,14 @@ class BreakdownAggregator:
             params.append(centre_id)
         
         if from_date:
-            query += " AND date >= ?"
-            params.append(from_date)
+            query += " AND date_ordinal >= ?"
+            params.append(range_bound_ordinal(from_date, 'from_date'))
         
         if to_date:
-            query += " AND date <= ?"
-            params.append(to_date)
+            query += " AND date_ordinal <= ?"
+            params.append(range_bound_ordinal(to_date, 'to_date'))
         
-        query += " GROUP BY date ORDER BY date"
+        query += " GROUP BY date_ordinal, date ORDER BY date_ordinal"
         
         results = self.db_conn.execute_query(query, params)
         
@@ -92,12 +93,12 @@ class BreakdownAggregator:
             params.append(date)
         
         if from_date:
-            query += " AND dws.date >= ?"
-            params.append(from_date)
+            query += " AND dws.date_ordinal >= ?"
+            params.append(range_bound_ordinal(from_date, 'from_date'))
         
         if to_date:
-            query += " AND dws.date <= ?"
-            params.append(to_date)
+            query += " AND dws.date_ordinal <= ?"
+            params.append(range_bound_ordinal(to_date, 'to_date'))
         
         query += " GROUP BY c.id, c.name ORDER BY total_quantity DESC"
         
@@ -141,12 +142,12 @@ class BreakdownAggregator:
         params = []
         
         if from_date:
-            query += " AND dws.date >= ?"
-            params.append(from_date)
+            query += " AND dws.date_ordinal >= ?"
+            params.append(range_bound_ordinal(from_date, 'from_date'))
         
         if to_date:
-            query += " AND dws.date <= ?"
-            params.append(to_date)
+            query += " AND dws.date_ordinal <= ?"
+            params.append(range_bound_ordinal(to_date, 'to_date'))
         
         query += " GROUP BY c.id, c.name ORDER BY total_quantity DESC LIMIT ?"
         params.append(limit)
@@ -190,12 +191,12 @@ class BreakdownAggregator:
         params = []
         
         if from_date:
-            query += " AND dws.date >= ?"
-            params.append(from_date)
+            query += " AND dws.date_ordinal >= ?"
+            params.append(range_bound_ordinal(from_date, 'from_date'))
         
         if to_date:
-            query += " AND dws.date <= ?"
-            params.append(to_date)
+            query += " AND dws.date_ordinal <= ?"
+            params.append(range_bound_ordinal(to_date, 'to_date'))
         
         query += " GROUP BY c.id, c.name ORDER BY total_amount DESC LIMIT ?"
         params.append(limit)
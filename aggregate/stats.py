@@ -1,6 +1,7 @@
 # Quantity/amount/farmer aggregates
 
 from ..db.connection import DatabaseConnection
+from ..utils.timeutils import range_bound_ordinal
 
 class StatsAggregator:
     """
@@ -34,12 +35,12 @@ class StatsAggregator:
             params.append(centre_id)
         
         if from_date:
-            query += " AND date >= ?"
-            params.append(from_date)
+            query += " AND date_ordinal >= ?"
+            params.append(range_bound_ordinal(from_date, 'from_date'))
         
         if to_date:
-            query += " AND date <= ?"
-            params.append(to_date)
+            query += " AND date_ordinal <= ?"
+            params.append(range_bound_ordinal(to_date, 'to_date'))
         
         result = self.db_conn.execute_query(query, params)
         
@@ -78,12 +79,12 @@ class StatsAggregator:
             params.append(centre_id)
         
         if from_date:
-            query += " AND date >= ?"
-            params.append(from_date)
+            query += " AND date_ordinal >= ?"
+            params.append(range_bound_ordinal(from_date, 'from_date'))
         
         if to_date:
-            query += " AND date <= ?"
-            params.append(to_date)
+            query += " AND date_ordinal <= ?"
+            params.append(range_bound_ordinal(to_date, 'to_date'))
         
         result = self.db_conn.execute_query(query, params)
         
@@ -122,12 +123,12 @@ class StatsAggregator:
             params.append(centre_id)
         
         if from_date:
-            query += " AND date >= ?"
-            params.append(from_date)
+            query += " AND date_ordinal >= ?"
+            params.append(range_bound_ordinal(from_date, 'from_date'))
         
         if to_date:
-            query += " AND date <= ?"
-            params.append(to_date)
+            query += " AND date_ordinal <= ?"
+            params.append(range_bound_ordinal(to_date, 'to_date'))
         
         result = self.db_conn.execute_query(query, params)
         
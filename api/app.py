@@ -1,13 +1,27 @@
 # FastAPI app entry
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from .routes import discovery, data, stats, search, export, sync, logs
+from ..db.pool import ConnectionPool
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Opens the shared database connection pool for the lifetime of the app.
+    """
+    app.state.db_pool = ConnectionPool()
+    try:
+        yield
+    finally:
+        app.state.db_pool.close()
 
 app = FastAPI(
     title="UPEOS - Uttar Pradesh E-Procurement Service",
     description="API for accessing and analyzing Uttar Pradesh paddy procurement data",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -0,0 +1,13 @@
+# Shared FastAPI dependencies
+
+from fastapi import Request
+
+def get_db(request: Request):
+    """
+    Dependency to get a database connection from the application pool.
+    """
+    db = request.app.state.db_pool.acquire()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -2,21 +2,12 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from ...db.connection import DatabaseConnection
+from ..dependencies import get_db
 from ...db.repositories.centre_repo import CentreRepository
 from ...db.repositories.summary_repo import SummaryRepository
 
 router = APIRouter()
 
-def get_db():
-    """
-    Dependency to get database connection.
-    """
-    db = DatabaseConnection()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/centres/{centre_name}/summary")
 async def get_centre_summary(centre_name: str, db: DatabaseConnection = Depends(get_db)):
     """
@@ -2,20 +2,11 @@
 
 from fastapi import APIRouter, Depends
 from ...db.connection import DatabaseConnection
+from ..dependencies import get_db
 from ...db.repositories.centre_repo import CentreRepository
 
 router = APIRouter()
 
-def get_db():
-    """
-    Dependency to get database connection.
-    """
-    db = DatabaseConnection()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/centres")
 async def list_centres(db: DatabaseConnection = Depends(get_db)):
     """
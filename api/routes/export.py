@@ -3,21 +3,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional
 from ...db.connection import DatabaseConnection
+from ..dependencies import get_db
 from ...export.exporter import Exporter
 from ...export.uploader import ReportUploader
 
 router = APIRouter()
 
-def get_db():
-    """
-    Dependency to get database connection.
-    """
-    db = DatabaseConnection()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/export/transactions/detailed")
 async def export_transactions_detailed(
     centre_id: Optional[int] = Query(None, description="Centre ID to filter by"),
@@ -41,6 +32,8 @@ async def export_transactions_detailed(
             result['upload'] = upload_result
         
         return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
@@ -66,6 +59,8 @@ async def export_daywise_statement(
             result['upload'] = upload_result
         
         return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
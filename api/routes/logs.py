@@ -3,20 +3,11 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from typing import Optional
 from ...db.connection import DatabaseConnection
+from ..dependencies import get_db
 from ...db.repositories.logs_repo import LogsRepository
 
 router = APIRouter()
 
-def get_db():
-    """
-    Dependency to get database connection.
-    """
-    db = DatabaseConnection()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/logs")
 async def get_activity_logs(
     component: Optional[str] = Query(None, description="Component to filter by"),
@@ -3,20 +3,11 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from typing import Optional, List
 from ...db.connection import DatabaseConnection
+from ..dependencies import get_db
 from ...search.engine import SearchEngine
 
 router = APIRouter()
 
-def get_db():
-    """
-    Dependency to get database connection.
-    """
-    db = DatabaseConnection()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/search/farmer")
 async def search_farmer(
     farmer_name: str = Query(..., description="Farmer name or partial name to search for"),
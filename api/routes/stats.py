@@ -1,22 +1,13 @@
 # Statistics API routes
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from ...db.connection import DatabaseConnection
+from ..dependencies import get_db
 from ...aggregate.stats import StatsAggregator
 from ...aggregate.breakdown import BreakdownAggregator
 
 router = APIRouter()
 
-def get_db():
-    """
-    Dependency to get database connection.
-    """
-    db = DatabaseConnection()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/stats")
 async def get_stats(
     centre_id: int = Query(None, description="Centre ID to filter by"),
@@ -41,7 +32,10 @@ async def get_total_quantity(
     Gets the total quantity aggregated by centre and/or date range.
     """
     aggregator = StatsAggregator(db)
-    total = aggregator.get_total_quantity(centre_id, from_date, to_date)
+    try:
+        total = aggregator.get_total_quantity(centre_id, from_date, to_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {"total_quantity": total}
 
 @router.get("/stats/total-amount")
@@ -55,7 +49,10 @@ async def get_total_amount(
     Gets the total amount aggregated by centre and/or date range.
     """
     aggregator = StatsAggregator(db)
-    total = aggregator.get_total_amount(centre_id, from_date, to_date)
+    try:
+        total = aggregator.get_total_amount(centre_id, from_date, to_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {"total_amount": total}
 
 @router.get("/stats/total-farmers")
@@ -69,7 +66,10 @@ async def get_total_farmers(
     Gets the total farmer count aggregated by centre and/or date range.
     """
     aggregator = StatsAggregator(db)
-    total = aggregator.get_total_farmers(centre_id, from_date, to_date)
+    try:
+        total = aggregator.get_total_farmers(centre_id, from_date, to_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {"total_farmers": total}
 
 @router.get("/stats/daily-breakdown")
@@ -83,7 +83,10 @@ async def get_daily_breakdown(
     Gets a date-wise breakdown of procurement data.
     """
     aggregator = BreakdownAggregator(db)
-    breakdown = aggregator.get_daily_breakdown(centre_id, from_date, to_date)
+    try:
+        breakdown = aggregator.get_daily_breakdown(centre_id, from_date, to_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {"daily_breakdown": breakdown}
 
 @router.get("/stats/centre-comparison")
@@ -97,5 +100,8 @@ async def get_centre_comparison(
     Gets a centre-wise comparison of procurement data.
     """
     aggregator = BreakdownAggregator(db)
-    comparison = aggregator.get_centre_comparison(date, from_date, to_date)
+    try:
+        comparison = aggregator.get_centre_comparison(date, from_date, to_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {"centre_comparison": comparison}
\ No newline at end of file
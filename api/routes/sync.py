@@ -1,20 +1,36 @@
 # Synchronization API routes
 
-from fastapi import APIRouter, Depends, HTTPException
+import threading
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from ...db.connection import DatabaseConnection
+from ...db.repositories.centre_repo import CentreRepository
+from ...db.repositories.change_repo import TransactionChangeRepository
+from ...fetcher.rate_limiter import get_rate_limiter
+from ...fetcher.retry import get_circuit_breaker
+from ...fetcher.session import get_session_pool
+from ..dependencies import get_db
 from ...sync.engine import SyncEngine
+from ...sync.jobs import SyncJobQueue
+from ...sync.planner import SYNC_MODES
 
 router = APIRouter()
 
-def get_db():
+# Held while a background task drains the sync job queue
+_drain_lock = threading.Lock()
+
+def _drain_sync_jobs():
     """
-    Dependency to get database connection.
+    Drains the sync job queue in the background, then releases the drain lock.
     """
-    db = DatabaseConnection()
+    from ...scripts.full_sync import FullSyncEngine
+    full_sync_engine = FullSyncEngine()
     try:
-        yield db
+        full_sync_engine.drain_jobs()
+        full_sync_engine.log_report()
     finally:
-        db.close()
+        full_sync_engine.cleanup()
+        _drain_lock.release()
 
 @router.post("/sync/all-centres")
 async def sync_all_centres(db: DatabaseConnection = Depends(get_db)):
@@ -24,7 +40,7 @@ async def sync_all_centres(db: DatabaseConnection = Depends(get_db)):
     sync_engine = SyncEngine(db)
     try:
         count = sync_engine.sync_all_centres()
-        return {"message": f"Synced {count} centres", "centres_synced": count}
+        return {"message": f"Synced {count} centres", "centres_synced": count, "report": sync_engine.get_report()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Synchronization failed: {str(e)}")
     finally:
@@ -38,7 +54,7 @@ async def sync_centre(centre_name: str, db: DatabaseConnection = Depends(get_db)
     sync_engine = SyncEngine(db)
     try:
         count = sync_engine.sync_centre_datewise_data(centre_name)
-        return {"message": f"Synced {count} date-wise entries for centre {centre_name}", "entries_synced": count}
+        return {"message": f"Synced {count} date-wise entries for centre {centre_name}", "entries_synced": count, "report": sync_engine.get_report()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Synchronization failed: {str(e)}")
     finally:
@@ -52,8 +68,93 @@ async def sync_centre_date(centre_name: str, date: str, db: DatabaseConnection =
     sync_engine = SyncEngine(db)
     try:
         count = sync_engine.sync_farmer_details(centre_name, date)
-        return {"message": f"Synced {count} farmer transactions for centre {centre_name} on date {date}", "transactions_synced": count}
+        return {"message": f"Synced {count} farmer transactions for centre {centre_name} on date {date}", "transactions_synced": count, "report": sync_engine.get_report()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Synchronization failed: {str(e)}")
     finally:
-        sync_engine.close()
\ No newline at end of file
+        sync_engine.close()
+
+@router.post("/sync/jobs")
+async def start_sync_run(
+    background_tasks: BackgroundTasks,
+    mode: Optional[str] = Query(None, description="Sync mode: missing_only, stale_only or full"),
+    db: DatabaseConnection = Depends(get_db)
+):
+    """
+    Queues a full synchronization run (or resumes an interrupted one) and drains it in the background.
+    """
+    if mode and mode not in SYNC_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid sync mode: {mode}")
+    
+    if not _drain_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A sync run is already in progress")
+    
+    try:
+        job_queue = SyncJobQueue(db)
+        started = job_queue.start_run(mode)
+    except Exception as e:
+        _drain_lock.release()
+        raise HTTPException(status_code=500, detail=f"Failed to queue sync run: {str(e)}")
+    
+    background_tasks.add_task(_drain_sync_jobs)
+    message = "Queued a new sync run" if started else "Resumed the interrupted sync run"
+    return {"message": message, "jobs": job_queue.get_status()}
+
+@router.get("/sync/jobs")
+async def get_sync_jobs(db: DatabaseConnection = Depends(get_db)):
+    """
+    Gets the state of the sync job queue and the jobs that failed after all attempts.
+    """
+    job_queue = SyncJobQueue(db)
+    return {
+        "jobs": job_queue.get_status(),
+        "failed": job_queue.get_failed_jobs()
+    }
+
+@router.get("/sync/changes")
+async def get_transaction_changes(
+    centre_name: Optional[str] = Query(None, description="Only changes to this centre"),
+    date: Optional[str] = Query(None, description="Only changes to this date (DD/MM/YYYY)"),
+    limit: int = Query(100, description="Maximum number of changes to return"),
+    db: DatabaseConnection = Depends(get_db)
+):
+    """
+    Gets the log of farmer transactions added and removed by resyncs, newest first.
+    """
+    centre_id = None
+    if centre_name:
+        centre = CentreRepository(db).get_centre_by_name(centre_name)
+        if not centre:
+            raise HTTPException(status_code=404, detail=f"Centre not found: {centre_name}")
+        centre_id = centre['id']
+    return {"changes": TransactionChangeRepository(db).get_changes(centre_id, date, limit)}
+
+@router.get("/sync/rate-limit")
+async def get_rate_limit_metrics():
+    """
+    Gets the per-host request counts, time spent waiting on the rate limit versus fetching,
+    circuit breaker state and the shared upstream session.
+    """
+    rate_limiter = get_rate_limiter()
+    return {
+        "requests_per_second": rate_limiter.rate,
+        "burst": rate_limiter.burst,
+        "shared_across_processes": bool(rate_limiter.lock_dir),
+        "hosts": rate_limiter.get_metrics(),
+        "circuits": get_circuit_breaker().get_state(),
+        "session": get_session_pool().get_state()
+    }
+
+@router.get("/sync/pacing")
+async def get_pacing_state():
+    """
+    Gets the adaptive pacing state of every host: current delay between requests,
+    typical latency, and the errors and slow responses that slowed it down.
+    """
+    pacer = get_rate_limiter().pacer
+    return {
+        "enabled": pacer.enabled,
+        "min_delay_seconds": pacer.min_delay,
+        "max_delay_seconds": pacer.max_delay,
+        "hosts": pacer.get_state()
+    }
\ No newline at end of file
@@ -0,0 +1 @@
+# Archive Module Initialization
\ No newline at end of file
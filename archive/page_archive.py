@@ -0,0 +1,122 @@
+# Raw page archive with retention by data state
+
+import os
+import time
+from datetime import date as date_cls
+from .store import ArchiveStore
+from ..db.repositories.archive_repo import ArchiveRepository
+from ..config.settings import get_settings
+from ..utils.timeutils import date_to_ordinal
+
+# Used for keys missing from the archive setting
+DEFAULT_ARCHIVE = {
+    'enabled': True,
+    'directory': './data/archive',
+    'compression': 'zlib',
+    'level': None,
+    'retention': {'open': 10, 'closing': 3, 'closed': 1}
+}
+
+# Unreferenced files younger than this may belong to a version not yet recorded
+ORPHAN_GRACE_SECONDS = 3600
+
+class PageArchive:
+    """
+    Archive of every fetched page, so data can be rebuilt without refetching.
+    
+    Contents are compressed and stored once per SHA-256 hash by an
+    ArchiveStore; the page_archive table records which URL served which
+    content, when, and with which validators. Storing a content only touches
+    the file system, so fetchers can do it; recording the version is a
+    database write and happens with the page's other writes.
+    """
+    
+    def __init__(self, db_connection, config=None):
+        config = dict(DEFAULT_ARCHIVE, **(config if config is not None else get_settings().archive or {}))
+        self.enabled = config['enabled']
+        self.store = ArchiveStore(config['directory'], config['compression'], config['level'])
+        self.retention = dict(DEFAULT_ARCHIVE['retention'], **(config['retention'] or {}))
+        self.archive_repo = ArchiveRepository(db_connection)
+    
+    def store_content(self, html_content, html_hash):
+        """
+        Stores a fetched content, unless it is already archived.
+        """
+        if self.enabled and html_content and html_hash:
+            self.store.put(html_content, html_hash)
+    
+    def record_version(self, url, page_type, html_hash, page_date=None, validators=None):
+        """
+        Records that a page was fetched with a given content.
+        
+        Contents that were never stored (e.g. fetched before the archive
+        existed and unchanged since) only update an existing version.
+        """
+        if not self.enabled or not html_hash:
+            return
+        validators = validators or {}
+        found = self.store.find(html_hash)
+        if found is None:
+            self.archive_repo.touch_version(url, html_hash, **validators)
+            return
+        path, compression = found
+        self.archive_repo.record_version(
+            url, page_type, html_hash,
+            page_date=page_date,
+            date_ordinal=date_to_ordinal(page_date),
+            stored_size=os.path.getsize(path),
+            compression=compression,
+            **validators
+        )
+    
+    def load(self, html_hash):
+        """
+        Reads an archived content.
+        
+        Returns:
+            str: Page content, or None if it is not archived
+        """
+        return self.store.get(html_hash)
+    
+    def get_versions(self, url):
+        """
+        Gets the archived versions of a page, newest first.
+        """
+        return self.archive_repo.get_versions(url)
+    
+    def get_latest_versions(self):
+        """
+        Gets the newest archived version of every page.
+        """
+        return self.archive_repo.get_latest_versions()
+    
+    def prune(self, today=None):
+        """
+        Applies the retention policy: keeps the newest versions of each page
+        according to the data state of its date (by default only the final
+        version of CLOSED days), then deletes the files no version refers to
+        any more.
+        
+        Returns:
+            dict: versions_deleted and files_deleted
+        """
+        keep_by_state = {state.upper(): keep for state, keep in self.retention.items()}
+        versions_deleted = self.archive_repo.delete_old_versions(
+            keep_by_state, (today or date_cls.today()).toordinal()
+        )
+        
+        files_deleted = 0
+        archived = self.archive_repo.get_archived_hashes()
+        cutoff = time.time() - ORPHAN_GRACE_SECONDS
+        for html_hash, modified in list(self.store.iter_stored()):
+            if html_hash not in archived and modified < cutoff:
+                self.store.delete(html_hash)
+                files_deleted += 1
+        
+        return {'versions_deleted': versions_deleted, 'files_deleted': files_deleted}
+    
+    def get_stats(self):
+        """
+        Gets the number of archived pages, versions and contents and their size.
+        """
+        return self.archive_repo.get_stats()
@@ -0,0 +1,262 @@
+# Offline database rebuild from the raw page archive
+
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from .page_archive import PageArchive
+from .store import ArchiveStore
+from ..config.settings import get_settings
+from ..db.connection import DatabaseConnection
+from ..db.repositories.centre_repo import CentreRepository
+from ..db.repositories.summary_repo import SummaryRepository
+from ..db.repositories.farmer_repo import FarmerRepository
+from ..parser.backends import get_parser_backend
+from ..sync.pipeline import parse_page_content
+from ..sync.jobs import JOB_CENTRE_LIST, JOB_DATEWISE_SUMMARY, JOB_FARMER_DETAILS
+
+# Tables whose rows are re-derived from archived pages instead of copied
+REBUILT_TABLES = ('datewise_summaries', 'farmer_transactions')
+
+def parse_archived_page(page_type, html_hash, url, archive_directory, parser_backend=None):
+    """
+    Reads an archived page and parses it. Runs in a worker process of the rebuild pool.
+    
+    Returns:
+        tuple: (parsed data, error message); parsed data is None on error
+    """
+    html_content = ArchiveStore(archive_directory).get(html_hash)
+    if html_content is None:
+        return None, f"archived content {html_hash} is missing"
+    try:
+        parsed, _ = parse_page_content(page_type, html_content, url, parser_backend)
+    except Exception as e:
+        return None, str(e)
+    return parsed, None
+
+class ArchiveRebuilder:
+    """
+    Rebuilds the database from the newest archived version of every page.
+    
+    Pages are re-parsed by a process pool and bulk-loaded into a fresh
+    database file next to the live one. Tables that are not derived from
+    pages (sync jobs, page hashes, the archive index, logs, ...) are copied
+    from the live database, and centres keep their IDs. The fresh file then
+    replaces the live database with an atomic rename; the previous database
+    is kept as <database>.bak.
+    
+    The swap does not coordinate with other processes: stop syncs and the
+    API server before rebuilding in place.
+    """
+    
+    def __init__(self, db_path=None, parse_workers=None, write_batch_size=200, parser_backend=None):
+        self.db_path = db_path or get_settings().database_path or "./data/upeos.db"
+        self.parse_workers = parse_workers or os.cpu_count() or 2
+        self.parser_backend = get_parser_backend(parser_backend).name
+        self.write_batch_size = write_batch_size
+        self.report = {
+            'pages_parsed': {JOB_CENTRE_LIST: 0, JOB_DATEWISE_SUMMARY: 0, JOB_FARMER_DETAILS: 0},
+            'pages_failed': 0,
+            'pages_unmatched': 0,
+            'centres': 0,
+            'summaries': 0,
+            'transactions': 0,
+            'parse_seconds': 0.0,
+            'seconds': 0.0
+        }
+        self.errors = []
+    
+    def rebuild(self, output_path=None, swap=True):
+        """
+        Rebuilds the database from the archive.
+        
+        Args:
+            output_path (str, optional): Where to build the fresh database,
+                                         defaults to <database>.rebuild
+            swap (bool): Whether to replace the live database with the result
+        
+        Returns:
+            dict: Rebuild report with page and row counts, failures and timings
+        """
+        start_time = time.perf_counter()
+        output_path = output_path or self.db_path + ".rebuild"
+        
+        live_db = DatabaseConnection(self.db_path)
+        try:
+            archive = PageArchive(live_db)
+            versions = archive.get_latest_versions()
+            archive_directory = os.path.abspath(archive.store.directory)
+        finally:
+            live_db.close()
+        if not versions:
+            raise RuntimeError("The page archive is empty; nothing to rebuild from")
+        
+        for suffix in ('', '-journal', '-wal', '-shm'):
+            if os.path.exists(output_path + suffix):
+                os.remove(output_path + suffix)
+        
+        db = DatabaseConnection(output_path)
+        try:
+            conn = db.get_connection()
+            # The file is discarded if the rebuild fails, so durability is not needed
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute("PRAGMA journal_mode = MEMORY")
+            self._copy_tables(conn)
+            
+            by_type = {JOB_CENTRE_LIST: [], JOB_DATEWISE_SUMMARY: [], JOB_FARMER_DETAILS: []}
+            for version in versions:
+                by_type.setdefault(version['page_type'], []).append(version)
+            
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=context) as executor:
+                # Each stage resolves the pages of the next one
+                self._load_centres(db, self._parse(executor, by_type[JOB_CENTRE_LIST], archive_directory))
+                details_urls = self._load_summaries(
+                    db, self._parse(executor, by_type[JOB_DATEWISE_SUMMARY], archive_directory)
+                )
+                self._load_transactions(
+                    db, self._parse(executor, by_type[JOB_FARMER_DETAILS], archive_directory), details_urls
+                )
+        finally:
+            db.close()
+        
+        if swap:
+            self._swap_in(output_path)
+        self.report['seconds'] = time.perf_counter() - start_time
+        return dict(self.report, errors=self.errors[:100], database=self.db_path if swap else output_path)
+    
+    def _copy_tables(self, conn):
+        """
+        Copies every table that is not rebuilt from the live database.
+        """
+        conn.execute("PRAGMA foreign_keys = OFF")
+        conn.execute("ATTACH DATABASE ? AS live", (self.db_path,))
+        tables = [
+            row[0] for row in conn.execute(
+                "SELECT name FROM live.sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            )
+        ]
+        for table in tables:
+            if table in REBUILT_TABLES or table == 'schema_version':
+                continue
+            fresh_columns = {row[1] for row in conn.execute(f"PRAGMA main.table_info({table})")}
+            columns = ", ".join(
+                row[1] for row in conn.execute(f"PRAGMA live.table_info({table})") if row[1] in fresh_columns
+            )
+            if columns:
+                conn.execute(f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM live.{table}")
+        conn.commit()
+        conn.execute("DETACH DATABASE live")
+        conn.execute("PRAGMA foreign_keys = ON")
+    
+    def _parse(self, executor, versions, archive_directory):
+        """
+        Parses archived pages in the process pool.
+        
+        Yields:
+            tuple: (version, parsed data) for every page that parsed
+        """
+        if not versions:
+            return
+        start_time = time.perf_counter()
+        chunksize = max(1, min(64, len(versions) // (self.parse_workers * 4)))
+        results = executor.map(
+            parse_archived_page,
+            [version['page_type'] for version in versions],
+            [version['html_hash'] for version in versions],
+            [version['url'] for version in versions],
+            repeat(archive_directory),
+            repeat(self.parser_backend),
+            chunksize=chunksize
+        )
+        for version, (parsed, error) in zip(versions, results):
+            if error:
+                self.report['pages_failed'] += 1
+                self.errors.append({'url': version['url'], 'error': error})
+                continue
+            self.report['pages_parsed'][version['page_type']] += 1
+            yield version, parsed
+        self.report['parse_seconds'] += time.perf_counter() - start_time
+    
+    def _batches(self, db, results):
+        """
+        Yields parsed pages, committing the writes of every write_batch_size pages together.
+        """
+        batch = []
+        for result in results:
+            batch.append(result)
+            if len(batch) >= self.write_batch_size:
+                with db.transaction():
+                    yield from batch
+                batch = []
+        if batch:
+            with db.transaction():
+                yield from batch
+    
+    def _load_centres(self, db, results):
+        centre_repo = CentreRepository(db)
+        for version, centres in self._batches(db, results):
+            for centre in centres:
+                centre_repo.create_or_update_centre(name=centre['name'], url=centre['url'])
+        self.report['centres'] = len(centre_repo.get_all_centres())
+    
+    def _load_summaries(self, db, results):
+        """
+        Loads date-wise summaries.
+        
+        Returns:
+            dict: (centre_id, date) of every farmer-detail page URL
+        """
+        summary_repo = SummaryRepository(db)
+        centres_by_url = {centre['url']: centre for centre in CentreRepository(db).get_all_centres()}
+        details_urls = {}
+        for version, datewise_data in self._batches(db, results):
+            centre = centres_by_url.get(version['url'])
+            if not centre:
+                self.report['pages_unmatched'] += 1
+                continue
+            summary_repo.upsert_summaries(centre['id'], datewise_data['dates'], version['html_hash'])
+            self.report['summaries'] += len(datewise_data['dates'])
+            for entry in datewise_data['dates']:
+                if entry.get('details_url'):
+                    details_urls[entry['details_url']] = (centre['id'], entry['date'])
+        return details_urls
+    
+    def _load_transactions(self, db, results, details_urls):
+        farmer_repo = FarmerRepository(db)
+        for version, farmer_data in self._batches(db, results):
+            target = details_urls.get(version['url'])
+            if not target:
+                self.report['pages_unmatched'] += 1
+                continue
+            self.report['transactions'] += farmer_repo.replace_transactions_for_day(
+                target[0], target[1], farmer_data['transactions']
+            )
+    
+    def _swap_in(self, output_path):
+        """
+        Replaces the live database with the rebuilt one, keeping a backup.
+        """
+        # Fold the live WAL into the database file, so no stale WAL is left
+        # next to the new file
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+        
+        backup_path = self.db_path + ".bak"
+        if os.path.exists(backup_path):
+            os.remove(backup_path)
+        try:
+            os.link(self.db_path, backup_path)
+        except OSError:
+            shutil.copy2(self.db_path, backup_path)
+        
+        os.replace(output_path, self.db_path)
+        for suffix in ('-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
@@ -0,0 +1,113 @@
+# Content-addressed compressed blob storage
+
+import lzma
+import os
+import tempfile
+import zlib
+
+# Compression formats as (file extension, compress, decompress)
+COMPRESSIONS = {
+    'zlib': ('.zz', lambda data, level: zlib.compress(data, 6 if level is None else level), zlib.decompress),
+    'lzma': ('.xz', lambda data, level: lzma.compress(data, preset=level), lzma.decompress)
+}
+
+class ArchiveStore:
+    """
+    Stores page contents as compressed files named by their SHA-256 hash.
+    
+    Each distinct content is written once, whatever the number of pages or
+    fetches it was seen in. Files are written to a temporary name and renamed
+    into place, so concurrent writers of the same content never leave a
+    partial file behind.
+    """
+    
+    def __init__(self, directory, compression='zlib', level=None):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown archive compression: {compression}")
+        self.directory = directory
+        self.compression = compression
+        self.level = level
+    
+    def _path(self, html_hash, compression):
+        # Two-character fan-out keeps directories small
+        return os.path.join(self.directory, html_hash[:2], html_hash + COMPRESSIONS[compression][0])
+    
+    def find(self, html_hash):
+        """
+        Finds the stored file of a content, in any compression format.
+        
+        Returns:
+            tuple: (path, compression), or None if the content is not stored
+        """
+        for compression in (self.compression, *COMPRESSIONS):
+            path = self._path(html_hash, compression)
+            if os.path.exists(path):
+                return path, compression
+        return None
+    
+    def put(self, html_content, html_hash):
+        """
+        Stores a content unless it is already stored.
+        
+        Args:
+            html_content (str): Page content
+            html_hash (str): SHA-256 hash of the content (utils.hashing.compute_html_hash)
+        
+        Returns:
+            tuple: (stored_size, compression, created)
+        """
+        found = self.find(html_hash)
+        if found:
+            return os.path.getsize(found[0]), found[1], False
+        
+        path = self._path(html_hash, self.compression)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = COMPRESSIONS[self.compression][1](html_content.encode('utf-8'), self.level)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+        return len(data), self.compression, True
+    
+    def get(self, html_hash):
+        """
+        Reads a stored content.
+        
+        Returns:
+            str: Page content, or None if the content is not stored
+        """
+        found = self.find(html_hash)
+        if not found:
+            return None
+        path, compression = found
+        with open(path, 'rb') as f:
+            return COMPRESSIONS[compression][2](f.read()).decode('utf-8')
+    
+    def delete(self, html_hash):
+        """
+        Deletes a stored content in every compression format.
+        """
+        for compression in COMPRESSIONS:
+            try:
+                os.unlink(self._path(html_hash, compression))
+            except FileNotFoundError:
+                pass
+    
+    def iter_stored(self):
+        """
+        Yields (html_hash, modification time) for every stored content.
+        """
+        if not os.path.isdir(self.directory):
+            return
+        extensions = {extension for extension, _, _ in COMPRESSIONS.values()}
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir():
+                continue
+            for blob in os.scandir(entry.path):
+                html_hash, extension = os.path.splitext(blob.name)
+                if extension in extensions:
+                    yield html_hash, blob.stat().st_mtime
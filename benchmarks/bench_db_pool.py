@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Per-request database cost benchmark for UPEOS API routes
+Compares a fresh DatabaseConnection per request with the shared connection pool
+"""
+
+import os
+import tempfile
+import time
+import argparse
+
+from upeos.db.connection import DatabaseConnection
+from upeos.db.pool import ConnectionPool
+from upeos.db.repositories.centre_repo import CentreRepository
+
+def seed_centres(db_path, count):
+    """Populate the benchmark database with centres"""
+    db = DatabaseConnection(db_path)
+    repo = CentreRepository(db)
+    for i in range(count):
+        repo.create_or_update_centre(f"Centre {i}", f"https://example.invalid/centre/{i}")
+    db.close()
+
+def bench_fresh_connection(db_path, requests):
+    """Old behaviour: construct a DatabaseConnection for every request"""
+    start = time.perf_counter()
+    for _ in range(requests):
+        db = DatabaseConnection(db_path)
+        CentreRepository(db).get_all_centres()
+        db.close()
+    return time.perf_counter() - start
+
+def bench_pooled_connection(pool, requests):
+    """New behaviour: check a connection out of the shared pool"""
+    start = time.perf_counter()
+    for _ in range(requests):
+        db = pool.acquire()
+        CentreRepository(db).get_all_centres()
+        db.close()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-request database cost")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--centres", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        seed_centres(db_path, args.centres)
+
+        fresh = bench_fresh_connection(db_path, args.requests)
+        pool = ConnectionPool(db_path)
+        pooled = bench_pooled_connection(pool, args.requests)
+        pool.close()
+
+    print(f"Requests:          {args.requests}")
+    print(f"Fresh connection:  {fresh / args.requests * 1e6:9.1f} us/request")
+    print(f"Pooled connection: {pooled / args.requests * 1e6:9.1f} us/request")
+    print(f"Speedup:           {fresh / pooled:9.1f}x")
+
+if __name__ == "__main__":
+    main()
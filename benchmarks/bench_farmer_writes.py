@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Farmer transaction write benchmark for UPEOS sync
+Compares per-row create_or_update_transaction with replace_transactions_for_day,
+and delete-and-reinsert with row diffing when an OPEN day is resynced
+"""
+
+import os
+import tempfile
+import time
+import argparse
+
+from upeos.db.connection import DatabaseConnection
+from upeos.db.repositories.centre_repo import CentreRepository
+from upeos.db.repositories.farmer_repo import FarmerRepository
+
+def make_rows(count):
+    """Build synthetic parsed farmer transactions"""
+    return [
+        {
+            'farmer_id': f"XXXX{i:06d}",
+            'farmer_name': f"Farmer {i}",
+            'village': f"Village {i % 50}",
+            'quantity': 10.0 + i % 40,
+            'amount': 2300.0 * (10 + i % 40),
+            'transaction_time': f"10:{i % 60:02d}:00"
+        }
+        for i in range(count)
+    ]
+
+def bench_per_row(repo, centre_id, dates, rows):
+    """Old behaviour: delete, then one SELECT + INSERT + commit per row"""
+    start = time.perf_counter()
+    for date in dates:
+        repo.delete_transactions_by_centre_and_date(centre_id, date)
+        for row in rows:
+            repo.create_or_update_transaction(
+                centre_id=centre_id,
+                date=date,
+                farmer_id=row['farmer_id'],
+                farmer_name=row['farmer_name'],
+                village=row['village'],
+                quantity=row['quantity'],
+                amount=row['amount'],
+                transaction_time=row['transaction_time']
+            )
+    return time.perf_counter() - start
+
+def bench_bulk(repo, centre_id, dates, rows):
+    """New behaviour: delete + executemany in a single transaction"""
+    start = time.perf_counter()
+    for date in dates:
+        repo.replace_transactions_for_day(centre_id, date, rows)
+    return time.perf_counter() - start
+
+def bench_resync(resync, centre_id, dates, rows, new_rows):
+    """Resync every day after it gained new_rows rows"""
+    start = time.perf_counter()
+    for resync_round in range(1, 4):
+        grown = rows + make_rows(len(rows) + new_rows * resync_round)[len(rows):]
+        for date in dates:
+            resync(centre_id, date, grown)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark farmer transaction writes")
+    parser.add_argument("--rows", type=int, default=300, help="Farmer rows per day")
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--new-rows", type=int, default=5, help="Rows an OPEN day gains between resyncs")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    dates = [f"{day + 1:02d}/01/2026" for day in range(args.days)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseConnection(os.path.join(tmp_dir, "bench.db"))
+        centre_id = CentreRepository(db).create_or_update_centre("Bench Centre", "https://example.invalid/centre")
+        repo = FarmerRepository(db)
+
+        per_row = bench_per_row(repo, centre_id, dates, rows)
+        bulk = bench_bulk(repo, centre_id, dates, rows)
+
+        # Both resync paths start from the same stored days
+        bench_bulk(repo, centre_id, dates, rows)
+        resync_replace = bench_resync(repo.replace_transactions_for_day, centre_id, dates, rows, args.new_rows)
+        bench_bulk(repo, centre_id, dates, rows)
+        resync_diff = bench_resync(repo.sync_transactions_for_day, centre_id, dates, rows, args.new_rows)
+        db.close()
+
+    total = args.rows * args.days
+    print(f"Rows written:      {total}")
+    print(f"Per-row path:      {per_row:8.3f} s ({total / per_row:10.0f} rows/s)")
+    print(f"Bulk path:         {bulk:8.3f} s ({total / bulk:10.0f} rows/s)")
+    print(f"Speedup:           {per_row / bulk:8.1f}x")
+    print(f"Resyncs of {args.days} days gaining {args.new_rows} rows each, 3 rounds:")
+    print(f"Delete + reinsert: {resync_replace:8.3f} s")
+    print(f"Row diffing:       {resync_diff:8.3f} s")
+    print(f"Speedup:           {resync_replace / resync_diff:8.1f}x")
+
+if __name__ == "__main__":
+    main()
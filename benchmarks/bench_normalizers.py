@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Column normalizer micro-benchmark for UPEOS
+Normalizes 100,000-row columns of amount, count and date cells cell by cell, the way
+the parsers used to, and with the column normalizers, and fails if any value differs
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from upeos.core.constants import DATE_FORMAT
+from upeos.normalizer import dates
+from upeos.normalizer.dates import date_ordinal_column, normalize_date_column
+from upeos.normalizer.numbers import (normalize_amount_column, normalize_count_column, normalize_number,
+                                       normalize_number_column)
+
+def make_columns(rows, seed=0):
+    """Raw cell texts as the report pages print them, with some malformed cells"""
+    rng = random.Random(seed)
+    season = [date(2025, 10, 1) + timedelta(days=day) for day in range(180)]
+    amounts, counts, day_texts, devanagari_amounts = [], [], [], []
+    for _ in range(rows):
+        value = rng.uniform(0, 500000)
+        amounts.append(rng.choice([f"{value:.2f}", f"{value:,.2f}", f"₹ {value:,.2f}", f"{value:.0f}/-"]))
+        counts.append(str(rng.randint(0, 400)))
+        day_texts.append(rng.choice(season).strftime(DATE_FORMAT))
+    # Blank, non-numeric and impossible-date cells
+    for i in range(0, rows, 997):
+        amounts[i] = rng.choice(["", "n/a", "1.2.3", "-"])
+        counts[i] = rng.choice(["", "n/a", "१२"])
+        day_texts[i] = rng.choice(["31/02/2025", "", "2025-10-01"])
+    # A column that also has digits of another script, which takes the slower exact path
+    devanagari_amounts = list(amounts)
+    for i in range(0, rows, 1009):
+        devanagari_amounts[i] = rng.choice(["१२३.५", "₹ १,२००", "²"])
+    return amounts, counts, day_texts, devanagari_amounts
+
+def amount_per_cell(values):
+    result = []
+    for value in values:
+        try:
+            result.append(float(''.join(c for c in value if c.isdigit() or c == '.')))
+        except ValueError:
+            result.append(0.0)
+    return result
+
+def count_per_cell(values):
+    result = []
+    for value in values:
+        try:
+            result.append(int(value))
+        except ValueError:
+            result.append(0)
+    return result
+
+def dates_per_cell(values):
+    """Formatted date and day ordinal, each from its own strptime"""
+    formatted, ordinals = [], []
+    for value in values:
+        try:
+            formatted.append(datetime.strptime(value, '%d/%m/%Y').strftime(DATE_FORMAT))
+            ordinals.append(datetime.strptime(formatted[-1], DATE_FORMAT).toordinal())
+        except ValueError:
+            formatted.append(None)
+            ordinals.append(None)
+    return formatted, ordinals
+
+def dates_per_column(values):
+    # Start cold: a run parses every distinct date once
+    dates._parse_report_date.cache_clear()
+    return normalize_date_column(values), date_ordinal_column(values)
+
+def time_best(function, values, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(values)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the column normalizers against per-cell normalization")
+    parser.add_argument("--rows", type=int, default=100000, help="Cells per column")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case; the best is reported")
+    args = parser.parse_args()
+
+    amounts, counts, day_texts, devanagari_amounts = make_columns(args.rows)
+    cases = [
+        ("amounts (parsers)", amounts, amount_per_cell, normalize_amount_column),
+        ("amounts, Devanagari digits", devanagari_amounts, amount_per_cell, normalize_amount_column),
+        ("amounts (normalize_number)", amounts,
+         lambda values: [normalize_number(value) for value in values], normalize_number_column),
+        ("farmer counts", counts, count_per_cell, normalize_count_column),
+        ("dates + day ordinals", day_texts, dates_per_cell, dates_per_column)
+    ]
+
+    print(f"{'Column (' + str(args.rows) + ' rows)':<30} {'Per cell s':>10} {'Column s':>10} {'ns/cell':>8} {'Speedup':>8}  Output")
+    failures = 0
+    for name, values, per_cell, per_column in cases:
+        # normalize_number prints a warning for every malformed cell
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected, cell_seconds = time_best(per_cell, values, args.repeat)
+            actual, column_seconds = time_best(per_column, values, args.repeat)
+        status = "identical" if actual == expected else "MISMATCH"
+        if actual != expected:
+            failures += 1
+        print(f"{name:<30} {cell_seconds:>10.4f} {column_seconds:>10.4f} "
+              f"{column_seconds / len(values) * 1e9:>8.0f} {cell_seconds / column_seconds:>7.1f}x  {status}")
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Batch parse benchmark for UPEOS
+Parses a mix of many small pages and a few large ones serially and with parse_many,
+one page per task and in size-based chunks, and checks every result against the serial parse
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from upeos.benchmarks.bench_parsers import FIXTURES_DIR, read_gzip
+from upeos.parser.backends import PARSER_BACKENDS, find_difference, get_parser_backend
+from upeos.parser.batch import CHUNK_SIZE, MAX_CHUNK_PAGES, parse_many
+
+# Pages of the size a full sync fetches most of, and the occasional busy day
+SMALL_FIXTURES = ["centre_list_site_75", "datewise_site_45", "farmer_site_10", "farmer_site_400"]
+LARGE_FIXTURES = ["farmer_10000"]
+
+def load_pages(fixtures_dir, small, large, detect):
+    """Build a shuffled batch of (key, page type, html, url) pages from the parser fixtures"""
+    with open(os.path.join(fixtures_dir, "manifest.json"), encoding='utf-8') as f:
+        manifest = {fixture['name']: fixture for fixture in json.load(f)}
+    html_by_name = {name: read_gzip(os.path.join(fixtures_dir, f"{name}.html.gz"))
+                    for name in SMALL_FIXTURES + LARGE_FIXTURES}
+    names = [SMALL_FIXTURES[i % len(SMALL_FIXTURES)] for i in range(small)]
+    names += [LARGE_FIXTURES[i % len(LARGE_FIXTURES)] for i in range(large)]
+    random.Random(0).shuffle(names)
+    return [
+        (i, None if detect else manifest[name]['page_type'], html_by_name[name], manifest[name]['url'])
+        for i, name in enumerate(names)
+    ]
+
+def run_serial(pages, backend):
+    backend = get_parser_backend(backend)
+    start = time.perf_counter()
+    first = None
+    results = {}
+    for key, page_type, html_content, url in pages:
+        if page_type is None:
+            results[key] = backend.parse_page(html_content, url)[1]
+        else:
+            results[key] = backend.parse_expected(page_type, html_content, url)
+        first = first or time.perf_counter() - start
+    return results, first, time.perf_counter() - start
+
+def run_parse_many(pages, backend, workers, chunk_size, max_chunk_pages):
+    start = time.perf_counter()
+    first = None
+    results = {}
+    # Read the pages through a generator, as an archive replay would
+    for key, page_type, parsed, error in parse_many(iter(pages), workers, backend, chunk_size, max_chunk_pages):
+        if error:
+            raise RuntimeError(f"page {key}: {error}")
+        results[key] = parsed
+        first = first or time.perf_counter() - start
+    return results, first, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parse_many against serial parsing")
+    parser.add_argument("--small", type=int, default=2000, help="Small pages in the batch")
+    parser.add_argument("--large", type=int, default=4, help="Large (10,000-row) pages in the batch")
+    parser.add_argument("--workers", type=int, default=None, help="Parse processes (default: one per core)")
+    parser.add_argument("--backend", default=None, help="Parser backend (default: parser_backend setting)")
+    parser.add_argument("--detect", action="store_true", help="Detect page types with parse_page instead of passing them")
+    parser.add_argument("--fixtures-dir", default=FIXTURES_DIR)
+    args = parser.parse_args()
+    if args.backend and args.backend not in PARSER_BACKENDS:
+        parser.error(f"unknown parser backend: {args.backend}")
+
+    pages = load_pages(args.fixtures_dir, args.small, args.large, args.detect)
+    html_mb = sum(len(page[2]) for page in pages) / 1024 / 1024
+    workers = args.workers or os.cpu_count() or 2
+    print(f"Batch: {len(pages)} pages, {html_mb:.1f} MB of HTML, {workers} workers, "
+          f"backend {get_parser_backend(args.backend).name}")
+
+    expected, first, seconds = run_serial(pages, args.backend)
+    runs = [("serial", first, seconds)]
+    failures = 0
+    for name, chunk_size, max_chunk_pages in [
+        ("parse_many, page per task", 1, 1),
+        ("parse_many, chunked", CHUNK_SIZE, MAX_CHUNK_PAGES)
+    ]:
+        results, first, seconds = run_parse_many(pages, args.backend, workers, chunk_size, max_chunk_pages)
+        runs.append((name, first, seconds))
+        difference = find_difference([expected[page[0]] for page in pages], [results.get(page[0]) for page in pages])
+        if difference:
+            failures += 1
+            print(f"MISMATCH {name}: {difference}")
+
+    print(f"{'Run':<28} {'Seconds':>8} {'Pages/s':>9} {'First result s':>15}")
+    for name, first, seconds in runs:
+        print(f"{name:<28} {seconds:>8.2f} {len(pages) / seconds:>9.0f} {first:>15.3f}")
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
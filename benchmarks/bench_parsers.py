@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Parser benchmark for UPEOS
+Times every page parser of every backend on golden HTML fixtures from 10 to 50,000 rows,
+reports rows/s and peak memory, and fails if any output differs from the golden JSON
+"""
+
+import argparse
+import gc
+import gzip
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+from upeos.benchmarks.mock_site import CENTRE_LIST_PATH, DATEWISE_PATH, FARMER_PATH, MockSite
+from upeos.parser.backends import BACKEND_BS4, PARSER_BACKENDS, find_difference
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "parsers")
+
+# Synthetic pages are dated up to this day, so fixtures never change with the calendar
+FIXTURE_LAST_DAY = date(2025, 12, 31)
+
+# (name, page type, rows, with the real site's page chrome)
+FIXTURES = [
+    ("centre_list_site_75", 'centre_list', 75, True),
+    ("datewise_site_45", 'datewise_summary', 45, True),
+    ("farmer_site_10", 'farmer_details', 10, True),
+    ("farmer_site_400", 'farmer_details', 400, True),
+    ("centre_list_10", 'centre_list', 10, False),
+    ("centre_list_5000", 'centre_list', 5000, False),
+    ("datewise_10", 'datewise_summary', 10, False),
+    ("datewise_5000", 'datewise_summary', 5000, False),
+    ("farmer_1000", 'farmer_details', 1000, False),
+    ("farmer_10000", 'farmer_details', 10000, False),
+    ("farmer_50000", 'farmer_details', 50000, False)
+]
+
+# Page URLs the fixtures' relative links resolve against
+FIXTURE_URLS = {
+    'centre_list': "http://localhost" + CENTRE_LIST_PATH,
+    'datewise_summary': "http://localhost" + DATEWISE_PATH + "?c=0",
+    'farmer_details': "http://localhost" + FARMER_PATH + "?c=0&d=0"
+}
+
+def render_fixture(page_type, rows, chrome):
+    """Render a fixture page with the mock site's generator"""
+    if page_type == 'centre_list':
+        return MockSite(centres=rows, last_day=FIXTURE_LAST_DAY, chrome=chrome).render_centre_list()
+    if page_type == 'datewise_summary':
+        return MockSite(days=rows, farmers=25, last_day=FIXTURE_LAST_DAY, chrome=chrome).render_datewise(0)
+    return MockSite(days=30, farmers=rows, last_day=FIXTURE_LAST_DAY, chrome=chrome).render_farmer_details(0, 29)
+
+def count_rows(page_type, parsed):
+    if page_type == 'centre_list':
+        return len(parsed)
+    return len(parsed['dates'] if page_type == 'datewise_summary' else parsed['transactions'])
+
+def write_gzip(path, text):
+    # mtime=0 keeps regenerated files byte-identical
+    with open(path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=9, mtime=0) as f:
+        f.write(text.encode('utf-8'))
+
+def read_gzip(path):
+    with gzip.open(path, 'rb') as f:
+        return f.read().decode('utf-8')
+
+def regenerate(fixtures_dir):
+    """Write the fixture pages and their golden output from the BeautifulSoup reference parsers"""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    reference = PARSER_BACKENDS[BACKEND_BS4]
+    manifest = []
+    for name, page_type, rows, chrome in FIXTURES:
+        html_content = render_fixture(page_type, rows, chrome)
+        parsed = reference.parse(page_type, html_content, FIXTURE_URLS[page_type])
+        if count_rows(page_type, parsed) != rows:
+            raise RuntimeError(f"{name}: parsed {count_rows(page_type, parsed)} rows, expected {rows}")
+        write_gzip(os.path.join(fixtures_dir, f"{name}.html.gz"), html_content)
+        write_gzip(os.path.join(fixtures_dir, f"{name}.golden.json.gz"),
+                   json.dumps(parsed, ensure_ascii=False, indent=1))
+        manifest.append({'name': name, 'page_type': page_type, 'rows': rows, 'url': FIXTURE_URLS[page_type]})
+        print(f"Wrote {name} ({rows} rows, {len(html_content) / 1024:.0f} KB of HTML)")
+    with open(os.path.join(fixtures_dir, "manifest.json"), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB, or None where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform == 'darwin' else peak
+
+def measure(fixtures_dir, fixture, backend, repeat):
+    """
+    Parse one fixture with one backend. Runs in a fresh process, so the peak
+    RSS growth belongs to this parse alone.
+    """
+    html_content = read_gzip(os.path.join(fixtures_dir, f"{fixture['name']}.html.gz"))
+    golden = json.loads(read_gzip(os.path.join(fixtures_dir, f"{fixture['name']}.golden.json.gz")))
+    parser = PARSER_BACKENDS[backend]
+    gc.collect()
+
+    rss_before = peak_rss_kb()
+    parsed = parser.parse(fixture['page_type'], html_content, fixture['url'])
+    rss_after = peak_rss_kb()
+    difference = find_difference(golden, parsed)
+    del parsed
+    gc.collect()
+
+    # Traced separately: tracing slows parsing and its bookkeeping would inflate the RSS
+    tracemalloc.start()
+    parser.parse(fixture['page_type'], html_content, fixture['url'])
+    python_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser.parse(fixture['page_type'], html_content, fixture['url'])
+        best = min(best, time.perf_counter() - start)
+    return {
+        'seconds': best,
+        'python_peak_mb': python_peak / 1024 / 1024,
+        'rss_growth_mb': None if rss_before is None else (rss_after - rss_before) / 1024,
+        'difference': difference
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the page parsers on golden HTML fixtures")
+    parser.add_argument("--backends", default=",".join(PARSER_BACKENDS),
+                        help="Comma-separated parser backends to benchmark")
+    parser.add_argument("--max-rows", type=int, default=None, help="Skip fixtures with more rows")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed parses per fixture; the best is reported")
+    parser.add_argument("--fixtures-dir", default=FIXTURES_DIR)
+    parser.add_argument("--regenerate", action="store_true",
+                        help="Rewrite the fixtures and golden output from the bs4 parsers, then exit")
+    args = parser.parse_args()
+
+    if args.regenerate:
+        regenerate(args.fixtures_dir)
+        return
+
+    with open(os.path.join(args.fixtures_dir, "manifest.json"), encoding='utf-8') as f:
+        fixtures = [fixture for fixture in json.load(f) if args.max_rows is None or fixture['rows'] <= args.max_rows]
+    backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+    for name in backends:
+        if name not in PARSER_BACKENDS:
+            parser.error(f"unknown parser backend: {name}")
+
+    print(f"{'Fixture':<20} {'Rows':>6} {'Function':<40} {'Best s':>8} {'Rows/s':>10} "
+          f"{'Py peak MB':>10} {'RSS +MB':>8}  Golden")
+    failures = 0
+    # A fresh process per measurement keeps peak memory figures independent
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for fixture in fixtures:
+            for backend in backends:
+                result = pool.apply(measure, (args.fixtures_dir, fixture, backend, args.repeat))
+                function = PARSER_BACKENDS[backend].parse_function(fixture['page_type'])
+                rss = '-' if result['rss_growth_mb'] is None else f"{result['rss_growth_mb']:.1f}"
+                status = "ok" if result['difference'] is None else f"MISMATCH {result['difference']}"
+                if result['difference'] is not None:
+                    failures += 1
+                print(f"{fixture['name']:<20} {fixture['rows']:>6} "
+                      f"{function.__module__.rsplit('.', 1)[-1] + '.' + function.__name__:<40} "
+                      f"{result['seconds']:>8.4f} {fixture['rows'] / result['seconds']:>10.0f} "
+                      f"{result['python_peak_mb']:>10.1f} {rss:>8}  {status}")
+    if failures:
+        print(f"{failures} outputs differ from the golden JSON")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Sync throughput benchmark for UPEOS
+Runs SyncEngine (one page at a time) and FullSyncEngine (pipelined) against
+the local mock site and reports pages/s, rows/s and database write time
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import tempfile
+import time
+
+from upeos.benchmarks.mock_site import CENTRE_LIST_PATH, MockSite, load_recorded_pages
+from upeos.config.settings import get_settings
+from upeos.db.connection import DatabaseConnection
+from upeos.db.repositories.centre_repo import CentreRepository
+from upeos.db.repositories.summary_repo import SummaryRepository
+from upeos.scripts.full_sync import FullSyncEngine
+from upeos.sync.engine import SyncEngine
+
+def use_fresh_database(tmp_dir, name):
+    """Point the settings at an empty database and page archive"""
+    run_dir = os.path.join(tmp_dir, name)
+    os.makedirs(run_dir)
+    get_settings().update({
+        'database_path': os.path.join(run_dir, "upeos.db"),
+        'archive': {'enabled': True, 'directory': os.path.join(run_dir, "archive")}
+    })
+
+def run_serial():
+    """SyncEngine: centre list, then every date-wise page, then every farmer page"""
+    db = DatabaseConnection()
+    engine = SyncEngine(db)
+    start = time.perf_counter()
+    try:
+        engine.sync_all_centres()
+        centres = CentreRepository(db).get_all_centres()
+        for centre in centres:
+            engine.sync_centre_datewise_data(centre['name'])
+        summary_repo = SummaryRepository(db)
+        for centre in centres:
+            for summary in summary_repo.get_summaries_by_centre(centre['id']):
+                engine.sync_farmer_details(centre['name'], summary['date'])
+    finally:
+        engine.close()
+        db.close()
+    report = engine.get_report()
+    report['wall_seconds'] = time.perf_counter() - start
+    return report
+
+def run_pipeline(fetch_mode, workers, parse_workers):
+    """FullSyncEngine: fetch -> parse -> write pipeline over the sync job queue"""
+    engine = FullSyncEngine(
+        max_workers=workers,
+        sync_mode="full",
+        parse_workers=parse_workers,
+        fetch_mode=fetch_mode,
+        max_connections=workers
+    )
+    engine.run_full_sync()
+    report = engine.get_report()
+    report['write_stage_seconds'] = sum(
+        pipeline.get_stats()['stages']['write']['busy_seconds'] for pipeline in engine.pipelines
+    )
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync throughput against a local mock site")
+    parser.add_argument("--centres", type=int, default=5)
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--farmers", type=int, default=200, help="Farmer rows per centre and day")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 503")
+    parser.add_argument("--recorded", action="store_true",
+                        help="Serve the pages recorded in the configured database's page archive")
+    parser.add_argument("--request-delay", type=float, default=0.002,
+                        help="Minimum delay between requests (request_delay setting)")
+    parser.add_argument("--workers", type=int, default=8, help="Fetch workers (threads) or fetches in flight (async)")
+    parser.add_argument("--parse-workers", type=int, default=None)
+    parser.add_argument("--engines", default="serial,threads",
+                        help="Comma-separated engines to run: serial, threads, async")
+    parser.add_argument("--verbose", action="store_true", help="Show the engines' progress output")
+    args = parser.parse_args()
+
+    engines = [name.strip() for name in args.engines.split(",") if name.strip()]
+    recorded_pages, entry_path = load_recorded_pages() if args.recorded else (None, CENTRE_LIST_PATH)
+    site = MockSite(
+        centres=args.centres,
+        days=args.days,
+        farmers=args.farmers,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        recorded_pages=recorded_pages,
+        entry_path=entry_path
+    )
+    base_url = site.start()
+    get_settings().update({
+        'base_url': base_url,
+        'request_delay': args.request_delay,
+        'rate_limit_lock_dir': None
+    })
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in engines:
+            use_fresh_database(tmp_dir, name)
+            requests_before = site.stats['requests']
+            quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+            with quiet:
+                if name == "serial":
+                    report = run_serial()
+                else:
+                    report = run_pipeline(name, args.workers, args.parse_workers)
+            report['requests'] = site.stats['requests'] - requests_before
+            results.append((name, report))
+    site.stop()
+
+    print(f"Mock site:  {base_url} ({'recorded' if recorded_pages is not None else 'synthetic'} pages, "
+          f"latency {args.latency}s, error rate {args.error_rate:.0%})")
+    print(f"{'Engine':<8} {'Requests':>8} {'Pages':>7} {'Rows':>9} {'Seconds':>8} "
+          f"{'Pages/s':>8} {'Rows/s':>9} {'DB write s':>10} {'Write stage s':>13}")
+    for name, report in results:
+        seconds = report['wall_seconds'] or 1e-9
+        pages = report.get('pages_written', 0)
+        rows = report.get('rows_written', 0)
+        write_stage = report.get('write_stage_seconds')
+        print(f"{name:<8} {report['requests']:>8} {pages:>7} {rows:>9} {seconds:>8.2f} "
+              f"{pages / seconds:>8.1f} {rows / seconds:>9.0f} {report.get('write_seconds', 0.0):>10.3f} "
+              f"{'-' if write_stage is None else f'{write_stage:.3f}':>13}")
+    print(f"Injected errors: {site.stats['errors_injected']}, 304 responses: {site.stats['not_modified']}, "
+          f"404 responses: {site.stats['not_found']}")
+
+if __name__ == "__main__":
+    main()
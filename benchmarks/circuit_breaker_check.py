@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Async circuit breaker check for UPEOS
+Drives a host's circuit open, half-open and closed again through AsyncHTTPClient.get
+against a scripted transport, and fails if a request hangs or the circuit does not
+go through those states
+"""
+
+import argparse
+import asyncio
+import sys
+
+import httpx
+
+from upeos.config.settings import get_settings
+from upeos.fetcher.async_client import AsyncHTTPClient
+from upeos.fetcher.rate_limiter import RateLimiter
+from upeos.fetcher.retry import CircuitBreaker
+
+HOST = "upstream.test"
+URL = f"http://{HOST}/PaddyPurchaseSummary/PurchaseReport_Center.aspx"
+
+def make_client(statuses, cooldown):
+    """A client whose requests are answered with the queued statuses, then with 200"""
+    def handler(request):
+        return httpx.Response(statuses.pop(0) if statuses else 200, text="<html></html>")
+
+    client = AsyncHTTPClient(max_connections=4)
+    # The client's own connection pool is never opened
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client.circuit_breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=cooldown)
+    client.rate_limiter = RateLimiter(rate=100, lock_dir='')
+    # No upstream session to warm up
+    client._generation = 0
+    return client
+
+async def run_check(cooldown, requests, timeout):
+    statuses = [503, 503]
+    client = make_client(statuses, cooldown)
+    breaker = client.circuit_breaker
+    failures = []
+    try:
+        # Two transient failures in a row open the circuit
+        for _ in range(2):
+            try:
+                await client.get(URL)
+                failures.append("a 503 response did not raise")
+            except httpx.HTTPStatusError:
+                pass
+        state = breaker.get_state()[HOST]
+        print(f"After 2 failures:      {state['state']}, opened {state['times_opened']}x")
+        if state['state'] != 'open':
+            failures.append(f"circuit {state['state']} after 2 failures, expected open")
+
+        # Once the cooldown ends, the first probe fails and reopens the circuit;
+        # the probe after the next cooldown succeeds and closes it
+        statuses.append(503)
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(*(client.get(URL) for _ in range(requests)), return_exceptions=True),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            failures.append(f"requests still waiting on the circuit after {timeout}s")
+            results = []
+        state = breaker.get_state()[HOST]
+        succeeded = sum(1 for result in results if isinstance(result, httpx.Response))
+        print(f"After {requests} requests:      {state['state']}, opened {state['times_opened']}x, "
+              f"{succeeded} succeeded, {len(results) - succeeded} failed")
+        if results and (state['state'] != 'closed' or state['times_opened'] != 2 or succeeded != requests - 1):
+            failures.append(f"expected the circuit closed after opening twice and {requests - 1} requests to succeed")
+    finally:
+        await client.close()
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the circuit breaker through the async HTTP client")
+    parser.add_argument("--cooldown", type=float, default=0.5, help="Seconds the circuit stays open")
+    parser.add_argument("--requests", type=int, default=6, help="Concurrent requests while the circuit is open")
+    parser.add_argument("--timeout", type=float, default=15.0, help="Seconds before the requests count as hung")
+    args = parser.parse_args()
+
+    # One attempt per request, so every failure reaches the circuit breaker
+    get_settings().update({'max_retries': 0})
+    failures = asyncio.run(run_check(args.cooldown, args.requests, args.timeout))
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    if failures:
+        sys.exit(1)
+    print("Circuit breaker: open, half-open and closed again")
+
+if __name__ == "__main__":
+    main()
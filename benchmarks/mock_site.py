@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Mock government site for offline UPEOS sync benchmarks
+Serves synthetic tblSample pages (centre list, date-wise summaries, farmer
+details) or pages recorded in the page archive, with configurable latency,
+error injection and page counts.
+"""
+
+import argparse
+import base64
+import random
+import threading
+import time
+import zlib
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from upeos.core.constants import BASE_URL, DATE_FORMAT
+
+CENTRE_LIST_PATH = "/PaddyPurchaseSummary/PurchaseReport_Center.aspx"
+DATEWISE_PATH = "/PaddyPurchaseSummary/PurchaseReport_Date.aspx"
+FARMER_PATH = "/PaddyPurchaseSummary/PurchaseReport_Farmer.aspx"
+
+# Title rows above the column headers of the real report tables
+REPORT_TITLE_ROWS = [
+    "उत्तर प्रदेश शासन",
+    "खाद्य तथा रसद विभाग",
+    "धान क्रय रिपोर्ट",
+    "विपणन वर्ष 2025-26",
+    "",
+    "सभी धनराशि रुपये में, मात्रा कुन्तल में"
+]
+
+def render_table(headers, rows, title_rows=("धान क्रय रिपोर्ट",)):
+    """
+    Renders a tblSample table laid out like the real pages: title rows, the
+    header row, a row of column numbers, the data rows and a totals row.
+    """
+    parts = ['<table id="tblSample" border="1">']
+    for title in title_rows:
+        parts.append(f'<tr><td colspan="{len(headers)}" align="center"><b>{title}</b></td></tr>')
+    parts.append('<tr>' + ''.join(f'<th>{header}</th>' for header in headers) + '</tr>')
+    parts.append('<tr>' + ''.join(f'<td>{number}</td>' for number in range(1, len(headers) + 1)) + '</tr>')
+    for row in rows:
+        parts.append('<tr>' + ''.join(f'<td>{cell}</td>' for cell in row) + '</tr>')
+    parts.append('<tr><td>कुल योग</td>' + '<td></td>' * (len(headers) - 1) + '</tr>')
+    parts.append('</table>')
+    return ''.join(parts)
+
+def render_page(body, header=None, chrome=False):
+    """
+    Wraps a table in the page skeleton, with the PnlHeader div if given.
+    With chrome, the page also carries what the real ASP.NET pages wrap the
+    report in: scripts, styles, view state and navigation.
+    """
+    header_div = f'<div id="ctl00_ContentPlaceHolder1_PnlHeader">{header}</div>' if header else ''
+    if not chrome:
+        return (
+            '<html><head><meta charset="utf-8"><title>Paddy Purchase Report</title></head>'
+            f'<body><form>{header_div}{body}</form></body></html>'
+        )
+    # Deterministic stand-in for the view state blob
+    view_state = base64.b64encode(random.Random(len(body)).randbytes(12000)).decode('ascii')
+    menu = ''.join(f'<li><a href="../Report{i}.aspx">रिपोर्ट {i}</a></li>' for i in range(1, 13))
+    return (
+        '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" '
+        '"http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">'
+        '<html xmlns="http://www.w3.org/1999/xhtml"><head><meta http-equiv="Content-Type" '
+        'content="text/html; charset=utf-8" /><title>Paddy Purchase Report</title>'
+        '<link href="../css/style.css" rel="stylesheet" type="text/css" />'
+        '<style type="text/css">.grid td { padding: 2px; border: 1px solid #999; }</style>'
+        '<script type="text/javascript">function printDiv(id) { window.print(); }</script></head>'
+        '<body><form name="aspnetForm" method="post" id="aspnetForm">'
+        f'<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{view_state}" />'
+        '<input type="hidden" name="__VIEWSTATEGENERATOR" id="__VIEWSTATEGENERATOR" value="C2EE9ABB" />'
+        f'<div id="header"><img src="../images/logo.png" alt="" /><ul class="menu">{menu}</ul></div>'
+        f'<div id="content">{header_div}<div class="grid">{body}</div></div>'
+        '<div id="footer"><!-- Site designed and hosted by NIC -->'
+        '<span>Content owned by Food &amp; Civil Supplies Department</span></div>'
+        '</form></body></html>'
+    )
+
+def format_amount(value):
+    return f"₹ {value:,.2f}"
+
+class MockSite:
+    """
+    Local stand-in for the procurement website.
+
+    Synthetic pages are deterministic for a given configuration, so
+    repeated runs see the same content (and 304 answers to conditional
+    requests). The last of the configured days is today, so syncs see
+    OPEN, CLOSING and CLOSED dates as they would upstream.
+    """
+
+    def __init__(self, centres=10, days=30, farmers=100, latency=0.0, jitter=0.0,
+                 error_rate=0.0, recorded_pages=None, entry_path=CENTRE_LIST_PATH, seed=0,
+                 last_day=None, chrome=False):
+        """
+        Args:
+            centres (int): Number of purchase centres
+            days (int): Purchase days per centre, ending today
+            farmers (int): Farmer transactions per centre and day
+            latency (float): Seconds added to every response
+            jitter (float): Random extra latency of up to this many seconds
+            error_rate (float): Fraction of requests answered 503
+            recorded_pages (dict): Page contents by path and query, served
+                                   instead of synthetic pages
+            entry_path (str): Path and query of the centre list page
+            seed (int): Seed of the error injection and jitter
+            last_day (date, optional): Last purchase day, defaults to today
+            chrome (bool): Whether pages carry the real site's scripts, view
+                           state, navigation and report title rows
+        """
+        self.centres = centres
+        self.days = days
+        self.farmers = farmers
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.recorded_pages = recorded_pages
+        self.entry_path = entry_path
+        self.random = random.Random(seed)
+        self.last_day = last_day or date.today()
+        self.chrome = chrome
+        self.stats = {'requests': 0, 'errors_injected': 0, 'not_modified': 0, 'not_found': 0}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """
+        Centre list URL of the running site, for the base_url setting.
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{self.entry_path}"
+
+    def get_day(self, index):
+        """
+        Gets the date of the day with the given index; the last day is today.
+        """
+        return self.last_day - timedelta(days=self.days - 1 - index)
+
+    def _centre_name(self, centre):
+        return f"UPSS Mock Centre {centre + 1:04d}"
+
+    def _render(self, headers, rows, header=None):
+        if self.chrome:
+            return render_page(render_table(headers, rows, REPORT_TITLE_ROWS), header, chrome=True)
+        return render_page(render_table(headers, rows), header)
+
+    def render_centre_list(self):
+        rows = [
+            [
+                centre + 1,
+                f'<a href="PurchaseReport_Date.aspx?c={centre}">{self._centre_name(centre)}</a>',
+                self.days,
+                self.days * self.farmers,
+                f"{self.days * self.farmers * 12.5:.2f}",
+                format_amount(self.days * self.farmers * 28750.0)
+            ]
+            for centre in range(self.centres)
+        ]
+        headers = ['क्रम सं०', 'क्रय केंद्र का नाम', 'क्रय दिवस', 'किसानों की संख्या', 'मात्रा (कु०)', 'धनराशि']
+        return self._render(headers, rows)
+
+    def render_datewise(self, centre):
+        rows = [
+            [
+                day + 1,
+                f'<a href="PurchaseReport_Farmer.aspx?c={centre}&amp;d={day}">{self.get_day(day).strftime(DATE_FORMAT)}</a>',
+                self.farmers,
+                f"{self.farmers * 12.5:,.2f}",
+                format_amount(self.farmers * 28750.0)
+            ]
+            for day in range(self.days)
+        ]
+        headers = ['क्रम सं०', 'तिथि', 'किसानों की संख्या', 'मात्रा (कु०)', 'धनराशि']
+        header = f"क्रय केंद्र का नाम : {self._centre_name(centre)} जनपद : मॉक"
+        return self._render(headers, rows, header)
+
+    def render_farmer_details(self, centre, day):
+        rows = [
+            [
+                farmer + 1,
+                f"XXXXXXXX{(centre * 7919 + farmer) % 10000:04d}",
+                f"किसान {centre}-{farmer}",
+                f"ग्राम {farmer % 50}",
+                f"{10 + (day + farmer) % 5:.2f}",
+                format_amount(2300.0 * (10 + (day + farmer) % 5)),
+                f"{9 + farmer % 8:02d}:{farmer % 60:02d}:00"
+            ]
+            for farmer in range(self.farmers)
+        ]
+        headers = ['क्रम सं०', 'पंजीकरण संख्या', 'किसान का नाम', 'पता', 'मात्रा (कु०)', 'धनराशि', 'क्रय समय']
+        header = f"क्रय दिनांक: {self.get_day(day).strftime(DATE_FORMAT)} क्रय केंद्र : {self._centre_name(centre)}"
+        return self._render(headers, rows, header)
+
+    def get_page(self, path_and_query):
+        """
+        Gets the content served for a path and query.
+
+        Returns:
+            str: Page content, or None if there is no such page
+        """
+        if self.recorded_pages is not None:
+            return self.recorded_pages.get(path_and_query)
+
+        parts = urlsplit(path_and_query)
+        query = parse_qs(parts.query)
+        try:
+            centre = int(query['c'][0]) if 'c' in query else None
+            day = int(query['d'][0]) if 'd' in query else None
+        except ValueError:
+            return None
+        if parts.path == CENTRE_LIST_PATH:
+            return self.render_centre_list()
+        if centre is None or not 0 <= centre < self.centres:
+            return None
+        if parts.path == DATEWISE_PATH:
+            return self.render_datewise(centre)
+        if parts.path == FARMER_PATH and day is not None and 0 <= day < self.days:
+            return self.render_farmer_details(centre, day)
+        return None
+
+    def _make_handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with site._lock:
+                    site.stats['requests'] += 1
+                    delay = site.latency + (site.random.uniform(0, site.jitter) if site.jitter else 0.0)
+                    fail = site.error_rate > 0 and site.random.random() < site.error_rate
+                    if fail:
+                        site.stats['errors_injected'] += 1
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    self._respond(503, b"Service Unavailable")
+                    return
+
+                content = site.get_page(self.path)
+                if content is None:
+                    with site._lock:
+                        site.stats['not_found'] += 1
+                    self._respond(404, b"Not Found")
+                    return
+
+                body = content.encode('utf-8')
+                etag = f'"{zlib.crc32(body):08x}"'
+                if self.headers.get('If-None-Match') == etag:
+                    with site._lock:
+                        site.stats['not_modified'] += 1
+                    self._respond(304, b"", etag)
+                    return
+                self._respond(200, body, etag)
+
+            def _respond(self, status, body, etag=None):
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self, host="127.0.0.1", port=0):
+        """
+        Starts serving on a background thread; port 0 picks a free port.
+
+        Returns:
+            str: Centre list URL of the site
+        """
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MockSite", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        """
+        Stops the server.
+        """
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+def load_recorded_pages(db_path=None):
+    """
+    Loads the newest archived version of every page, keyed by path and
+    query. Links to the government website are rewritten to be relative to
+    the host, so the pages link back to the mock site.
+
+    Args:
+        db_path (str, optional): Database whose page archive to read
+
+    Returns:
+        tuple: (page contents by path and query, path and query of the centre list page)
+    """
+    from upeos.db.connection import DatabaseConnection
+    from upeos.archive.page_archive import PageArchive
+    from upeos.sync.jobs import JOB_CENTRE_LIST
+
+    db = DatabaseConnection(db_path) if db_path else DatabaseConnection()
+    try:
+        archive = PageArchive(db)
+        pages = {}
+        entry_path = None
+        origin = "{0.scheme}://{0.netloc}".format(urlsplit(BASE_URL))
+        for version in archive.get_latest_versions():
+            content = archive.load(version['html_hash'])
+            if content is None:
+                continue
+            parts = urlsplit(version['url'])
+            key = parts.path + (f"?{parts.query}" if parts.query else "")
+            pages[key] = content.replace(origin, "")
+            if version['page_type'] == JOB_CENTRE_LIST:
+                entry_path = key
+    finally:
+        db.close()
+    if entry_path is None:
+        raise RuntimeError("The page archive holds no centre list page")
+    return pages, entry_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a mock procurement website for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--centres", type=int, default=10, help="Number of purchase centres")
+    parser.add_argument("--days", type=int, default=30, help="Purchase days per centre, ending today")
+    parser.add_argument("--farmers", type=int, default=100, help="Farmer transactions per centre and day")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency of up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 503")
+    parser.add_argument("--chrome", action="store_true",
+                        help="Wrap pages in the real site's scripts, view state and navigation")
+    parser.add_argument("--recorded", action="store_true",
+                        help="Serve the pages recorded in the page archive instead of synthetic pages")
+    parser.add_argument("--db", help="Database whose page archive --recorded serves")
+    args = parser.parse_args()
+
+    recorded_pages, entry_path = load_recorded_pages(args.db) if args.recorded else (None, CENTRE_LIST_PATH)
+    site = MockSite(
+        centres=args.centres,
+        days=args.days,
+        farmers=args.farmers,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        recorded_pages=recorded_pages,
+        entry_path=entry_path,
+        chrome=args.chrome
+    )
+    base_url = site.start(args.host, args.port)
+    print(f"Mock site serving at {base_url}")
+    print("Set base_url in config/settings.yaml to this URL to sync from it; Ctrl+C stops the server")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.stop()
+        print(f"Requests: {site.stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Parser backend parity check for UPEOS
+Parses synthetic pages (and optionally every page in the page archive) with the
+BeautifulSoup reference parsers and every other backend, and fails on any difference
+in the parsed data or the detected page type
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+import warnings
+
+from upeos.benchmarks.mock_site import CENTRE_LIST_PATH, MockSite
+from upeos.parser.backends import BACKEND_BS4, PARSER_BACKENDS, check_parity, find_difference, get_parser_backend
+
+def synthetic_pages(farmers):
+    """Mock-site pages plus the markup variations the parsers must agree on"""
+    site = MockSite(centres=25, days=30, farmers=farmers)
+    farmer_page = site.render_farmer_details(1, 2)
+    datewise_page = site.render_datewise(1)
+    pages = [
+        ("centre list", 'centre_list', site.render_centre_list()),
+        ("date-wise summary", 'datewise_summary', datewise_page),
+        ("farmer details", 'farmer_details', farmer_page),
+        ("empty document", 'farmer_details', ""),
+        ("no tblSample table", 'datewise_summary', "<html><body><table><tr><td>x</td></tr></table></body></html>"),
+        ("table without header row", 'farmer_details', farmer_page.replace('किसान का नाम', 'नाम')),
+        ("table with a single row", 'centre_list', '<table id="tblSample"><tr><td>x</td></tr></table>'),
+        ("nested markup in cells", 'farmer_details', farmer_page.replace(
+            '<td>किसान 1-3</td>', '<td> <span>किसान</span> <!-- masked --> 1-3<br/>&nbsp;</td>'
+        ).replace(
+            '<td>ग्राम 4</td>', '<td><script>var village = 4;</script>ग्राम <b>4</b></td>'
+        )),
+        ("invalid dates and counts", 'datewise_summary', datewise_page.replace(
+            site.get_day(0).strftime('%d/%m/'), '31/02/'
+        ).replace(f'<td>{farmers}</td>', '<td>n/a</td>', 1)),
+        ("XML declaration", 'farmer_details', '<?xml version="1.0" encoding="iso-8859-1"?>' + farmer_page),
+        ("other declared charset", 'farmer_details', farmer_page.replace('utf-8', 'iso-8859-1'))
+    ]
+    url = "http://localhost" + CENTRE_LIST_PATH
+    return [(name, page_type, html_content, url) for name, page_type, html_content in pages]
+
+def archived_pages(db_path=None):
+    """The newest archived version of every page"""
+    from upeos.db.connection import DatabaseConnection
+    from upeos.archive.page_archive import PageArchive
+    db = DatabaseConnection(db_path) if db_path else DatabaseConnection()
+    try:
+        archive = PageArchive(db)
+        for version in archive.get_latest_versions():
+            html_content = archive.load(version['html_hash'])
+            if html_content is not None:
+                yield version['url'], version['page_type'], html_content, version['url']
+    finally:
+        db.close()
+
+def check_detection(page_type, html_content, url, candidates):
+    """
+    Compares every backend's parse_page with the reference's, and the reference's
+    detected page type with the expected one. Pages without a recognisable
+    table are detected as unknown, which is not a mismatch.
+    
+    Returns:
+        list: Descriptions of the differences
+    """
+    detected, expected = get_parser_backend(BACKEND_BS4).parse_page(html_content, url)
+    differences = []
+    if detected not in (page_type, 'unknown'):
+        differences.append(f"{BACKEND_BS4} detected a {detected} page")
+    for name in candidates:
+        difference = find_difference([detected, expected], list(get_parser_backend(name).parse_page(html_content, url)))
+        if difference:
+            differences.append(f"{name} parse_page: {difference}")
+    return differences
+
+def time_backend(name, page_type, html_content, url):
+    start = time.perf_counter()
+    get_parser_backend(name).parse(page_type, html_content, url)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that every parser backend matches the BeautifulSoup parsers")
+    parser.add_argument("--farmers", type=int, default=2000, help="Rows of the synthetic farmer page")
+    parser.add_argument("--archive", action="store_true", help="Also check every page in the page archive")
+    parser.add_argument("--db", help="Database whose page archive --archive checks")
+    args = parser.parse_args()
+
+    pages = synthetic_pages(args.farmers)
+    if args.archive:
+        pages.extend(archived_pages(args.db))
+
+    candidates = [name for name in PARSER_BACKENDS if name != BACKEND_BS4]
+    seconds = {name: 0.0 for name in PARSER_BACKENDS}
+    failures = 0
+    for name, page_type, html_content, url in pages:
+        # The parsers print warnings for malformed pages; only differences matter here
+        with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            differences = check_parity(page_type, html_content, url, candidates=candidates)
+            detection_differences = check_detection(page_type, html_content, url, candidates)
+            for backend in PARSER_BACKENDS:
+                seconds[backend] += time_backend(backend, page_type, html_content, url)
+        for backend, difference in differences.items():
+            if difference:
+                failures += 1
+                print(f"MISMATCH {backend} on {name} ({page_type}): {difference}")
+        for difference in detection_differences:
+            failures += 1
+            print(f"MISMATCH on {name} ({page_type}): {difference}")
+
+    print(f"Pages checked:     {len(pages)}")
+    for backend, total in seconds.items():
+        print(f"{backend + ' parse time:':<19}{total:8.3f} s")
+    if failures:
+        print(f"{failures} differences from the {BACKEND_BS4} parsers")
+        sys.exit(1)
+    print(f"All backends match the {BACKEND_BS4} parsers")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Sync pipeline fault check for UPEOS
+Runs full syncs against the local mock site while injecting database errors into
+the fetch and write stages, and fails if a sync hangs or leaves jobs unfinished
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+
+from upeos.benchmarks.bench_sync import use_fresh_database
+from upeos.benchmarks.mock_site import MockSite
+from upeos.config.settings import get_settings
+from upeos.db.connection import DatabaseConnection
+from upeos.scripts.full_sync import FullSyncEngine
+from upeos.sync.engine import SyncEngine
+from upeos.sync.jobs import SyncJobQueue
+from upeos.sync.pipeline import SyncPipeline
+
+def database_locked():
+    return sqlite3.OperationalError("database is locked")
+
+def in_writer(*args):
+    return threading.current_thread().name == "sync-write"
+
+# Name, faults as (class, method, calls that raise, condition on the call), whether the sync should finish
+CASES = [
+    ("freshness update locked", [(SyncPipeline, "_record_freshness", 1, None)], True),
+    ("job claim locked", [(SyncJobQueue, "claim", 3, None)], True),
+    # The page fails in its batch and again when the batch is retried page by page
+    ("failed page, then its job failure locked",
+     [(SyncEngine, "store_farmer_details", 2, None), (SyncJobQueue, "fail", 1, None)], True),
+    ("writer cannot open the database", [(SyncPipeline, "_open_resources", 1, in_writer)], False)
+]
+
+@contextlib.contextmanager
+def raise_on_calls(owner, name, times, condition=None):
+    """
+    Make the first calls of owner.name that match condition raise 'database is locked'.
+    Yields a dict counting the errors raised.
+    """
+    original = getattr(owner, name)
+    lock = threading.Lock()
+    state = {'raised': 0}
+
+    def patched(*args, **kwargs):
+        with lock:
+            raise_now = state['raised'] < times and (condition is None or condition(*args))
+            if raise_now:
+                state['raised'] += 1
+        if raise_now:
+            raise database_locked()
+        return original(*args, **kwargs)
+
+    setattr(owner, name, patched)
+    try:
+        yield state
+    finally:
+        setattr(owner, name, original)
+
+def run_case(faults, fetch_mode, timeout):
+    """
+    Runs one full sync with the faults injected.
+
+    Returns:
+        tuple: (engine, or None if the sync hung; whether every fault was raised)
+    """
+    engine = FullSyncEngine(max_workers=4, sync_mode="full", parse_workers=2, fetch_mode=fetch_mode,
+                            max_connections=4)
+    with contextlib.ExitStack() as patches:
+        states = [patches.enter_context(raise_on_calls(owner, name, times, condition))
+                  for owner, name, times, condition in faults]
+        thread = threading.Thread(target=engine.run_full_sync, daemon=True)
+        thread.start()
+        thread.join(timeout)
+    injected = all(state['raised'] == fault[2] for state, fault in zip(states, faults))
+    if thread.is_alive():
+        engine.stop()
+        return None, injected
+    return engine, injected
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the sync pipeline survives database errors")
+    parser.add_argument("--centres", type=int, default=2)
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--farmers", type=int, default=20, help="Farmer rows per centre and day")
+    parser.add_argument("--engines", default="threads,async", help="Comma-separated fetch modes: threads, async")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds before a sync counts as hung")
+    args = parser.parse_args()
+
+    site = MockSite(centres=args.centres, days=args.days, farmers=args.farmers)
+    get_settings().update({'base_url': site.start(), 'request_delay': 0.002, 'rate_limit_lock_dir': None})
+    logging.getLogger().setLevel(logging.CRITICAL)
+    expected_rows = args.centres * args.days * args.farmers
+
+    failures = 0
+    hung = False
+    print(f"{'Fault':<42} {'Engine':<8} {'Result':<10} Jobs")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for fetch_mode in [name.strip() for name in args.engines.split(",") if name.strip()]:
+            for i, (name, faults, finishes) in enumerate(CASES):
+                use_fresh_database(tmp_dir, f"{fetch_mode}-{i}")
+                with contextlib.redirect_stdout(io.StringIO()):
+                    engine, injected = run_case(faults, fetch_mode, args.timeout)
+                if engine is None:
+                    failures += 1
+                    hung = True
+                    print(f"{name:<42} {fetch_mode:<8} {'HUNG':<10}")
+                    continue
+
+                db = DatabaseConnection()
+                status = SyncJobQueue(db).get_status()
+                rows = db.execute_query("SELECT COUNT(*) FROM farmer_transactions")[0][0]
+                db.close()
+                if finishes:
+                    ok = (not engine.stop_event.is_set() and rows == expected_rows
+                          and status['DONE'] and not status['PENDING'] + status['RUNNING'] + status['FAILED'])
+                else:
+                    ok = engine.stop_event.is_set()
+                if not ok or not injected:
+                    failures += 1
+                result = ("finished" if not engine.stop_event.is_set() else "stopped") if ok else "FAILED"
+                if not injected:
+                    result = "NOT RUN"
+                print(f"{name:<42} {fetch_mode:<8} {result:<10} {status}, {rows} farmer rows")
+    site.stop()
+    if failures:
+        print(f"{failures} cases failed")
+        sys.stdout.flush()
+        if hung:
+            # The hung sync's threads would keep the process alive
+            os._exit(1)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -11,12 +11,23 @@ class Settings:
     # Default settings
     _defaults = {
         'request_delay': 1.0,
+        'base_url': None,
+        'parser_backend': 'lxml',
         'database_path': './data/upeos.db',
         'log_directory': './logs',
         'report_directory': './reports',
         'creport_registry': './data/creports.json',
         'enable_cloud_upload': True,  # Changed default to True
-        'max_retries': 3
+        'max_retries': 3,
+        'request_timeout': 30,
+        'http_pool_size': 16,
+        'db_pool_size': 4,
+        'rate_limit_burst': 1,
+        'rate_limit_lock_dir': './data/ratelimit',
+        'retry_policies': {},
+        'circuit_breaker': {'failure_threshold': 5, 'cooldown_seconds': 60},
+        'adaptive_pacing': {'enabled': True},
+        'archive': {'enabled': True}
     }
     
     def __init__(self, config_dir="./config"):
@@ -64,6 +75,16 @@ class Settings:
         """
         return self._settings.get(key, default)
     
+    def update(self, overrides):
+        """
+        Overrides settings at runtime, e.g. to point a benchmark at a
+        temporary database and a local mock site.
+        
+        Args:
+            overrides (dict): Setting keys and values
+        """
+        self._settings.update(overrides)
+    
     def __getattr__(self, name):
         """
         Allows accessing settings as attributes.
@@ -40,4 +40,4 @@ class SyncConfig:
         """
         Gets the default sync mode.
         """
-        return self._sync_settings.get('default_sync_mode', 'missing_only')
\ No newline at end of file
+        return self._sync_settings.get('default_sync_mode', 'stale_only')
\ No newline at end of file
@@ -2,7 +2,9 @@
 
 import sqlite3
 import os
-from ..config.settings import Settings
+from contextlib import contextmanager
+from ..config.settings import get_settings
+from .migrations import ensure_schema
 
 class DatabaseConnection:
     """
@@ -10,9 +12,10 @@ class DatabaseConnection:
     """
     
     def __init__(self, db_path=None):
-        self.settings = Settings()
+        self.settings = get_settings()
         self.db_path = db_path or self.settings.database_path or "./data/upeos.db"
         self.connection = None
+        self._transaction_depth = 0
         
         # Ensure data directory exists
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
@@ -22,63 +25,9 @@ class DatabaseConnection:
     
     def _initialize_database(self):
         """
-        Initializes the database by creating tables if they don't exist.
+        Ensures the database schema is at the latest version.
         """
-        with sqlite3.connect(self.db_path) as conn:
-            with open(os.path.join(os.path.dirname(__file__), 'schema.sql'), 'r') as f:
-                schema = f.read()
-                conn.executescript(schema)
-            
-            # Check if we need to update the farmer_transactions table
-            # This is needed because SQLite doesn't support dropping constraints directly
-            cursor = conn.cursor()
-            cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='farmer_transactions'")
-            result = cursor.fetchone()
-            
-            if result and 'UNIQUE(centre_id, date, farmer_id)' in result[0]:
-                print("Updating farmer_transactions table to remove UNIQUE constraint...")
-                # We need to recreate the table without the UNIQUE constraint
-                # First, rename the existing table
-                try:
-                    cursor.execute("ALTER TABLE farmer_transactions RENAME TO farmer_transactions_old")
-                    
-                    # Create the new table with the correct schema
-                    cursor.execute("""
-                    CREATE TABLE farmer_transactions (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        centre_id INTEGER NOT NULL,
-                        date DATE NOT NULL,
-                        farmer_id TEXT,
-                        farmer_name TEXT,
-                        village TEXT,
-                        quantity REAL,
-                        amount REAL,
-                        transaction_time TEXT,
-                        last_synced TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (centre_id) REFERENCES centres (id)
-                    )
-                    """)
-                    
-                    # Copy data from old table to new table
-                    cursor.execute("""
-                    INSERT INTO farmer_transactions 
-                    (id, centre_id, date, farmer_id, farmer_name, village, quantity, amount, transaction_time, last_synced)
-                    SELECT id, centre_id, date, farmer_id, farmer_name, village, quantity, amount, transaction_time, last_synced
-                    FROM farmer_transactions_old
-                    """)
-                    
-                    # Drop the old table
-                    cursor.execute("DROP TABLE farmer_transactions_old")
-                    
-                    # Recreate indexes
-                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_farmer_centre_date ON farmer_transactions(centre_id, date)")
-                    
-                    conn.commit()
-                    print("Successfully updated farmer_transactions table")
-                except sqlite3.Error as e:
-                    print(f"Error updating farmer_transactions table: {e}")
-                    # Rollback the changes
-                    conn.rollback()
+        ensure_schema(self.db_path)
     
     def get_connection(self):
         """
@@ -121,11 +70,42 @@ class DatabaseConnection:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
-            conn.commit()
+            if not self._transaction_depth:
+                conn.commit()
             return cursor.rowcount
+        except Exception as e:
+            if not self._transaction_depth:
+                conn.rollback()
+            raise e
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Yields a cursor whose statements are committed together,
+        or rolled back if any of them fails.
+        
+        Transactions nest: statements run inside an outer transaction
+        (including execute_update calls) are committed with it.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield cursor
+            finally:
+                self._transaction_depth -= 1
+            return
+        
+        self._transaction_depth = 1
+        try:
+            yield cursor
+            conn.commit()
         except Exception as e:
             conn.rollback()
             raise e
+        finally:
+            self._transaction_depth = 0
     
     def execute_transaction(self, queries_and_params):
         """
@@ -139,7 +119,9 @@ class DatabaseConnection:
                     cursor.execute(query, params)
                 else:
                     cursor.execute(query)
-            conn.commit()
+            if not self._transaction_depth:
+                conn.commit()
         except Exception as e:
-            conn.rollback()
+            if not self._transaction_depth:
+                conn.rollback()
             raise e
\ No newline at end of file
@@ -2,7 +2,305 @@
 
 import sqlite3
 import os
-from .connection import DatabaseConnection
+import threading
+from ..utils.timeutils import date_to_ordinal
+from ..utils.hashing import compute_row_fingerprint
+
+# Table recording every migration applied to the database
+SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+def _apply_initial_schema(conn):
+    """
+    Applies the baseline schema from schema.sql.
+    """
+    schema_file = os.path.join(os.path.dirname(__file__), 'schema.sql')
+    if not os.path.exists(schema_file):
+        raise FileNotFoundError(f"Schema file not found: {schema_file}")
+    with open(schema_file, 'r') as f:
+        conn.executescript(f.read())
+
+def _drop_farmer_unique_constraint(conn):
+    """
+    Recreates farmer_transactions without the legacy UNIQUE(centre_id, date, farmer_id)
+    constraint, since the same farmer can have multiple transactions on the same day.
+    SQLite doesn't support dropping constraints directly.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='farmer_transactions'")
+    result = cursor.fetchone()
+    if not result or 'UNIQUE(centre_id, date, farmer_id)' not in result[0]:
+        return
+
+    print("Updating farmer_transactions table to remove UNIQUE constraint...")
+    cursor.execute("ALTER TABLE farmer_transactions RENAME TO farmer_transactions_old")
+    cursor.execute("""
+    CREATE TABLE farmer_transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        centre_id INTEGER NOT NULL,
+        date DATE NOT NULL,
+        farmer_id TEXT,
+        farmer_name TEXT,
+        village TEXT,
+        quantity REAL,
+        amount REAL,
+        transaction_time TEXT,
+        last_synced TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (centre_id) REFERENCES centres (id)
+    )
+    """)
+    cursor.execute("""
+    INSERT INTO farmer_transactions
+    (id, centre_id, date, farmer_id, farmer_name, village, quantity, amount, transaction_time, last_synced)
+    SELECT id, centre_id, date, farmer_id, farmer_name, village, quantity, amount, transaction_time, last_synced
+    FROM farmer_transactions_old
+    """)
+    cursor.execute("DROP TABLE farmer_transactions_old")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_farmer_centre_date ON farmer_transactions(centre_id, date)")
+    print("Successfully updated farmer_transactions table")
+
+def _column_exists(conn, table, column):
+    """
+    Checks whether a table already has the given column.
+    """
+    return any(row[1] == column for row in conn.execute(f"PRAGMA table_info({table})"))
+
+def _add_date_ordinal_columns(conn):
+    """
+    Adds a sortable day-ordinal column next to each DD/MM/YYYY text date,
+    backfills it and indexes it so date range filters can use a range scan.
+    """
+    conn.create_function("upeos_date_ordinal", 1, date_to_ordinal, deterministic=True)
+    for table in ('datewise_summaries', 'farmer_transactions', 'sync_state'):
+        if not _column_exists(conn, table, 'date_ordinal'):
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN date_ordinal INTEGER")
+        conn.execute(f"UPDATE {table} SET date_ordinal = upeos_date_ordinal(date)")
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_datewise_ordinal ON datewise_summaries(date_ordinal)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_datewise_centre_ordinal ON datewise_summaries(centre_id, date_ordinal)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_farmer_ordinal ON farmer_transactions(date_ordinal)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_farmer_centre_ordinal ON farmer_transactions(centre_id, date_ordinal)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sync_state_centre_ordinal ON sync_state(centre_id, date_ordinal)")
+
+def _add_page_hashes_table(conn):
+    """
+    Adds the table recording the content hash of every fetched page.
+    """
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS page_hashes (
+        url TEXT PRIMARY KEY,
+        page_type TEXT NOT NULL,  -- centre_list, datewise_summary, farmer_details
+        html_hash TEXT NOT NULL,
+        last_checked TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_changed TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+def _add_sync_jobs_table(conn):
+    """
+    Adds the persistent sync job queue.
+    """
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS sync_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_key TEXT UNIQUE NOT NULL,
+        page_type TEXT NOT NULL,  -- centre_list, datewise_summary, farmer_details
+        centre_id INTEGER,
+        centre_name TEXT,
+        date DATE,
+        sync_mode TEXT,
+        state TEXT NOT NULL DEFAULT 'PENDING',  -- PENDING, RUNNING, DONE, FAILED
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (centre_id) REFERENCES centres (id)
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sync_jobs_state ON sync_jobs(state, id)")
+
+def _add_page_validator_columns(conn):
+    """
+    Adds the HTTP cache validators (ETag, Last-Modified) returned for each page.
+    """
+    for column in ('etag', 'last_modified'):
+        if not _column_exists(conn, 'page_hashes', column):
+            conn.execute(f"ALTER TABLE page_hashes ADD COLUMN {column} TEXT")
+
+def _add_sync_job_retry_at(conn):
+    """
+    Adds the time before which a failed sync job must not be retried.
+    """
+    if not _column_exists(conn, 'sync_jobs', 'retry_at'):
+        conn.execute("ALTER TABLE sync_jobs ADD COLUMN retry_at TIMESTAMP")
+
+def _add_sync_job_priority(conn):
+    """
+    Adds the scheduling columns of sync jobs: the data state of the page,
+    its priority and its position among the same centre's jobs.
+    """
+    if not _column_exists(conn, 'sync_jobs', 'data_state'):
+        conn.execute("ALTER TABLE sync_jobs ADD COLUMN data_state TEXT")
+    if not _column_exists(conn, 'sync_jobs', 'priority'):
+        conn.execute("ALTER TABLE sync_jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+    if not _column_exists(conn, 'sync_jobs', 'centre_seq'):
+        conn.execute("ALTER TABLE sync_jobs ADD COLUMN centre_seq INTEGER NOT NULL DEFAULT 0")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sync_jobs_priority ON sync_jobs(state, priority, centre_seq, id)"
+    )
+
+def _add_page_archive_table(conn):
+    """
+    Adds the metadata of the raw page archive: one row per distinct content
+    of each page, pointing at a compressed blob named by its SHA-256 hash.
+    """
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS page_archive (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT NOT NULL,
+        page_type TEXT NOT NULL,  -- centre_list, datewise_summary, farmer_details
+        html_hash TEXT NOT NULL,
+        page_date TEXT,  -- Date of a farmer-detail page; NULL for pages without one
+        date_ordinal INTEGER,
+        etag TEXT,
+        last_modified TEXT,
+        stored_size INTEGER,  -- Compressed bytes
+        compression TEXT,
+        first_fetched TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_fetched TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        fetch_count INTEGER NOT NULL DEFAULT 1,
+        UNIQUE (url, html_hash)
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_page_archive_hash ON page_archive(html_hash)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_page_archive_url_fetched ON page_archive(url, last_fetched)")
+
+def _add_transaction_fingerprints(conn):
+    """
+    Adds a fingerprint of every farmer transaction's values with a unique
+    index, so resyncs can write only the rows that changed, and the log of
+    those changes. Exact duplicate rows are removed first.
+    """
+    conn.create_function(
+        "upeos_row_fingerprint", 8,
+        lambda *values: compute_row_fingerprint(values),
+        deterministic=True
+    )
+    if not _column_exists(conn, 'farmer_transactions', 'fingerprint'):
+        conn.execute("ALTER TABLE farmer_transactions ADD COLUMN fingerprint TEXT")
+    conn.execute("""
+    UPDATE farmer_transactions
+    SET fingerprint = upeos_row_fingerprint(centre_id, date, farmer_id, farmer_name, village,
+                                            quantity, amount, transaction_time)
+    """)
+    conn.execute("""
+    DELETE FROM farmer_transactions
+    WHERE id NOT IN (SELECT MIN(id) FROM farmer_transactions GROUP BY fingerprint)
+    """)
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_farmer_fingerprint ON farmer_transactions(fingerprint)")
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS transaction_changes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        centre_id INTEGER NOT NULL,
+        date DATE NOT NULL,
+        date_ordinal INTEGER,
+        rows_added INTEGER NOT NULL,
+        rows_removed INTEGER NOT NULL,
+        rows_total INTEGER NOT NULL,  -- Transactions stored for the day after the change
+        html_hash TEXT,  -- Page content the change was derived from
+        changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (centre_id) REFERENCES centres (id)
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transaction_changes_centre ON transaction_changes(centre_id, date_ordinal)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transaction_changes_time ON transaction_changes(changed_at)")
+
+# Ordered migration steps as (version, description, step function).
+# Steps must also be safe on databases created before versioning existed.
+MIGRATIONS = [
+    (1, "Initial schema", _apply_initial_schema),
+    (2, "Remove UNIQUE constraint from farmer_transactions", _drop_farmer_unique_constraint),
+    (3, "Add indexed date_ordinal columns", _add_date_ordinal_columns),
+    (4, "Add page_hashes table", _add_page_hashes_table),
+    (5, "Add sync_jobs table", _add_sync_jobs_table),
+    (6, "Add HTTP validator columns to page_hashes", _add_page_validator_columns),
+    (7, "Add retry_at column to sync_jobs", _add_sync_job_retry_at),
+    (8, "Add priority scheduling columns to sync_jobs", _add_sync_job_priority),
+    (9, "Add page_archive table", _add_page_archive_table),
+    (10, "Add farmer transaction fingerprints and change log", _add_transaction_fingerprints),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# Database paths already brought up to date by this process
+_migrated_paths = set()
+_migrated_lock = threading.Lock()
+
+def get_schema_version(conn):
+    """
+    Gets the schema version recorded in the database, or 0 if unversioned.
+    """
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+def migrate_database(conn):
+    """
+    Applies all pending migrations in order, each in its own transaction.
+
+    Returns:
+        int: Schema version after migrating
+    """
+    conn.execute(SCHEMA_VERSION_TABLE)
+    current_version = get_schema_version(conn)
+
+    for version, description, step in MIGRATIONS:
+        if version <= current_version:
+            continue
+        try:
+            step(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (version, description)
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"Error applying migration {version} ({description}): {e}")
+            raise
+        current_version = version
+
+    return current_version
+
+def ensure_schema(db_path):
+    """
+    Brings the database at db_path up to the latest schema version.
+
+    The check runs once per path per process; afterwards it costs a set lookup.
+    When the database is already current it costs a single integer comparison.
+    """
+    key = os.path.abspath(db_path)
+    if key in _migrated_paths:
+        return
+
+    with _migrated_lock:
+        if key in _migrated_paths:
+            return
+        conn = sqlite3.connect(db_path)
+        try:
+            if get_schema_version(conn) < LATEST_VERSION:
+                migrate_database(conn)
+        finally:
+            conn.close()
+        _migrated_paths.add(key)
 
 class DatabaseMigration:
     """
@@ -17,41 +315,17 @@ class DatabaseMigration:
         """
         Gets the current database schema version.
         """
-        # For now, we'll use a simple approach of checking if tables exist
-        # In a more complex system, we would have a dedicated migrations table
-        try:
-            result = self.db_conn.execute_query(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='centres'"
-            )
-            return 1 if result else 0
-        except Exception:
-            return 0
+        return get_schema_version(self.db_conn.get_connection())
     
     def migrate_to_latest(self):
         """
         Migrates the database to the latest schema version.
         """
-        # Since we're starting with version 1, we just need to ensure
-        # the schema is properly initialized
-        if self.current_version < 1:
-            self._apply_initial_schema()
-            self.current_version = 1
-    
-    def _apply_initial_schema(self):
-        """
-        Applies the initial database schema.
-        """
-        schema_file = os.path.join(os.path.dirname(__file__), 'schema.sql')
-        if os.path.exists(schema_file):
-            with open(schema_file, 'r') as f:
-                schema = f.read()
-                conn = self.db_conn.get_connection()
-                conn.executescript(schema)
-        else:
-            raise FileNotFoundError(f"Schema file not found: {schema_file}")
+        if self.current_version < LATEST_VERSION:
+            self.current_version = migrate_database(self.db_conn.get_connection())
     
     def get_version(self):
         """
         Returns the current database version.
         """
-        return self.current_version
\ No newline at end of file
+        return self.current_version
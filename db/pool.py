@@ -0,0 +1,188 @@
+# Process-wide SQLite connection pool
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from .connection import DatabaseConnection
+from ..config.settings import get_settings
+
+class ConnectionPool:
+    """
+    Pool of long-lived SQLite connections: several readers and a single writer.
+
+    The schema is initialized once when the pool is created, so checking a
+    connection out of the pool costs a queue operation instead of a settings
+    reload and a DDL round trip.
+    """
+
+    def __init__(self, db_path=None, size=None):
+        settings = get_settings()
+
+        # Initialize the schema once through the regular connection class
+        bootstrap = DatabaseConnection(db_path)
+        self.db_path = bootstrap.db_path
+        bootstrap.close()
+
+        self.size = size or settings.db_pool_size or 4
+        self._readers = queue.Queue()
+        self._writer = self._connect()
+        self._writer_lock = threading.RLock()
+        self._closed = False
+
+        for _ in range(self.size):
+            self._readers.put(self._connect())
+
+    def _connect(self):
+        """
+        Opens a connection that may be handed between threads.
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL lets readers proceed while the writer holds the write lock
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def acquire(self, timeout=None):
+        """
+        Checks a connection out of the pool.
+
+        Returns:
+            PooledConnection: Connection to be returned with close()
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        return PooledConnection(self, self._readers.get(timeout=timeout))
+
+    def release(self, reader):
+        """
+        Returns a reader connection to the pool.
+        """
+        if self._closed:
+            reader.close()
+        else:
+            self._readers.put(reader)
+
+    @contextmanager
+    def writer(self):
+        """
+        Gives exclusive access to the single writer connection.
+        """
+        with self._writer_lock:
+            yield self._writer
+
+    def close(self):
+        """
+        Closes all pooled connections.
+        """
+        self._closed = True
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._writer_lock:
+            self._writer.close()
+
+class PooledConnection(DatabaseConnection):
+    """
+    DatabaseConnection backed by a pooled reader and the pool's shared writer.
+
+    Reads run on the checked-out reader connection; all writes are serialized
+    through the single writer connection.
+    """
+
+    def __init__(self, pool, reader):
+        # The pool has already initialized the schema
+        self.pool = pool
+        self.db_path = pool.db_path
+        self.connection = reader
+        self._transaction_depth = 0
+
+    def close(self):
+        """
+        Returns the reader connection to the pool.
+        """
+        if self.connection:
+            self.pool.release(self.connection)
+            self.connection = None
+
+    def execute_query(self, query, params=None):
+        """
+        Executes a SELECT query, on the writer connection inside a transaction
+        so that the transaction's own uncommitted writes are visible.
+        """
+        if not self._transaction_depth:
+            return super().execute_query(query, params)
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            return cursor.fetchall()
+    
+    def execute_update(self, query, params=None):
+        """
+        Executes an INSERT/UPDATE/DELETE query on the writer connection.
+        """
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            try:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                if not self._transaction_depth:
+                    conn.commit()
+                return cursor.rowcount
+            except Exception as e:
+                if not self._transaction_depth:
+                    conn.rollback()
+                raise e
+
+    @contextmanager
+    def transaction(self):
+        """
+        Yields a writer cursor whose statements are committed together,
+        or rolled back if any of them fails. Transactions nest.
+        """
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            if self._transaction_depth:
+                self._transaction_depth += 1
+                try:
+                    yield cursor
+                finally:
+                    self._transaction_depth -= 1
+                return
+            
+            self._transaction_depth = 1
+            try:
+                yield cursor
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+            finally:
+                self._transaction_depth = 0
+
+    def execute_transaction(self, queries_and_params):
+        """
+        Executes multiple queries in a transaction on the writer connection.
+        """
+        with self.pool.writer() as conn:
+            cursor = conn.cursor()
+            try:
+                for query, params in queries_and_params:
+                    if params:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
+                if not self._transaction_depth:
+                    conn.commit()
+            except Exception as e:
+                if not self._transaction_depth:
+                    conn.rollback()
+                raise e
@@ -0,0 +1,171 @@
+# Raw page archive repository
+
+from ..connection import DatabaseConnection
+from ...core.constants import DATA_STATE_OPEN, DATA_STATE_CLOSING, DATA_STATE_CLOSED
+
+class ArchiveRepository:
+    """
+    Repository for the metadata of archived page versions.
+    
+    A version is a distinct content (html_hash) seen for a URL. Fetching the
+    same content again only updates the version's last fetch time and count.
+    """
+    
+    def __init__(self, db_connection: DatabaseConnection):
+        self.db_conn = db_connection
+    
+    def record_version(self, url, page_type, html_hash, page_date=None, date_ordinal=None,
+                       etag=None, last_modified=None, stored_size=None, compression=None):
+        """
+        Records a fetch of a page's content, adding a version if the content is new.
+        """
+        query = """
+        INSERT INTO page_archive (url, page_type, html_hash, page_date, date_ordinal,
+                                  etag, last_modified, stored_size, compression)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(url, html_hash) DO UPDATE SET
+        etag = COALESCE(excluded.etag, page_archive.etag),
+        last_modified = COALESCE(excluded.last_modified, page_archive.last_modified),
+        last_fetched = CURRENT_TIMESTAMP,
+        fetch_count = page_archive.fetch_count + 1
+        """
+        self.db_conn.execute_update(query, (
+            url, page_type, html_hash, page_date, date_ordinal,
+            etag, last_modified, stored_size, compression
+        ))
+    
+    def touch_version(self, url, html_hash, etag=None, last_modified=None):
+        """
+        Records a fetch of an already archived version, e.g. after 304 Not Modified.
+        
+        Returns:
+            bool: Whether the version was archived
+        """
+        return self.db_conn.execute_update(
+            """UPDATE page_archive
+               SET last_fetched = CURRENT_TIMESTAMP,
+                   fetch_count = fetch_count + 1,
+                   etag = COALESCE(?, etag),
+                   last_modified = COALESCE(?, last_modified)
+               WHERE url = ? AND html_hash = ?""",
+            (etag, last_modified, url, html_hash)
+        ) > 0
+    
+    def get_versions(self, url):
+        """
+        Retrieves the archived versions of a page, newest first.
+        """
+        results = self.db_conn.execute_query(
+            """SELECT html_hash, page_type, page_date, etag, last_modified, stored_size,
+                      compression, first_fetched, last_fetched, fetch_count
+               FROM page_archive
+               WHERE url = ?
+               ORDER BY last_fetched DESC, id DESC""",
+            (url,)
+        )
+        return [
+            {
+                'html_hash': row[0],
+                'page_type': row[1],
+                'page_date': row[2],
+                'etag': row[3],
+                'last_modified': row[4],
+                'stored_size': row[5],
+                'compression': row[6],
+                'first_fetched': row[7],
+                'last_fetched': row[8],
+                'fetch_count': row[9]
+            }
+            for row in results
+        ]
+    
+    def get_latest_versions(self):
+        """
+        Retrieves the newest archived version of every page.
+        
+        Returns:
+            list: Dictionaries with url, page_type, html_hash and page_date
+        """
+        results = self.db_conn.execute_query(
+            """SELECT url, page_type, html_hash, page_date
+               FROM (
+                   SELECT url, page_type, html_hash, page_date,
+                          ROW_NUMBER() OVER (PARTITION BY url ORDER BY last_fetched DESC, id DESC) AS version
+                   FROM page_archive
+               )
+               WHERE version = 1
+               ORDER BY url"""
+        )
+        return [
+            {'url': row[0], 'page_type': row[1], 'html_hash': row[2], 'page_date': row[3]}
+            for row in results
+        ]
+    
+    def delete_old_versions(self, keep_by_state, today_ordinal):
+        """
+        Deletes all but the newest versions of each page, by the data state of
+        the page's date. Pages without a date are OPEN.
+        
+        Args:
+            keep_by_state (dict): Versions to keep per page by data state;
+                                  None keeps every version
+            today_ordinal (int): Day ordinal of today
+        
+        Returns:
+            int: Number of versions deleted
+        """
+        conditions = []
+        params = [today_ordinal, DATA_STATE_OPEN, today_ordinal - 6, DATA_STATE_CLOSING, DATA_STATE_CLOSED]
+        for data_state, keep in keep_by_state.items():
+            if keep is not None:
+                conditions.append("(data_state = ? AND version > ?)")
+                params.extend([data_state, keep])
+        if not conditions:
+            return 0
+        
+        # Same state boundaries as SyncPlanner.plan_farmer_details
+        query = f"""
+        DELETE FROM page_archive WHERE id IN (
+            SELECT id FROM (
+                SELECT
+                    id,
+                    ROW_NUMBER() OVER (PARTITION BY url ORDER BY last_fetched DESC, id DESC) AS version,
+                    CASE
+                        WHEN date_ordinal IS NULL OR date_ordinal >= ? THEN ?
+                        WHEN date_ordinal >= ? THEN ?
+                        ELSE ?
+                    END AS data_state
+                FROM page_archive
+            )
+            WHERE {" OR ".join(conditions)}
+        )
+        """
+        return self.db_conn.execute_update(query, params)
+    
+    def get_archived_hashes(self):
+        """
+        Gets the content hashes referenced by any archived version.
+        """
+        results = self.db_conn.execute_query("SELECT DISTINCT html_hash FROM page_archive")
+        return {row[0] for row in results}
+    
+    def get_stats(self):
+        """
+        Gets the number of archived pages, versions and distinct contents, and
+        the compressed bytes stored.
+        """
+        result = self.db_conn.execute_query(
+            """SELECT COUNT(DISTINCT url), COUNT(*), COUNT(DISTINCT html_hash)
+               FROM page_archive"""
+        )
+        stored = self.db_conn.execute_query(
+            """SELECT COALESCE(SUM(stored_size), 0)
+               FROM (SELECT html_hash, MAX(stored_size) AS stored_size
+                     FROM page_archive GROUP BY html_hash)"""
+        )
+        return {
+            'pages': result[0][0],
+            'versions': result[0][1],
+            'contents': result[0][2],
+            'stored_bytes': stored[0][0]
+        }
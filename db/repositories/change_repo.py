@@ -0,0 +1,70 @@
+# Farmer transaction change log repository
+
+from ..connection import DatabaseConnection
+from ...utils.timeutils import date_to_ordinal
+
+class TransactionChangeRepository:
+    """
+    Repository for the log of changes to each centre's farmer transactions.
+    
+    Every resync that adds or removes transactions for a centre and date
+    records how many rows changed, so the API can show what each sync
+    actually changed without diffing the data.
+    """
+    
+    def __init__(self, db_connection: DatabaseConnection):
+        self.db_conn = db_connection
+    
+    def record_change(self, centre_id, date, rows_added, rows_removed, rows_total, html_hash=None):
+        """
+        Records a change to the transactions of a centre on a specific date.
+        """
+        self.db_conn.execute_update(
+            """INSERT INTO transaction_changes
+               (centre_id, date, date_ordinal, rows_added, rows_removed, rows_total, html_hash)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (centre_id, date, date_to_ordinal(date), rows_added, rows_removed, rows_total, html_hash)
+        )
+    
+    def get_changes(self, centre_id=None, date=None, limit=100):
+        """
+        Retrieves the most recent changes, optionally for one centre and date.
+        
+        Returns:
+            list: Changes, newest first
+        """
+        conditions = []
+        params = []
+        if centre_id is not None:
+            conditions.append("tc.centre_id = ?")
+            params.append(centre_id)
+        if date is not None:
+            conditions.append("tc.date = ?")
+            params.append(date)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+        
+        results = self.db_conn.execute_query(
+            f"""SELECT tc.id, tc.centre_id, c.name, tc.date, tc.rows_added, tc.rows_removed,
+                       tc.rows_total, tc.html_hash, tc.changed_at
+                FROM transaction_changes tc
+                JOIN centres c ON c.id = tc.centre_id
+                {where}
+                ORDER BY tc.id DESC
+                LIMIT ?""",
+            params
+        )
+        return [
+            {
+                'id': row[0],
+                'centre_id': row[1],
+                'centre_name': row[2],
+                'date': row[3],
+                'rows_added': row[4],
+                'rows_removed': row[5],
+                'rows_total': row[6],
+                'html_hash': row[7],
+                'changed_at': row[8]
+            }
+            for row in results
+        ]
\ No newline at end of file
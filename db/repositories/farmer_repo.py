@@ -1,12 +1,20 @@
 # Farmer repository
 
 from ..connection import DatabaseConnection
+from ...utils.timeutils import date_to_ordinal
+from ...utils.hashing import compute_row_fingerprint
 
 class FarmerRepository:
     """
     Repository for managing farmer transaction data in the database.
     """
     
+    _INSERT_QUERY = """INSERT INTO farmer_transactions
+       (centre_id, date, date_ordinal, farmer_id, farmer_name, village, quantity, amount, transaction_time,
+        fingerprint, last_synced)
+       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+       ON CONFLICT(fingerprint) DO NOTHING"""
+    
     def __init__(self, db_connection: DatabaseConnection):
         self.db_conn = db_connection
     
@@ -14,33 +22,111 @@ class FarmerRepository:
         """
         Creates a new farmer transaction or updates an existing one.
         """
-        # Check if this exact transaction already exists to avoid duplicates
+        # An identical transaction has the same fingerprint; only its last_synced is updated
+        values = (centre_id, date, farmer_id, farmer_name, village, quantity, amount, transaction_time)
         query = """
-        SELECT id FROM farmer_transactions 
-        WHERE centre_id = ? AND date = ? AND farmer_id = ? AND farmer_name = ? 
-        AND village = ? AND quantity = ? AND amount = ? AND transaction_time = ?
+        INSERT INTO farmer_transactions
+        (centre_id, date, date_ordinal, farmer_id, farmer_name, village, quantity, amount, transaction_time,
+         fingerprint, last_synced)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(fingerprint) DO UPDATE SET last_synced = CURRENT_TIMESTAMP
+        """
+        self.db_conn.execute_update(query, (
+            centre_id, date, date_to_ordinal(date), farmer_id, farmer_name, village, quantity, amount,
+            transaction_time, compute_row_fingerprint(values)
+        ))
+    
+    def _fingerprint_rows(self, centre_id, date, rows):
+        """
+        Builds insert parameters for parsed transactions, keyed by fingerprint.
+        Exact duplicate rows collapse into one.
         """
-        params = (centre_id, date, farmer_id, farmer_name, village, quantity, amount, transaction_time)
-        existing = self.db_conn.execute_query(query, params)
+        date_ordinal = date_to_ordinal(date)
+        params = {}
+        for row in rows:
+            values = (
+                centre_id, date, row['farmer_id'], row['farmer_name'], row['village'],
+                row['quantity'], row['amount'], row.get('transaction_time')
+            )
+            fingerprint = compute_row_fingerprint(values)
+            if fingerprint not in params:
+                params[fingerprint] = (
+                    centre_id, date, date_ordinal, *values[2:], fingerprint
+                )
+        return params
+    
+    def replace_transactions_for_day(self, centre_id, date, rows):
+        """
+        Replaces all farmer transactions for a centre on a specific date.
+        
+        The delete and a bulk insert run in a single transaction, so the day
+        is never observed half-written and costs one commit instead of one
+        per row. Exact duplicate rows are stored once, as with
+        create_or_update_transaction. Use sync_transactions_for_day to
+        rewrite only the rows that changed.
         
-        if existing:
-            # Transaction already exists, update the last_synced timestamp
-            update_query = """
-            UPDATE farmer_transactions 
-            SET last_synced = CURRENT_TIMESTAMP 
-            WHERE id = ?
-            """
-            self.db_conn.execute_update(update_query, (existing[0][0],))
-        else:
-            # Insert new transaction
-            insert_query = """
-            INSERT INTO farmer_transactions 
-            (centre_id, date, farmer_id, farmer_name, village, quantity, amount, transaction_time, last_synced)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            """
-            self.db_conn.execute_update(insert_query, (
-                centre_id, date, farmer_id, farmer_name, village, quantity, amount, transaction_time
-            ))
+        Args:
+            centre_id (int): Centre ID
+            date (str): Date in DD/MM/YYYY format
+            rows (list): Transaction dictionaries as returned by parse_farmer_details
+            
+        Returns:
+            int: Number of transactions stored
+        """
+        params = self._fingerprint_rows(centre_id, date, rows)
+        with self.db_conn.transaction() as cursor:
+            cursor.execute(
+                "DELETE FROM farmer_transactions WHERE centre_id = ? AND date = ?",
+                (centre_id, date)
+            )
+            cursor.executemany(self._INSERT_QUERY, params.values())
+        return len(params)
+    
+    def sync_transactions_for_day(self, centre_id, date, rows):
+        """
+        Brings the stored farmer transactions for a centre on a specific date
+        in line with the parsed rows, writing only the difference.
+        
+        Rows are matched by fingerprint: stored rows missing from the page are
+        deleted, new rows are inserted and unchanged rows are left alone, so
+        they keep their IDs and a resync of a day that gained a few rows
+        writes only those rows.
+        
+        Args:
+            centre_id (int): Centre ID
+            date (str): Date in DD/MM/YYYY format
+            rows (list): Transaction dictionaries as returned by parse_farmer_details
+            
+        Returns:
+            dict: 'added', 'removed' and 'unchanged' row counts and the 'total' stored
+        """
+        params = self._fingerprint_rows(centre_id, date, rows)
+        with self.db_conn.transaction() as cursor:
+            cursor.execute(
+                "SELECT id, fingerprint FROM farmer_transactions WHERE centre_id = ? AND date = ?",
+                (centre_id, date)
+            )
+            stored = {}
+            stale_ids = []
+            for row_id, fingerprint in cursor.fetchall():
+                # Rows without a fingerprint predate fingerprinting and are replaced
+                if fingerprint is None or fingerprint in stored:
+                    stale_ids.append(row_id)
+                else:
+                    stored[fingerprint] = row_id
+            
+            stale_ids.extend(row_id for fingerprint, row_id in stored.items() if fingerprint not in params)
+            added = [values for fingerprint, values in params.items() if fingerprint not in stored]
+            if stale_ids:
+                cursor.executemany("DELETE FROM farmer_transactions WHERE id = ?", [(row_id,) for row_id in stale_ids])
+            if added:
+                cursor.executemany(self._INSERT_QUERY, added)
+        return {
+            'added': len(added),
+            'removed': len(stale_ids),
+            'unchanged': len(params) - len(added),
+            'total': len(params)
+        }
     
     def get_transactions_by_centre_and_date(self, centre_id, date):
         """
@@ -76,7 +162,7 @@ class FarmerRepository:
             """SELECT id, centre_id, date, farmer_id, farmer_name, village, quantity, amount, transaction_time
                FROM farmer_transactions 
                WHERE farmer_name LIKE ?
-               ORDER BY date DESC, farmer_name""",
+               ORDER BY date_ordinal DESC, farmer_name""",
             (f'%{farmer_name_pattern}%',)
         )
         return [
@@ -102,7 +188,7 @@ class FarmerRepository:
             """SELECT id, centre_id, date, farmer_id, farmer_name, village, quantity, amount, transaction_time
                FROM farmer_transactions 
                WHERE village LIKE ?
-               ORDER BY date DESC, village, farmer_name""",
+               ORDER BY date_ordinal DESC, village, farmer_name""",
             (f'%{village_pattern}%',)
         )
         return [
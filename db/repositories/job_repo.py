@@ -0,0 +1,205 @@
+# Sync job repository
+
+from ..connection import DatabaseConnection
+
+# Job states
+JOB_STATE_PENDING = "PENDING"
+JOB_STATE_RUNNING = "RUNNING"
+JOB_STATE_DONE = "DONE"
+JOB_STATE_FAILED = "FAILED"
+
+class SyncJobRepository:
+    """
+    Repository for the persistent queue of sync jobs.
+    """
+    
+    def __init__(self, db_connection: DatabaseConnection):
+        self.db_conn = db_connection
+    
+    def enqueue_jobs(self, jobs):
+        """
+        Adds jobs to the queue in one transaction.
+        
+        A job already in the queue is only reset to PENDING if it has finished
+        (DONE or FAILED); running jobs are left untouched and pending jobs
+        only take the new scheduling values.
+        
+        Args:
+            jobs (list): Dictionaries with job_key, page_type and optionally
+                         centre_id, centre_name, date, sync_mode, data_state,
+                         priority and centre_seq
+        """
+        with self.db_conn.transaction() as cursor:
+            cursor.executemany("""
+            INSERT INTO sync_jobs (job_key, page_type, centre_id, centre_name, date, sync_mode,
+                                   data_state, priority, centre_seq, state)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'PENDING')
+            ON CONFLICT(job_key) DO UPDATE SET
+            state = 'PENDING',
+            attempts = CASE WHEN sync_jobs.state = 'PENDING' THEN sync_jobs.attempts ELSE 0 END,
+            last_error = CASE WHEN sync_jobs.state = 'PENDING' THEN sync_jobs.last_error END,
+            retry_at = CASE WHEN sync_jobs.state = 'PENDING' THEN sync_jobs.retry_at END,
+            sync_mode = excluded.sync_mode,
+            data_state = excluded.data_state,
+            priority = excluded.priority,
+            centre_seq = excluded.centre_seq,
+            updated_at = CURRENT_TIMESTAMP
+            WHERE sync_jobs.state IN ('PENDING', 'DONE', 'FAILED')
+            """, [
+                (
+                    job['job_key'], job['page_type'], job.get('centre_id'),
+                    job.get('centre_name'), job.get('date'), job.get('sync_mode'),
+                    job.get('data_state'), job.get('priority', 0), job.get('centre_seq', 0)
+                )
+                for job in jobs
+            ])
+    
+    def claim_next_job(self):
+        """
+        Marks the next pending job that is not waiting out a retry delay
+        as RUNNING and returns it.
+        
+        Jobs are claimed by priority, then round-robin across centres
+        (each centre's first job, then each centre's second job, ...),
+        then in the order they were queued.
+        
+        Returns:
+            dict: Claimed job, or None if no job can run yet
+        """
+        while True:
+            result = self.db_conn.execute_query(
+                """SELECT id, job_key, page_type, centre_id, centre_name, date, sync_mode, attempts,
+                          data_state, priority
+                   FROM sync_jobs
+                   WHERE state = 'PENDING'
+                   AND (retry_at IS NULL OR retry_at <= datetime('now'))
+                   ORDER BY priority, centre_seq, id
+                   LIMIT 1"""
+            )
+            if not result:
+                return None
+            
+            row = result[0]
+            # Another worker may have claimed the job in the meantime
+            claimed = self.db_conn.execute_update(
+                """UPDATE sync_jobs
+                   SET state = 'RUNNING', attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                   WHERE id = ? AND state = 'PENDING'""",
+                (row[0],)
+            )
+            if claimed:
+                return {
+                    'id': row[0],
+                    'job_key': row[1],
+                    'page_type': row[2],
+                    'centre_id': row[3],
+                    'centre_name': row[4],
+                    'date': row[5],
+                    'sync_mode': row[6],
+                    'attempts': row[7] + 1,
+                    'data_state': row[8],
+                    'priority': row[9]
+                }
+    
+    def mark_job_done(self, job_id):
+        """
+        Marks a job as successfully completed.
+        """
+        self.db_conn.execute_update(
+            """UPDATE sync_jobs
+               SET state = 'DONE', last_error = NULL, retry_at = NULL, updated_at = CURRENT_TIMESTAMP
+               WHERE id = ?""",
+            (job_id,)
+        )
+    
+    def mark_job_failed(self, job_id, error, retry, retry_delay=0):
+        """
+        Records a job failure, returning it to the queue if it should be retried.
+        
+        Args:
+            job_id (int): Job ID
+            error (str): Error message
+            retry (bool): Whether to return the job to the queue
+            retry_delay (float): Seconds before the job may be claimed again
+        """
+        self.db_conn.execute_update(
+            """UPDATE sync_jobs
+               SET state = ?, last_error = ?,
+                   retry_at = datetime('now', ?),
+                   updated_at = CURRENT_TIMESTAMP
+               WHERE id = ?""",
+            (JOB_STATE_PENDING if retry else JOB_STATE_FAILED, error, f"+{retry_delay:.3f} seconds", job_id)
+        )
+    
+    def requeue_running_jobs(self):
+        """
+        Returns jobs left RUNNING by an interrupted run to the queue.
+        """
+        return self.db_conn.execute_update(
+            """UPDATE sync_jobs
+               SET state = 'PENDING', updated_at = CURRENT_TIMESTAMP
+               WHERE state = 'RUNNING'"""
+        )
+    
+    def requeue_failed_jobs(self):
+        """
+        Returns jobs that exhausted their attempts to the queue with fresh attempts.
+        """
+        return self.db_conn.execute_update(
+            """UPDATE sync_jobs
+               SET state = 'PENDING', attempts = 0, retry_at = NULL, updated_at = CURRENT_TIMESTAMP
+               WHERE state = 'FAILED'"""
+        )
+    
+    def delete_done_jobs(self):
+        """
+        Removes completed jobs before a new run starts.
+        """
+        return self.db_conn.execute_update("DELETE FROM sync_jobs WHERE state = 'DONE'")
+    
+    def count_jobs_by_state(self, data_state=None):
+        """
+        Counts jobs per state, optionally only jobs for pages in one data state.
+        """
+        if data_state:
+            results = self.db_conn.execute_query(
+                "SELECT state, COUNT(*) FROM sync_jobs WHERE data_state = ? GROUP BY state",
+                (data_state,)
+            )
+        else:
+            results = self.db_conn.execute_query(
+                "SELECT state, COUNT(*) FROM sync_jobs GROUP BY state"
+            )
+        counts = {
+            JOB_STATE_PENDING: 0,
+            JOB_STATE_RUNNING: 0,
+            JOB_STATE_DONE: 0,
+            JOB_STATE_FAILED: 0
+        }
+        counts.update({row[0]: row[1] for row in results})
+        return counts
+    
+    def get_failed_jobs(self, limit=100):
+        """
+        Retrieves jobs that exhausted their attempts.
+        """
+        results = self.db_conn.execute_query(
+            """SELECT id, page_type, centre_name, date, attempts, last_error, updated_at
+               FROM sync_jobs
+               WHERE state = 'FAILED'
+               ORDER BY updated_at DESC
+               LIMIT ?""",
+            (limit,)
+        )
+        return [
+            {
+                'id': row[0],
+                'page_type': row[1],
+                'centre_name': row[2],
+                'date': row[3],
+                'attempts': row[4],
+                'last_error': row[5],
+                'updated_at': row[6]
+            }
+            for row in results
+        ]
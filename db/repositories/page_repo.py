@@ -0,0 +1,76 @@
+# Fetched page repository
+
+from ..connection import DatabaseConnection
+
+class PageRepository:
+    """
+    Repository for tracking the content hash and HTTP cache validators of every fetched page.
+    """
+    
+    def __init__(self, db_connection: DatabaseConnection):
+        self.db_conn = db_connection
+    
+    def get_page(self, url):
+        """
+        Retrieves the tracking record of a page by its URL.
+        """
+        result = self.db_conn.execute_query(
+            """SELECT url, page_type, html_hash, last_checked, last_changed, etag, last_modified
+               FROM page_hashes
+               WHERE url = ?""",
+            (url,)
+        )
+        if result:
+            return {
+                'url': result[0][0],
+                'page_type': result[0][1],
+                'html_hash': result[0][2],
+                'last_checked': result[0][3],
+                'last_changed': result[0][4],
+                'etag': result[0][5],
+                'last_modified': result[0][6]
+            }
+        return None
+    
+    def get_page_hash(self, url):
+        """
+        Retrieves the stored content hash of a page, or None if never recorded.
+        """
+        result = self.db_conn.execute_query(
+            "SELECT html_hash FROM page_hashes WHERE url = ?", (url,)
+        )
+        return result[0][0] if result else None
+    
+    def record_page(self, url, page_type, html_hash, etag=None, last_modified=None):
+        """
+        Records the hash and validators of a page whose content has been parsed and stored.
+        
+        Validators are only saved here, once the page's data is in the database,
+        so a failed write never leaves a validator that would skip the page next time.
+        """
+        query = """
+        INSERT INTO page_hashes (url, page_type, html_hash, etag, last_modified, last_checked, last_changed)
+        VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+        ON CONFLICT(url) DO UPDATE SET
+        page_type = excluded.page_type,
+        html_hash = excluded.html_hash,
+        etag = excluded.etag,
+        last_modified = excluded.last_modified,
+        last_checked = CURRENT_TIMESTAMP,
+        last_changed = CURRENT_TIMESTAMP
+        """
+        self.db_conn.execute_update(query, (url, page_type, html_hash, etag, last_modified))
+    
+    def mark_page_checked(self, url, etag=None, last_modified=None):
+        """
+        Updates the last checked timestamp of a page whose content was unchanged,
+        keeping the stored validators unless the server sent new ones.
+        """
+        self.db_conn.execute_update(
+            """UPDATE page_hashes
+               SET last_checked = CURRENT_TIMESTAMP,
+                   etag = COALESCE(?, etag),
+                   last_modified = COALESCE(?, last_modified)
+               WHERE url = ?""",
+            (etag, last_modified, url)
+        )
@@ -2,6 +2,7 @@
 
 from ..connection import DatabaseConnection
 from datetime import datetime
+from ...utils.timeutils import date_to_ordinal
 
 class SummaryRepository:
     """
@@ -17,9 +18,10 @@ class SummaryRepository:
         """
         query = """
         INSERT INTO datewise_summaries 
-        (centre_id, date, farmer_count, quantity, amount, details_url, data_state, html_hash, last_synced)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        (centre_id, date, date_ordinal, farmer_count, quantity, amount, details_url, data_state, html_hash, last_synced)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
         ON CONFLICT(centre_id, date) DO UPDATE SET
+        date_ordinal = excluded.date_ordinal,
         farmer_count = excluded.farmer_count,
         quantity = excluded.quantity,
         amount = excluded.amount,
@@ -29,9 +31,58 @@ class SummaryRepository:
         last_synced = CURRENT_TIMESTAMP
         """
         self.db_conn.execute_update(query, (
-            centre_id, date, farmer_count, quantity, amount, details_url, data_state, html_hash
+            centre_id, date, date_to_ordinal(date), farmer_count, quantity, amount, details_url, data_state, html_hash
         ))
     
+    def upsert_summaries(self, centre_id, entries, html_hash=None):
+        """
+        Creates or updates all date-wise summaries of a centre page in one transaction.
+        
+        Args:
+            centre_id (int): Centre ID
+            entries (list): Date entries as returned by parse_datewise_summary
+            html_hash (str, optional): Hash of the page the entries were parsed from
+            
+        Returns:
+            int: Number of summaries that are new or whose figures changed
+        """
+        existing = {
+            row[0]: (row[1], row[2], row[3])
+            for row in self.db_conn.execute_query(
+                "SELECT date, farmer_count, quantity, amount FROM datewise_summaries WHERE centre_id = ?",
+                (centre_id,)
+            )
+        }
+        
+        params = []
+        changed = 0
+        for entry in entries:
+            figures = (entry['farmer_count'], entry['quantity'], entry['amount'])
+            if existing.get(entry['date']) != figures:
+                changed += 1
+            params.append((
+                centre_id, entry['date'], date_to_ordinal(entry['date']), *figures,
+                entry.get('details_url'), entry.get('data_state', 'OPEN'), html_hash
+            ))
+        
+        with self.db_conn.transaction() as cursor:
+            cursor.executemany("""
+            INSERT INTO datewise_summaries 
+            (centre_id, date, date_ordinal, farmer_count, quantity, amount, details_url, data_state, html_hash, last_synced)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(centre_id, date) DO UPDATE SET
+            date_ordinal = excluded.date_ordinal,
+            farmer_count = excluded.farmer_count,
+            quantity = excluded.quantity,
+            amount = excluded.amount,
+            details_url = excluded.details_url,
+            data_state = excluded.data_state,
+            html_hash = excluded.html_hash,
+            last_synced = CURRENT_TIMESTAMP
+            """, params)
+        
+        return changed
+    
     def get_summary_by_centre_and_date(self, centre_id, date):
         """
         Retrieves a date-wise summary by centre ID and date.
@@ -64,7 +115,7 @@ class SummaryRepository:
             """SELECT id, centre_id, date, farmer_count, quantity, amount, details_url, data_state, html_hash
                FROM datewise_summaries 
                WHERE centre_id = ? 
-               ORDER BY date""",
+               ORDER BY date_ordinal""",
             (centre_id,)
         )
         return [
@@ -90,7 +141,7 @@ class SummaryRepository:
             """SELECT id, centre_id, date, farmer_count, quantity, amount, details_url, data_state, html_hash
                FROM datewise_summaries 
                WHERE centre_id = ? 
-               ORDER BY date DESC 
+               ORDER BY date_ordinal DESC 
                LIMIT 1""",
             (centre_id,)
         )
@@ -115,9 +166,9 @@ class SummaryRepository:
         results = self.db_conn.execute_query(
             """SELECT id, centre_id, date, farmer_count, quantity, amount, details_url, data_state, html_hash
                FROM datewise_summaries 
-               WHERE centre_id = ? AND date BETWEEN ? AND ?
-               ORDER BY date""",
-            (centre_id, from_date, to_date)
+               WHERE centre_id = ? AND date_ordinal BETWEEN ? AND ?
+               ORDER BY date_ordinal""",
+            (centre_id, date_to_ordinal(from_date), date_to_ordinal(to_date))
         )
         return [
             {
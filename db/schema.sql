@@ -1,4 +1,5 @@
--- Full DB schema
+-- Baseline DB schema (version 1)
+-- Later schema changes are versioned migration steps in db/migrations.py
 
 -- Centres table
 CREATE TABLE IF NOT EXISTS centres (
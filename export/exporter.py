@@ -7,6 +7,7 @@ from .pdf_builder import PDFBuilder
 from ..db.repositories.farmer_repo import FarmerRepository
 from ..db.repositories.summary_repo import SummaryRepository
 from ..config.settings import Settings
+from ..utils.timeutils import range_bound_ordinal
 
 class Exporter:
     """
@@ -154,14 +155,14 @@ class Exporter:
             params.append(date)
         
         if from_date:
-            query += " AND ft.date >= ?"
-            params.append(from_date)
+            query += " AND ft.date_ordinal >= ?"
+            params.append(range_bound_ordinal(from_date, 'from_date'))
         
         if to_date:
-            query += " AND ft.date <= ?"
-            params.append(to_date)
+            query += " AND ft.date_ordinal <= ?"
+            params.append(range_bound_ordinal(to_date, 'to_date'))
         
-        query += " ORDER BY ft.date, ft.farmer_name"
+        query += " ORDER BY ft.date_ordinal, ft.farmer_name"
         
         results = self.db_connection.execute_query(query, params)
         
@@ -198,14 +199,14 @@ class Exporter:
             params.append(centre_id)
         
         if from_date:
-            query += " AND dws.date >= ?"
-            params.append(from_date)
+            query += " AND dws.date_ordinal >= ?"
+            params.append(range_bound_ordinal(from_date, 'from_date'))
         
         if to_date:
-            query += " AND dws.date <= ?"
-            params.append(to_date)
+            query += " AND dws.date_ordinal <= ?"
+            params.append(range_bound_ordinal(to_date, 'to_date'))
         
-        query += " ORDER BY dws.date"
+        query += " ORDER BY dws.date_ordinal"
         
         results = self.db_connection.execute_query(query, params)
         
@@ -0,0 +1,151 @@
+# Asyncio HTTP GET wrapper with a pooled keep-alive client
+
+import asyncio
+import time
+import httpx
+from .session import BROWSER_HEADERS, get_session_pool, is_session_expired
+from .rate_limiter import get_rate_limiter
+from .retry import get_retry_policy, get_circuit_breaker
+from ..config.settings import get_settings
+
+class AsyncHTTPClient:
+    """
+    Asynchronous counterpart of HTTPClient for running many fetches on one
+    thread.
+    
+    All requests share one keep-alive connection pool of at most
+    max_connections connections. Requests take their slot from the same
+    process-wide rate limiter and circuit breaker as HTTPClient, waiting
+    with asyncio.sleep instead of blocking the event loop, and use the
+    cookies of the process-wide upstream session.
+    
+    At most max_connections requests hold or wait for a rate-limit slot at
+    a time, so coroutines never book slots far ahead of the pacing and
+    circuit breaker state they will be sent under.
+    """
+    
+    def __init__(self, max_connections=10):
+        self.rate_limiter = get_rate_limiter()
+        self.circuit_breaker = get_circuit_breaker()
+        self.client = httpx.AsyncClient(
+            headers=BROWSER_HEADERS,
+            timeout=get_settings().request_timeout or 30,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+        self.session_pool = get_session_pool()
+        self._generation = None
+        self._session_lock = asyncio.Lock()
+        self._request_slots = asyncio.Semaphore(max_connections)
+    
+    async def _wait_for_slot(self, url):
+        """
+        Waits for the circuit breaker and the rate limiter without blocking the event loop.
+        """
+        while True:
+            wait, probe = self.circuit_breaker.check_probe(url)
+            while wait:
+                await asyncio.sleep(wait)
+                wait, probe = self.circuit_breaker.check_probe(url)
+            wait = self.rate_limiter.reserve(url)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            # The circuit may have opened while this request waited for its slot;
+            # the half-open probe goes ahead, as the circuit waits for its result
+            if probe or not self.circuit_breaker.check(url):
+                return
+    
+    async def _load_session(self, expired_generation=None):
+        """
+        Copies the cookies of the shared upstream session, first refreshing it
+        if it expired. The shared session's warm-up and refresh block, so
+        they run in a worker thread.
+        """
+        async with self._session_lock:
+            if expired_generation is not None and expired_generation == self._generation:
+                await asyncio.to_thread(self.session_pool.refresh, expired_generation)
+            elif self._generation is not None:
+                # Already loaded, or refreshed by another coroutine
+                return
+            session, self._generation = await asyncio.to_thread(self.session_pool.get_session)
+            self.client.cookies = httpx.Cookies(session.cookies)
+    
+    async def get(self, url, etag=None, last_modified=None, page_type=None):
+        """
+        Performs a (conditional) GET request with rate limiting and retries,
+        like HTTPClient.get.
+        
+        Returns:
+            httpx.Response: Response; status 304 means the page is unchanged
+        """
+        if self._generation is None:
+            await self._load_session()
+        
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        
+        policy = get_retry_policy(page_type)
+        attempt = 0
+        refreshed = False
+        while True:
+            attempt += 1
+            start_time = None
+            retryable = False
+            try:
+                async with self._request_slots:
+                    await self._wait_for_slot(url)
+                    start_time = time.time()
+                    generation = self._generation
+                    response = await self.client.get(url, headers=headers)
+                if response.status_code >= 400:
+                    raise httpx.HTTPStatusError(
+                        f"{response.status_code} error for url: {url}",
+                        request=response.request,
+                        response=response
+                    )
+                self.circuit_breaker.record_success(url)
+                if refreshed or not is_session_expired(url, response):
+                    return response
+            except httpx.HTTPError as e:
+                retryable = is_retryable_async_error(e)
+                if retryable:
+                    self.circuit_breaker.record_failure(url)
+                else:
+                    # The host answered; the request itself is at fault
+                    self.circuit_breaker.record_success(url)
+                if not retryable or attempt > policy.max_retries:
+                    print(f"HTTP request failed: {e}")
+                    raise
+                delay = policy.get_delay(attempt)
+                print(f"HTTP request failed (attempt {attempt}), retrying in {delay:.1f}s: {e}")
+            finally:
+                # Latency and transient errors drive the adaptive pacing
+                if start_time is not None:
+                    self.rate_limiter.record_fetch(url, time.time() - start_time, error=retryable)
+            if not retryable:
+                # Redirected by an expired upstream session: re-establish it once and retry
+                await self._load_session(generation)
+                refreshed = True
+                continue
+            await asyncio.sleep(delay)
+    
+    async def close(self):
+        """
+        Closes the connection pool.
+        """
+        await self.client.aclose()
+
+def is_retryable_async_error(error):
+    """
+    Checks whether an httpx failure is transient: a timeout, a transport
+    error, or a 5xx / 429 response.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return isinstance(error, httpx.TransportError)
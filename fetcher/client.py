@@ -1,42 +1,99 @@
-# HTTP GET wrapper with rate limiting
+# HTTP GET wrapper with rate limiting and retries
 
 import time
 import requests
-from .session import create_session
-from ..config.settings import Settings
+from .session import get_session_pool, is_session_expired
+from .rate_limiter import get_rate_limiter
+from .retry import get_retry_policy, get_circuit_breaker, is_retryable_error
+from ..config.settings import get_settings
 
 class HTTPClient:
     """
-    HTTP client with rate limiting for fetching web pages.
+    HTTP client with rate limiting, retries and conditional requests for fetching web pages.
     """
     
     def __init__(self):
-        self.session = create_session()
-        self.settings = Settings()
-        self.last_request_time = 0
+        # Cookies and keep-alive connections are shared by every client in the process
+        self.session_pool = get_session_pool()
+        self.rate_limiter = get_rate_limiter()
+        self.circuit_breaker = get_circuit_breaker()
+        self.timeout = get_settings().request_timeout or 30
     
-    def get(self, url):
+    def get(self, url, etag=None, last_modified=None, page_type=None):
         """
-        Performs a GET request with rate limiting.
-        """
-        # Rate limiting
-        elapsed = time.time() - self.last_request_time
-        request_delay = self.settings.request_delay or 1.0  # Default to 1.0 if None
+        Performs a (conditional) GET request with rate limiting.
+        
+        The limit is shared per host by every client in the process (and by
+        other processes when rate_limit_lock_dir is set), and adapts to the
+        host's latency and errors without going below request_delay. Timeouts, connection
+        errors and 5xx / 429 responses are retried with exponential backoff
+        and jitter according to the page type's retry policy, and count
+        towards the host's circuit breaker.
         
-        if elapsed < request_delay:
-            time.sleep(request_delay - elapsed)
+        Args:
+            url (str): URL to fetch
+            etag (str, optional): ETag from a previous response, sent as If-None-Match
+            last_modified (str, optional): Last-Modified from a previous response,
+                                           sent as If-Modified-Since
+            page_type (str, optional): Page type whose retry policy applies
+            
+        Returns:
+            requests.Response: Response; status 304 means the page is unchanged
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
         
-        try:
-            response = self.session.get(url)
-            self.last_request_time = time.time()
-            response.raise_for_status()
-            return response
-        except requests.RequestException as e:
-            print(f"HTTP request failed: {e}")
-            raise
+        policy = get_retry_policy(page_type)
+        attempt = 0
+        refreshed = False
+        while True:
+            attempt += 1
+            # Wait while the upstream is failing, then for the rate limit
+            self.circuit_breaker.before_request(url)
+            self.rate_limiter.acquire(url)
+            
+            start_time = time.time()
+            retryable = False
+            try:
+                session, generation = self.session_pool.get_session()
+                response = session.get(url, headers=headers or None, timeout=self.timeout)
+                response.raise_for_status()
+                self.circuit_breaker.record_success(url)
+                if refreshed or not is_session_expired(url, response):
+                    return response
+            except requests.RequestException as e:
+                retryable = is_retryable_error(e)
+                if retryable:
+                    self.circuit_breaker.record_failure(url)
+                else:
+                    # The host answered; the request itself is at fault
+                    self.circuit_breaker.record_success(url)
+                if not retryable or attempt > policy.max_retries:
+                    print(f"HTTP request failed: {e}")
+                    raise
+                delay = policy.get_delay(attempt)
+                print(f"HTTP request failed (attempt {attempt}), retrying in {delay:.1f}s: {e}")
+            finally:
+                # Latency and transient errors drive the adaptive pacing
+                self.rate_limiter.record_fetch(url, time.time() - start_time, error=retryable)
+            if not retryable:
+                # Redirected by an expired upstream session: re-establish it once and retry
+                self.session_pool.refresh(generation)
+                refreshed = True
+                continue
+            time.sleep(delay)
     
-    def close(self):
+    @property
+    def session(self):
         """
-        Closes the session.
+        The shared requests.Session.
+        """
+        return self.session_pool.get_session()[0]
+    
+    def close(self):
         """
-        self.session.close()
\ No newline at end of file
+        Releases the client. The shared session stays open for other clients.
+        """
\ No newline at end of file
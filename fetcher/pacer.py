@@ -0,0 +1,112 @@
+# Adaptive (AIMD) request pacing
+
+import threading
+import time
+from ..config.settings import get_settings
+
+# Used for keys missing from the adaptive_pacing setting
+DEFAULT_PACING = {
+    'enabled': True,
+    'max_delay': 30.0,
+    'increase_step': 0.05,
+    'decrease_factor': 0.5,
+    'slow_latency_factor': 3.0,
+    'latency_smoothing': 0.1,
+    'min_samples': 5
+}
+
+class AdaptivePacer:
+    """
+    Additive-increase / multiplicative-decrease pacing per host.
+    
+    Every healthy response raises a host's request rate by increase_step
+    requests per second, up to the rate allowed by request_delay, which is a
+    hard floor on the delay between requests. A transient error, or a
+    response slower than slow_latency_factor times the host's typical
+    latency, multiplies the rate by decrease_factor, down to one request
+    per max_delay seconds. Failures of requests that were already in flight
+    when the rate dropped do not drop it again.
+    """
+    
+    def __init__(self, min_delay, config=None):
+        config = dict(DEFAULT_PACING, **(config if config is not None else get_settings().adaptive_pacing or {}))
+        self.enabled = config['enabled']
+        self.min_delay = min_delay
+        self.max_delay = max(config['max_delay'], min_delay)
+        self.increase_step = config['increase_step']
+        self.decrease_factor = config['decrease_factor']
+        self.slow_latency_factor = config['slow_latency_factor']
+        self.latency_smoothing = config['latency_smoothing']
+        self.min_samples = config['min_samples']
+        self._hosts = {}
+        self._lock = threading.Lock()
+    
+    def _get_state(self, host):
+        return self._hosts.setdefault(host, {
+            'rate': 1.0 / self.min_delay,
+            'latency': None,
+            'samples': 0,
+            'errors': 0,
+            'slow_responses': 0,
+            'decreases': 0,
+            'last_decrease': 0.0
+        })
+    
+    def record(self, host, latency, error=False):
+        """
+        Adjusts a host's rate after a request completes.
+        
+        Args:
+            host (str): Host name
+            latency (float): Seconds the request took
+            error (bool): Whether the request failed transiently
+        
+        Returns:
+            float: New request rate for the host, in requests per second
+        """
+        with self._lock:
+            state = self._get_state(host)
+            if not self.enabled:
+                return state['rate']
+            
+            slow = (
+                not error
+                and state['samples'] >= self.min_samples
+                and latency > self.slow_latency_factor * state['latency']
+            )
+            if not error:
+                # Slow responses still feed the baseline, so it follows a lasting change
+                if state['latency'] is None:
+                    state['latency'] = latency
+                else:
+                    state['latency'] += self.latency_smoothing * (latency - state['latency'])
+                state['samples'] += 1
+            
+            if error or slow:
+                state['errors' if error else 'slow_responses'] += 1
+                now = time.time()
+                # At most one decrease per delay interval
+                if now - state['last_decrease'] >= 1.0 / state['rate']:
+                    state['last_decrease'] = now
+                    state['decreases'] += 1
+                    state['rate'] = max(1.0 / self.max_delay, state['rate'] * self.decrease_factor)
+            else:
+                state['rate'] = min(1.0 / self.min_delay, state['rate'] + self.increase_step)
+            return state['rate']
+    
+    def get_state(self):
+        """
+        Returns the pacing state of every host.
+        """
+        with self._lock:
+            return {
+                host: {
+                    'delay_seconds': 1.0 / state['rate'],
+                    'requests_per_second': state['rate'],
+                    'typical_latency_seconds': state['latency'],
+                    'errors': state['errors'],
+                    'slow_responses': state['slow_responses'],
+                    'decreases': state['decreases']
+                }
+                for host, state in self._hosts.items()
+            }
@@ -0,0 +1,205 @@
+# Process-wide per-host token bucket rate limiter
+
+import os
+import threading
+import time
+from urllib.parse import urlparse
+from .pacer import AdaptivePacer
+from ..config.settings import get_settings
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; fall back to in-process limiting
+    fcntl = None
+
+class TokenBucket:
+    """
+    Token bucket for a single host, implemented as a scheduled "theoretical
+    arrival time" so its whole state is one timestamp. When a lock file is
+    given, that timestamp is shared by every process using the same file.
+    
+    Up to burst requests may go out back to back, faster than the rate; with
+    a burst of 1 consecutive requests are always at least 1 / rate apart.
+    """
+    
+    def __init__(self, rate, burst=1, lock_file=None):
+        self.burst = max(1, burst)
+        self.set_rate(rate)
+        self.lock_file = lock_file if fcntl else None
+        self._tat = 0.0
+        self._lock = threading.Lock()
+        
+        if self.lock_file:
+            os.makedirs(os.path.dirname(self.lock_file) or '.', exist_ok=True)
+    
+    def set_rate(self, rate):
+        """
+        Changes the rate at which tokens are added.
+        """
+        self.interval = 1.0 / rate
+        self.tolerance = (self.burst - 1) * self.interval
+    
+    def _reserve(self, tat):
+        """
+        Reserves the next slot given the current arrival time.
+        
+        Returns:
+            tuple: (seconds to wait, new arrival time)
+        """
+        now = time.time()
+        wait = max(0.0, tat - self.tolerance - now)
+        return wait, max(tat, now) + self.interval
+    
+    def _reserve_shared(self):
+        """
+        Reserves the next slot from the arrival time stored in the lock file.
+        """
+        with open(self.lock_file, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    tat = float(f.read().strip() or 0.0)
+                except ValueError:
+                    tat = 0.0
+                wait, tat = self._reserve(tat)
+                f.seek(0)
+                f.truncate()
+                f.write(repr(tat))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait
+    
+    def reserve(self):
+        """
+        Reserves the next token without waiting for it.
+        
+        Returns:
+            float: Seconds until the reserved token is available
+        """
+        with self._lock:
+            if self.lock_file:
+                return self._reserve_shared()
+            wait, self._tat = self._reserve(self._tat)
+            return wait
+    
+    def acquire(self):
+        """
+        Blocks until a token is available.
+        
+        Returns:
+            float: Seconds spent waiting
+        """
+        # Sleep outside the lock; the slot is already reserved
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+class RateLimiter:
+    """
+    Rate limiter shared by every fetch path, with one token bucket per host.
+    
+    Each bucket's rate follows the host's adaptive pacer, which never goes
+    above the rate set by request_delay. A burst above 1 lets requests go out
+    back to back, closer together than request_delay, so it only applies
+    with adaptive pacing disabled.
+    """
+    
+    def __init__(self, rate=None, burst=None, lock_dir=None):
+        settings = get_settings()
+        request_delay = settings.request_delay or 1.0
+        self.rate = rate or 1.0 / request_delay
+        self.burst = burst or settings.rate_limit_burst or 1
+        self.lock_dir = lock_dir if lock_dir is not None else settings.rate_limit_lock_dir
+        self.pacer = AdaptivePacer(1.0 / self.rate)
+        if self.pacer.enabled and self.burst > 1:
+            print(f"Warning: rate_limit_burst {self.burst} ignored while adaptive pacing is enabled")
+            self.burst = 1
+        self._buckets = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+    
+    def _get_bucket(self, host):
+        """
+        Gets or creates the token bucket for a host.
+        """
+        with self._lock:
+            if host not in self._buckets:
+                lock_file = os.path.join(self.lock_dir, f"{host}.lock") if self.lock_dir else None
+                self._buckets[host] = TokenBucket(self.rate, self.burst, lock_file)
+                self._metrics[host] = {
+                    'requests': 0,
+                    'wait_seconds': 0.0,
+                    'max_wait_seconds': 0.0,
+                    'fetch_seconds': 0.0
+                }
+            return self._buckets[host]
+    
+    def reserve(self, url):
+        """
+        Reserves a request slot for the URL's host without waiting for it,
+        for callers that wait without blocking (e.g. with asyncio.sleep).
+        
+        Returns:
+            float: Seconds to wait before sending the request
+        """
+        host = urlparse(url).hostname or ''
+        wait = self._get_bucket(host).reserve()
+        with self._lock:
+            metrics = self._metrics[host]
+            metrics['requests'] += 1
+            metrics['wait_seconds'] += wait
+            metrics['max_wait_seconds'] = max(metrics['max_wait_seconds'], wait)
+        return wait
+    
+    def acquire(self, url):
+        """
+        Blocks until a request to the URL's host is allowed.
+        
+        Returns:
+            float: Seconds spent waiting
+        """
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    def record_fetch(self, url, seconds, error=False):
+        """
+        Records the time spent on a request once it completes, and adapts
+        the host's pacing to its latency and errors.
+        
+        Args:
+            url (str): Requested URL
+            seconds (float): Time the request took
+            error (bool): Whether the request failed transiently
+        """
+        host = urlparse(url).hostname or ''
+        rate = self.pacer.record(host, seconds, error)
+        bucket = self._get_bucket(host)
+        with self._lock:
+            self._metrics[host]['fetch_seconds'] += seconds
+            bucket.set_rate(rate)
+    
+    def get_metrics(self):
+        """
+        Returns per-host counters of requests, time spent waiting and time spent fetching.
+        """
+        with self._lock:
+            return {host: dict(metrics) for host, metrics in self._metrics.items()}
+
+# Global rate limiter instance
+_rate_limiter_instance = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """
+    Gets the process-wide rate limiter.
+    """
+    global _rate_limiter_instance
+    with _rate_limiter_lock:
+        if _rate_limiter_instance is None:
+            _rate_limiter_instance = RateLimiter()
+        return _rate_limiter_instance
@@ -0,0 +1,196 @@
+# Retry policies and per-host circuit breaker
+
+import random
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from ..config.settings import get_settings
+
+# Used for page types without their own entry in retry_policies
+DEFAULT_RETRY_POLICY = {
+    'max_retries': 3,
+    'base_delay': 1.0,
+    'max_delay': 30.0
+}
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+    """
+    
+    def __init__(self, max_retries=3, base_delay=1.0, max_delay=30.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+    
+    def get_delay(self, attempt):
+        """
+        Gets the delay before retrying after a failed attempt.
+        
+        Args:
+            attempt (int): Number of the attempt that failed, starting at 1
+        
+        Returns:
+            float: Random delay between 0 and the capped exponential backoff
+        """
+        backoff = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, backoff)
+
+def get_retry_policy(page_type=None):
+    """
+    Gets the retry policy for a page type from the retry_policies setting.
+    
+    Args:
+        page_type (str, optional): 'centre_list', 'datewise_summary' or 'farmer_details'
+    
+    Returns:
+        RetryPolicy: Policy for the page type
+    """
+    settings = get_settings()
+    policy = dict(DEFAULT_RETRY_POLICY)
+    if settings.max_retries is not None:
+        policy['max_retries'] = settings.max_retries
+    policy.update((settings.retry_policies or {}).get(page_type) or {})
+    return RetryPolicy(**policy)
+
+def is_retryable_error(error):
+    """
+    Checks whether a request failure is transient: a timeout, a connection
+    error, or a 5xx / 429 response.
+    """
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return True
+    response = getattr(error, 'response', None)
+    if response is not None:
+        return response.status_code >= 500 or response.status_code == 429
+    return False
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker shared by every fetcher in the process.
+    
+    After failure_threshold consecutive transient failures the circuit opens
+    and every request to the host waits for cooldown_seconds. A single probe
+    request is then let through: success closes the circuit, failure opens
+    it again.
+    """
+    
+    def __init__(self, failure_threshold=None, cooldown_seconds=None):
+        config = get_settings().circuit_breaker or {}
+        self.failure_threshold = failure_threshold or config.get('failure_threshold', 5)
+        self.cooldown_seconds = cooldown_seconds or config.get('cooldown_seconds', 60)
+        self._hosts = {}
+        self._lock = threading.Lock()
+    
+    def _get_state(self, host):
+        return self._hosts.setdefault(host, {
+            'failures': 0,
+            'open_until': None,
+            'probing': False,
+            'times_opened': 0
+        })
+    
+    def check(self, url):
+        """
+        Checks whether a request to the URL's host may be sent now, without waiting.
+        
+        Returns:
+            float: 0 if the request may be sent, otherwise seconds to wait
+                   before checking again
+        """
+        return self.check_probe(url)[0]
+    
+    def check_probe(self, url):
+        """
+        Like check, but also tells whether the request was let through as the
+        half-open probe. The probe must then be sent without checking again:
+        until it completes, every check of the host waits.
+        
+        Returns:
+            tuple: (0 or seconds to wait as check returns, whether the request is the probe)
+        """
+        host = urlparse(url).hostname or ''
+        with self._lock:
+            state = self._get_state(host)
+            if state['open_until'] is None:
+                return 0.0, False
+            remaining = state['open_until'] - time.time()
+            if remaining <= 0 and not state['probing']:
+                # Half-open: let this request through as the probe
+                state['probing'] = True
+                return 0.0, True
+        return min(max(remaining, 0.1), 1.0), False
+    
+    def before_request(self, url):
+        """
+        Blocks while the host's circuit is open.
+        
+        Returns:
+            float: Seconds spent paused
+        """
+        paused = 0.0
+        wait = self.check(url)
+        while wait:
+            time.sleep(wait)
+            paused += wait
+            wait = self.check(url)
+        return paused
+    
+    def record_success(self, url):
+        """
+        Closes the host's circuit after a successful request.
+        """
+        host = urlparse(url).hostname or ''
+        with self._lock:
+            state = self._get_state(host)
+            if state['open_until'] is not None:
+                print(f"Circuit closed for {host}")
+            state['failures'] = 0
+            state['open_until'] = None
+            state['probing'] = False
+    
+    def record_failure(self, url):
+        """
+        Counts a transient failure, opening the host's circuit at the threshold
+        or when the half-open probe fails.
+        """
+        host = urlparse(url).hostname or ''
+        with self._lock:
+            state = self._get_state(host)
+            state['failures'] += 1
+            if state['probing'] or (state['open_until'] is None and state['failures'] >= self.failure_threshold):
+                state['open_until'] = time.time() + self.cooldown_seconds
+                state['probing'] = False
+                state['times_opened'] += 1
+                print(f"Circuit opened for {host} after {state['failures']} failures; pausing requests for {self.cooldown_seconds}s")
+    
+    def get_state(self):
+        """
+        Returns the circuit state of every host.
+        """
+        now = time.time()
+        with self._lock:
+            return {
+                host: {
+                    'state': 'closed' if state['open_until'] is None
+                    else 'open' if state['open_until'] > now else 'half_open',
+                    'consecutive_failures': state['failures'],
+                    'times_opened': state['times_opened']
+                }
+                for host, state in self._hosts.items()
+            }
+
+# Global circuit breaker instance
+_circuit_breaker_instance = None
+_circuit_breaker_lock = threading.Lock()
+
+def get_circuit_breaker():
+    """
+    Gets the process-wide circuit breaker.
+    """
+    global _circuit_breaker_instance
+    with _circuit_breaker_lock:
+        if _circuit_breaker_instance is None:
+            _circuit_breaker_instance = CircuitBreaker()
+        return _circuit_breaker_instance
@@ -1,28 +1,146 @@
 # requests.Session creation & headers
 
+import threading
+from urllib.parse import urlparse
 import requests
-from ..core.constants import BASE_URL
+from requests.adapters import HTTPAdapter
+from .rate_limiter import get_rate_limiter
+from ..config.settings import get_settings
+from .urls import get_base_url
 
-def create_session():
+# Headers to mimic a real browser
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+def create_session(pool_size=None):
     """
     Creates a requests.Session with appropriate headers for mimicking a real browser.
+    
+    Args:
+        pool_size (int, optional): Keep-alive connections kept per host
     """
     session = requests.Session()
     
     # Set headers to mimic a real browser
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    })
-    
-    # Perform initial request to establish session
+    session.headers.update(BROWSER_HEADERS)
+    
+    if pool_size:
+        adapter = HTTPAdapter(pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+    
+    warm_up_session(session)
+    return session
+
+def warm_up_session(session):
+    """
+    Performs the initial request that establishes the session cookies.
+    """
+    base_url = get_base_url()
     try:
-        session.get(BASE_URL)
+        get_rate_limiter().acquire(base_url)
+        session.get(base_url)
     except Exception as e:
         print(f"Warning: Failed to establish initial session: {e}")
+
+def is_session_expired(url, response):
+    """
+    Checks whether a response shows that the upstream session has expired.
     
-    return session
\ No newline at end of file
+    The portal answers a request from an expired ASP.NET session by
+    redirecting it to another page instead of serving the requested one.
+    """
+    return bool(response.history) and urlparse(str(response.url)).path != urlparse(url).path
+
+class SessionPool:
+    """
+    Process-wide browser session shared by every HTTP client.
+    
+    The session is created and warmed up once, on first use. All clients
+    then share its cookies and its keep-alive connection pool (pool_size
+    connections per host, so concurrent fetchers reuse connections instead
+    of opening new ones). The session is only warmed up again when a
+    response shows that the upstream session expired.
+    """
+    
+    def __init__(self, pool_size=None):
+        self.pool_size = pool_size or get_settings().http_pool_size or 16
+        self._session = None
+        self._generation = 0
+        self._refreshes = 0
+        self._lock = threading.Lock()
+    
+    def get_session(self):
+        """
+        Gets the shared session, creating and warming it up on first use.
+        
+        Returns:
+            tuple: (requests.Session, generation), the generation to pass to
+                   refresh() if a response shows the session expired
+        """
+        with self._lock:
+            if self._session is None:
+                self._session = create_session(self.pool_size)
+                self._generation += 1
+            return self._session, self._generation
+    
+    def refresh(self, generation):
+        """
+        Re-establishes the upstream session after it expired.
+        
+        Clients that saw the same expired session all call this; only the
+        first one refreshes it, the others wait for it and reuse the result.
+        Connections in the keep-alive pool are kept.
+        
+        Args:
+            generation (int): Generation returned by get_session() for the
+                              request that saw the expired session
+        """
+        with self._lock:
+            if self._session is None or generation != self._generation:
+                return
+            print("Upstream session expired; establishing a new one")
+            self._session.cookies.clear()
+            warm_up_session(self._session)
+            self._generation += 1
+            self._refreshes += 1
+    
+    def get_state(self):
+        """
+        Returns whether the session is established and how often it was refreshed.
+        """
+        with self._lock:
+            return {
+                'established': self._session is not None,
+                'refreshes': self._refreshes,
+                'pool_size': self.pool_size
+            }
+    
+    def close(self):
+        """
+        Closes the shared session; the next get_session() creates a new one.
+        """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+# Global session pool instance
+_session_pool_instance = None
+_session_pool_lock = threading.Lock()
+
+def get_session_pool():
+    """
+    Gets the process-wide session pool.
+    """
+    global _session_pool_instance
+    with _session_pool_lock:
+        if _session_pool_instance is None:
+            _session_pool_instance = SessionPool()
+        return _session_pool_instance
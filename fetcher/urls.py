@@ -1,6 +1,7 @@
 # Entry-point URLs only (no constructed URLs)
 
 from ..core.constants import BASE_URL
+from ..config.settings import get_settings
 
 # Base URL for the procurement system
 PROCUREMENT_BASE_URL = BASE_URL
@@ -10,4 +11,11 @@ DISCOVERED_URLS = {
     'centre_list': PROCUREMENT_BASE_URL,
     'centre_datewise_template': None,  # Will be discovered during runtime
     'farmer_details_template': None    # Will be discovered during runtime
-}
\ No newline at end of file
+}
+
+def get_base_url():
+    """
+    Gets the centre list URL every sync starts from: the base_url setting
+    (e.g. a local mock site), or the government website.
+    """
+    return get_settings().base_url or BASE_URL
\ No newline at end of file
@@ -14,7 +14,7 @@ def sync_all_centres():
     sync_engine = SyncEngine(db)
     try:
         count = sync_engine.sync_all_centres()
-        return {"message": f"Synced {count} centres", "centres_synced": count}
+        return {"message": f"Synced {count} centres", "centres_synced": count, "report": sync_engine.get_report()}
     except Exception as e:
         return {"error": f"Synchronization failed: {str(e)}"}
     finally:
@@ -35,7 +35,7 @@ def sync_centre(centre_name: str):
     sync_engine = SyncEngine(db)
     try:
         count = sync_engine.sync_centre_datewise_data(centre_name)
-        return {"message": f"Synced {count} date-wise entries for centre {centre_name}", "entries_synced": count}
+        return {"message": f"Synced {count} date-wise entries for centre {centre_name}", "entries_synced": count, "report": sync_engine.get_report()}
     except Exception as e:
         return {"error": f"Synchronization failed: {str(e)}"}
     finally:
@@ -57,7 +57,7 @@ def sync_centre_date(centre_name: str, date: str):
     sync_engine = SyncEngine(db)
     try:
         count = sync_engine.sync_farmer_details(centre_name, date)
-        return {"message": f"Synced {count} farmer transactions for centre {centre_name} on date {date}", "transactions_synced": count}
+        return {"message": f"Synced {count} farmer transactions for centre {centre_name} on date {date}", "transactions_synced": count, "report": sync_engine.get_report()}
     except Exception as e:
         return {"error": f"Synchronization failed: {str(e)}"}
     finally:
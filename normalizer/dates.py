@@ -1,8 +1,13 @@
 # Date & time normalization
 
 from datetime import datetime
+from functools import lru_cache
 from ..core.constants import DATE_FORMAT
 
+# Distinct dates are few (a procurement season is a few hundred days), so
+# every one is parsed with strptime once and looked up after that
+DATE_CACHE_SIZE = 4096
+
 def normalize_date(date_str):
     """
     Normalizes a date string to the standard format.
@@ -43,4 +48,44 @@ def validate_date_format(date_str):
         datetime.strptime(date_str, DATE_FORMAT)
         return True
     except ValueError:
-        return False
\ No newline at end of file
+        return False
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_report_date(date_str):
+    """
+    Parses a DD/MM/YYYY date as the report pages print it.
+    
+    Returns:
+        tuple: (date in DATE_FORMAT, day ordinal), or None if invalid
+    """
+    try:
+        date_obj = datetime.strptime(date_str, DATE_FORMAT)
+    except ValueError:
+        return None
+    return date_obj.strftime(DATE_FORMAT), date_obj.toordinal()
+
+def normalize_date_column(values):
+    """
+    Normalizes a column of DD/MM/YYYY date cells.
+    
+    Args:
+        values (list): Cell texts of the column
+        
+    Returns:
+        list: Date in DATE_FORMAT of every cell, None for invalid dates
+    """
+    parsed = map(_parse_report_date, values)
+    return [day[0] if day else None for day in parsed]
+
+def date_ordinal_column(values):
+    """
+    Converts a column of DD/MM/YYYY date cells to day ordinals.
+    
+    Args:
+        values (list): Cell texts of the column
+        
+    Returns:
+        list: Day ordinal of every cell, None for invalid dates
+    """
+    parsed = map(_parse_report_date, values)
+    return [day[1] if day else None for day in parsed]
\ No newline at end of file
@@ -1,5 +1,79 @@
 # Quantity & amount normalization
 
+def _deleted_bytes(kept):
+    """
+    Gets the ASCII characters other than digits and kept, as bytes to delete.
+    """
+    return bytes(code for code in range(128) if not (chr(code).isdigit() or chr(code) in kept))
+
+# bytes.translate() deletes these from an ASCII cell in C, instead of the cell
+# being tested character by character in Python
+_AMOUNT_DELETE = _deleted_bytes('.')
+_NUMBER_DELETE = _deleted_bytes('.-')
+_INTEGER_DELETE = _deleted_bytes('')
+
+# Whole columns are joined into one string with this separator and cleaned in
+# one pass; the UTF-8 bytes of non-ASCII characters are deleted as well
+_CELL_SEPARATOR = '\x1f'
+_ASCII_BYTES = bytes(range(128))
+
+def _keep_numeric(value, deleted, kept):
+    """
+    Keeps the digits and kept characters of a string, as
+    ''.join(c for c in value if c.isdigit() or c in kept) does.
+    """
+    if value.isascii():
+        return value.encode('ascii').translate(None, deleted).decode('ascii')
+    # Non-ASCII digits (Devanagari, say) follow str.isdigit() exactly
+    return ''.join(c for c in value if c.isdigit() or c in kept)
+
+def _has_non_ascii_digits(encoded):
+    """
+    Checks UTF-8 text for digits outside ASCII, which str.isdigit() keeps.
+    """
+    non_ascii = encoded.translate(None, _ASCII_BYTES)
+    return bool(non_ascii) and any(c.isdigit() for c in set(non_ascii.decode('utf-8')))
+
+def _clean_column(values, deleted, kept):
+    """
+    Keeps the digits and kept characters of every cell of a column, in one
+    translate() over the whole column.
+    
+    Returns:
+        list: Cleaned cells, as bytes (or str for cells cleaned one by one)
+    """
+    text = _CELL_SEPARATOR.join(values)
+    if text.count(_CELL_SEPARATOR) != len(values) - 1:
+        # A cell contains the separator
+        return [_keep_numeric(value, deleted, kept) for value in values]
+    encoded = text.encode('utf-8')
+    column_deleted = deleted.replace(_CELL_SEPARATOR.encode(), b'') + bytes(range(128, 256))
+    cells = encoded.translate(None, column_deleted).split(_CELL_SEPARATOR.encode())
+    if _has_non_ascii_digits(encoded):
+        # Digits of other scripts went with the other non-ASCII bytes; clean those cells one by one
+        cells = [
+            cell if value.isascii() else _keep_numeric(value, deleted, kept)
+            for cell, value in zip(cells, values)
+        ]
+    return cells
+
+def _convert_column(convert, cells, default):
+    """
+    Converts every cell, with default for the cells convert rejects.
+    
+    map() runs the conversion in C; a rejected cell stops it, and the
+    conversion resumes with the next cell. list.extend() keeps the cells
+    converted before the failure.
+    """
+    result = []
+    remaining = iter(cells)
+    while True:
+        try:
+            result.extend(map(convert, remaining))
+            return result
+        except ValueError:
+            result.append(default)
+
 def normalize_number(number_str):
     """
     Normalizes a number string to a float value.
@@ -15,7 +89,7 @@ def normalize_number(number_str):
     
     try:
         # Remove currency symbols, commas, and other non-numeric characters
-        normalized = ''.join(c for c in number_str if c.isdigit() or c in '.-')
+        normalized = _keep_numeric(number_str, _NUMBER_DELETE, '.-')
         
         # Handle edge cases
         if not normalized:
@@ -42,7 +116,7 @@ def normalize_integer(int_str):
     
     try:
         # Remove any non-numeric characters
-        normalized = ''.join(c for c in int_str if c.isdigit())
+        normalized = _keep_numeric(int_str, _INTEGER_DELETE, '')
         
         # Handle edge cases
         if not normalized:
@@ -52,4 +126,57 @@ def normalize_integer(int_str):
         return int(normalized)
     except Exception as e:
         print(f"Warning: Integer normalization failed for '{int_str}': {e}")
-        return 0
\ No newline at end of file
+        return 0
+
+def normalize_amount_column(values):
+    """
+    Normalizes a column of quantity or amount cells to floats.
+    
+    Keeps the digits and decimal point of each cell, dropping currency symbols,
+    commas and signs, as the page parsers always have; a cell that is not a
+    number after that becomes 0.0. The column is cleaned as one string, so the
+    per-cell work left is the float conversion.
+    
+    Args:
+        values (list): Cell texts of the column
+        
+    Returns:
+        list: Float value of every cell
+    """
+    if not values:
+        return []
+    return _convert_column(float, _clean_column(values, _AMOUNT_DELETE, '.'), 0.0)
+
+def normalize_number_column(values):
+    """
+    Normalizes a column of number cells to floats, as normalize_number does each cell.
+    
+    Args:
+        values (list): Number strings with possible currency symbols, commas, etc.
+        
+    Returns:
+        list: Normalized number value of every cell
+    """
+    if not values:
+        return []
+    result = []
+    append = result.append
+    for value, cell in zip(values, _clean_column(values, _NUMBER_DELETE, '.-')):
+        try:
+            append(float(cell) if cell else 0.0)
+        except ValueError:
+            # Malformed cell: normalize_number gives the value and prints its warning
+            append(normalize_number(value))
+    return result
+
+def normalize_count_column(values):
+    """
+    Normalizes a column of count cells to ints; a cell that is not an integer becomes 0.
+    
+    Args:
+        values (list): Cell texts of the column
+        
+    Returns:
+        list: Integer value of every cell
+    """
+    return _convert_column(int, values, 0)
\ No newline at end of file
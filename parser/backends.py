@@ -0,0 +1,203 @@
+# Parser backend selection and parity checks
+
+from bs4 import BeautifulSoup
+from . import centre_parser, datewise_parser, detector, farmer_parser, lxml_parser
+from ..config.settings import get_settings
+
+# BeautifulSoup is the reference implementation; lxml walks the tree directly
+BACKEND_BS4 = "bs4"
+BACKEND_LXML = "lxml"
+
+class ParserBackend:
+    """
+    One implementation of the three page parsers.
+    
+    Each parser comes in two forms: parse_* functions that parse the HTML
+    themselves, and extract_* functions that take a document built by
+    parse_document, so one parse can serve both type detection and extraction.
+    """
+    
+    def __init__(self, name, parse_centre_list, parse_datewise_summary, parse_farmer_details,
+                 parse_document, detect_document_type, extract_centre_list,
+                 extract_datewise_summary, extract_farmer_details):
+        self.name = name
+        self.parse_centre_list = parse_centre_list
+        self.parse_datewise_summary = parse_datewise_summary
+        self.parse_farmer_details = parse_farmer_details
+        self.parse_document = parse_document
+        self.detect_document_type = detect_document_type
+        self.extract_centre_list = extract_centre_list
+        self.extract_datewise_summary = extract_datewise_summary
+        self.extract_farmer_details = extract_farmer_details
+    
+    def parse_function(self, page_type):
+        """
+        Gets the parser function of a page type.
+        """
+        if page_type == 'centre_list':
+            return self.parse_centre_list
+        elif page_type == 'datewise_summary':
+            return self.parse_datewise_summary
+        elif page_type == 'farmer_details':
+            return self.parse_farmer_details
+        raise ValueError(f"Unknown page type: {page_type}")
+    
+    def parse(self, page_type, html_content, url):
+        """
+        Parses a page of the given type.
+        
+        Args:
+            page_type (str): centre_list, datewise_summary or farmer_details
+            html_content (str): Page content
+            url (str): Page URL, which relative links are resolved against
+        """
+        parse_function = self.parse_function(page_type)
+        if page_type == 'farmer_details':
+            # Farmer pages have no links to resolve
+            return parse_function(html_content)
+        return parse_function(html_content, url)
+    
+    def extract(self, page_type, document, url):
+        """
+        Extracts the data of a page of the given type from a parsed document.
+        """
+        if page_type == 'centre_list':
+            return self.extract_centre_list(document, url)
+        elif page_type == 'datewise_summary':
+            return self.extract_datewise_summary(document, url)
+        elif page_type == 'farmer_details':
+            return self.extract_farmer_details(document)
+        raise ValueError(f"Unknown page type: {page_type}")
+    
+    def parse_page(self, html_content, url):
+        """
+        Parses a page of unknown type: the document is built once, its type
+        detected from the tblSample header and its data extracted from the
+        same tree.
+        
+        Returns:
+            tuple: (page type, parsed data); the data is None for unknown pages
+        """
+        document = self.parse_document(html_content)
+        page_type = self.detect_document_type(document)
+        if page_type == 'unknown':
+            return page_type, None
+        return page_type, self.extract(page_type, document, url)
+    
+    def parse_expected(self, page_type, html_content, url):
+        """
+        Parses a page that should be of the given type, from a single parse.
+        
+        A page detected as another type (the site serving the centre list
+        in place of an expired report, say) raises instead of being stored
+        as empty data. Pages whose type cannot be detected are extracted as
+        the expected type, as the parsers would.
+        
+        Raises:
+            ValueError: If the page is detected as a different page type
+        """
+        document = self.parse_document(html_content)
+        detected = self.detect_document_type(document)
+        if detected not in (page_type, 'unknown'):
+            raise ValueError(f"Expected a {page_type} page at {url}, got a {detected} page")
+        return self.extract(page_type, document, url)
+
+def _parse_soup(html_content):
+    return BeautifulSoup(html_content, 'lxml')
+
+PARSER_BACKENDS = {
+    BACKEND_BS4: ParserBackend(
+        BACKEND_BS4,
+        centre_parser.parse_centre_list,
+        datewise_parser.parse_datewise_summary,
+        farmer_parser.parse_farmer_details,
+        _parse_soup,
+        detector.detect_document_type,
+        centre_parser.extract_centre_list,
+        datewise_parser.extract_datewise_summary,
+        farmer_parser.extract_farmer_details
+    ),
+    BACKEND_LXML: ParserBackend(
+        BACKEND_LXML,
+        lxml_parser.parse_centre_list,
+        lxml_parser.parse_datewise_summary,
+        lxml_parser.parse_farmer_details,
+        lxml_parser.parse_document,
+        lxml_parser.detect_document_type,
+        lxml_parser.extract_centre_list,
+        lxml_parser.extract_datewise_summary,
+        lxml_parser.extract_farmer_details
+    )
+}
+
+def get_parser_backend(name=None):
+    """
+    Gets a parser backend by name, by default the one set by parser_backend.
+    
+    Returns:
+        ParserBackend: The backend
+    """
+    name = name or get_settings().parser_backend or BACKEND_LXML
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {name}")
+    return PARSER_BACKENDS[name]
+
+def parse_page(html_content, url, backend=None):
+    """
+    Parses a page of unknown type with one parse of the document.
+    
+    Args:
+        html_content (str): Page content
+        url (str): Page URL, which relative links are resolved against
+        backend (str, optional): Parser backend name, by default parser_backend
+    
+    Returns:
+        tuple: (page type, parsed data); page type is 'unknown' and the data None
+               when the page has no recognisable tblSample table
+    """
+    return get_parser_backend(backend).parse_page(html_content, url)
+
+def find_difference(expected, actual, path=""):
+    """
+    Finds the first difference between two parse results.
+    
+    Returns:
+        str: Description of the difference, or None if the results are identical
+    """
+    if type(expected) is not type(actual):
+        return f"{path or 'result'}: {expected!r} != {actual!r}"
+    if isinstance(expected, dict):
+        for key in expected.keys() | actual.keys():
+            if key not in expected or key not in actual:
+                return f"{path}.{key}: only in {'expected' if key in expected else 'actual'}"
+            difference = find_difference(expected[key], actual[key], f"{path}.{key}")
+            if difference:
+                return difference
+        return None
+    if isinstance(expected, list):
+        for i, (expected_item, actual_item) in enumerate(zip(expected, actual)):
+            difference = find_difference(expected_item, actual_item, f"{path}[{i}]")
+            if difference:
+                return difference
+        if len(expected) != len(actual):
+            return f"{path or 'result'}: {len(expected)} items != {len(actual)} items"
+        return None
+    if expected != actual:
+        return f"{path or 'result'}: {expected!r} != {actual!r}"
+    return None
+
+def check_parity(page_type, html_content, url, reference=BACKEND_BS4, candidates=None):
+    """
+    Parses a page with the reference backend and every candidate backend
+    and compares the results.
+    
+    Returns:
+        dict: First difference from the reference by candidate backend name,
+              None for backends with identical output
+    """
+    expected = get_parser_backend(reference).parse(page_type, html_content, url)
+    candidates = candidates or [name for name in PARSER_BACKENDS if name != reference]
+    return {
+        name: find_difference(expected, get_parser_backend(name).parse(page_type, html_content, url))
+        for name in candidates
+    }
\ No newline at end of file
@@ -0,0 +1,107 @@
+# Batch parsing across a process pool
+
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from .backends import get_parser_backend
+
+# Pages are sent to the workers in chunks of about this much HTML: a page at
+# least this large goes alone, small pages are grouped so that the per-task
+# pickling and scheduling overhead is paid once for many of them
+CHUNK_SIZE = 512 * 1024
+
+# Most pages in one chunk, so a run of tiny pages still spreads over the workers
+MAX_CHUNK_PAGES = 64
+
+def chunk_pages(pages, chunk_size=CHUNK_SIZE, max_chunk_pages=MAX_CHUNK_PAGES):
+    """
+    Groups pages into chunks of about chunk_size characters of HTML.
+    
+    Yields:
+        list: Pages of one chunk; large pages are yielded on their own as soon as they are read
+    """
+    chunk = []
+    chunk_total = 0
+    for page in pages:
+        size = len(page[2])
+        if size >= chunk_size:
+            yield [page]
+            continue
+        chunk.append(page)
+        chunk_total += size
+        if chunk_total >= chunk_size or len(chunk) >= max_chunk_pages:
+            yield chunk
+            chunk = []
+            chunk_total = 0
+    if chunk:
+        yield chunk
+
+def parse_chunk(chunk, parser_backend=None):
+    """
+    Parses a chunk of pages. Runs in a worker process of the parse pool.
+    
+    Returns:
+        list: (key, page type, parsed data, error message) of every page
+    """
+    backend = get_parser_backend(parser_backend)
+    results = []
+    for key, page_type, html_content, url in chunk:
+        try:
+            if page_type is None:
+                page_type, parsed = backend.parse_page(html_content, url)
+                if parsed is None:
+                    results.append((key, page_type, None, "page type could not be detected"))
+                    continue
+            else:
+                parsed = backend.parse_expected(page_type, html_content, url)
+        except Exception as e:
+            results.append((key, page_type, None, str(e)))
+            continue
+        results.append((key, page_type, parsed, None))
+    return results
+
+def parse_many(pages, workers=None, parser_backend=None, chunk_size=CHUNK_SIZE,
+               max_chunk_pages=MAX_CHUNK_PAGES):
+    """
+    Parses many pages across a process pool, yielding each result as soon as
+    its chunk is parsed, so callers can store results while the rest are parsed.
+    
+    Pages are read lazily, a couple of chunks per worker ahead of the pool, so
+    a generator over a large archive is never held in memory at once.
+    
+    Args:
+        pages (iterable): (key, page_type, html_content, url) tuples; key is
+                          returned with the result, and a page_type of None
+                          detects the type with parse_page
+        workers (int, optional): Worker processes, by default one per core
+        parser_backend (str, optional): Parser backend name, by default parser_backend;
+                                        resolved here, as workers do not see
+                                        settings changed at runtime
+        chunk_size (int): Characters of HTML per chunk
+        max_chunk_pages (int): Most pages per chunk
+    
+    Yields:
+        tuple: (key, page type, parsed data, error message) in completion order;
+               parsed data is None and the message set for pages that failed
+    """
+    workers = workers or os.cpu_count() or 2
+    parser_backend = get_parser_backend(parser_backend).name
+    max_pending = workers * 2
+    
+    context = multiprocessing.get_context('spawn')
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    try:
+        pending = set()
+        for chunk in chunk_pages(pages, chunk_size, max_chunk_pages):
+            pending.add(executor.submit(parse_chunk, chunk, parser_backend))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    finally:
+        # A caller that stops early does not wait for chunks nobody will read
+        executor.shutdown(wait=True, cancel_futures=True)
\ No newline at end of file
@@ -10,7 +10,15 @@ def parse_centre_list(html_content, base_url):
     Returns:
         list: List of dictionaries containing centre information
     """
-    soup = BeautifulSoup(html_content, 'lxml')
+    return extract_centre_list(BeautifulSoup(html_content, 'lxml'), base_url)
+
+def extract_centre_list(soup, base_url):
+    """
+    Extracts centre information from an already parsed centre list page.
+    
+    Returns:
+        list: List of dictionaries containing centre information
+    """
     centres = []
     
     # Find the table containing centre information
@@ -2,8 +2,8 @@
 
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-from ..core.constants import DATE_FORMAT
-from datetime import datetime
+from ..normalizer.dates import normalize_date_column
+from ..normalizer.numbers import normalize_amount_column, normalize_count_column
 
 def parse_datewise_summary(html_content, base_url):
     """
@@ -12,7 +12,15 @@ def parse_datewise_summary(html_content, base_url):
     Returns:
         dict: Dictionary containing centre information and list of date-wise summaries
     """
-    soup = BeautifulSoup(html_content, 'lxml')
+    return extract_datewise_summary(BeautifulSoup(html_content, 'lxml'), base_url)
+
+def extract_datewise_summary(soup, base_url):
+    """
+    Extracts date-wise procurement data from an already parsed date-wise summary page.
+    
+    Returns:
+        dict: Dictionary containing centre information and list of date-wise summaries
+    """
     result = {
         'centre_name': None,
         'dates': []
@@ -55,7 +63,8 @@ def parse_datewise_summary(html_content, base_url):
         # Fallback to original logic
         data_start_index = 10  # Based on our observation
     
-    # Process data rows
+    # Collect the cells of each column; columns: Serial No., Date, Farmer Count, Quantity, Amount
+    date_texts, count_texts, quantity_texts, amount_texts, details_urls = [], [], [], [], []
     for i in range(data_start_index, len(rows)):
         row = rows[i]
         cells = row.find_all('td')
@@ -65,39 +74,11 @@ def parse_datewise_summary(html_content, base_url):
             continue
             
         # Based on the structure, we need at least 5 cells (0-indexed)
-        # Columns: Serial No., Date, Farmer Count, Quantity, Amount
         if len(cells) >= 5:
-            # Extract date (column 1)
-            date_str = cells[1].get_text(strip=True)
-            try:
-                date_obj = datetime.strptime(date_str, '%d/%m/%Y')
-                formatted_date = date_obj.strftime(DATE_FORMAT)
-            except ValueError:
-                print(f"Warning: Invalid date format: {date_str}")
-                continue
-            
-            # Extract official farmer count (column 2)
-            farmer_count_str = cells[2].get_text(strip=True)
-            try:
-                farmer_count = int(farmer_count_str)
-            except ValueError:
-                farmer_count = 0
-            
-            # Extract total quantity (column 3)
-            quantity_str = cells[3].get_text(strip=True)
-            try:
-                # Remove any non-numeric characters except decimal point
-                quantity = float(''.join(c for c in quantity_str if c.isdigit() or c == '.'))
-            except ValueError:
-                quantity = 0.0
-            
-            # Extract total amount (column 4)
-            amount_str = cells[4].get_text(strip=True)
-            try:
-                # Remove currency symbol and commas
-                amount = float(''.join(c for c in amount_str if c.isdigit() or c == '.'))
-            except ValueError:
-                amount = 0.0
+            date_texts.append(cells[1].get_text(strip=True))
+            count_texts.append(cells[2].get_text(strip=True))
+            quantity_texts.append(cells[3].get_text(strip=True))
+            amount_texts.append(cells[4].get_text(strip=True))
             
             # Extract link to farmer details (if exists)
             farmer_details_url = None
@@ -105,13 +86,27 @@ def parse_datewise_summary(html_content, base_url):
             if date_link:
                 relative_url = date_link.get('href')
                 farmer_details_url = urljoin(base_url, relative_url)
-            
-            result['dates'].append({
-                'date': formatted_date,
-                'farmer_count': farmer_count,
-                'quantity': quantity,
-                'amount': amount,
-                'details_url': farmer_details_url
-            })
+            details_urls.append(farmer_details_url)
+    
+    # Normalize each column in one call: dates, official farmer counts, total quantities and amounts
+    for date_str, formatted_date, farmer_count, quantity, amount, farmer_details_url in zip(
+        date_texts,
+        normalize_date_column(date_texts),
+        normalize_count_column(count_texts),
+        normalize_amount_column(quantity_texts),
+        normalize_amount_column(amount_texts),
+        details_urls
+    ):
+        if formatted_date is None:
+            print(f"Warning: Invalid date format: {date_str}")
+            continue
+        
+        result['dates'].append({
+            'date': formatted_date,
+            'farmer_count': farmer_count,
+            'quantity': quantity,
+            'amount': amount,
+            'details_url': farmer_details_url
+        })
     
     return result
\ No newline at end of file
@@ -2,21 +2,55 @@
 
 from bs4 import BeautifulSoup
 
+# Every report page holds its data in a 'tblSample' table; the page types differ
+# in the column headers the parsers look for. Farmer pages are checked first, in
+# case their header row also carries one of the other labels
+PAGE_TYPE_HEADERS = (
+    ('farmer_details', 'किसान का नाम'),  # 'Farmer Name' in Hindi
+    ('datewise_summary', 'तिथि'),  # 'Date' in Hindi
+    ('centre_list', 'क्रय केंद्र का नाम')  # 'Name of Purchase Center' in Hindi
+)
+
+def detect_from_rows(row_texts):
+    """
+    Detects the page type from the first tblSample row that holds a known column header.
+    
+    Args:
+        row_texts (iterable): Joined cell text of each table row, top to bottom;
+                              consumed only up to the header row
+    
+    Returns:
+        str: One of 'centre_list', 'datewise_summary', 'farmer_details', or 'unknown'
+    """
+    for text in row_texts:
+        for page_type, header_text in PAGE_TYPE_HEADERS:
+            if header_text in text:
+                return page_type
+    return 'unknown'
+
+def detect_document_type(soup):
+    """
+    Detects the type of an already parsed page.
+    
+    Returns:
+        str: One of 'centre_list', 'datewise_summary', 'farmer_details', or 'unknown'
+    """
+    table = soup.find('table', {'id': 'tblSample'})
+    if not table:
+        return 'unknown'
+    return detect_from_rows(
+        ''.join(cell.get_text(strip=True) for cell in row.find_all(['td', 'th']))
+        for row in table.find_all('tr')
+    )
+
 def detect_page_type(html_content):
     """
     Detects the type of page based on its content.
     
+    This parses the page only to detect its type; parse_page in parser.backends
+    detects the type and extracts the data from a single parse.
+    
     Returns:
         str: One of 'centre_list', 'datewise_summary', 'farmer_details', or 'unknown'
     """
-    soup = BeautifulSoup(html_content, 'lxml')
-    
-    # Check for specific elements that identify each page type
-    if soup.find('table', {'id': 'ctl00_ContentPlaceHolder1_gvCenterName'}):
-        return 'centre_list'
-    elif soup.find('table', {'id': 'ctl00_ContentPlaceHolder1_gvDateWise'}):
-        return 'datewise_summary'
-    elif soup.find('table', {'id': 'ctl00_ContentPlaceHolder1_gvFarmerDetails'}):
-        return 'farmer_details'
-    else:
-        return 'unknown'
\ No newline at end of file
+    return detect_document_type(BeautifulSoup(html_content, 'lxml'))
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 from bs4 import BeautifulSoup
 from ..core.constants import DATE_FORMAT
+from ..normalizer.numbers import normalize_amount_column
 from datetime import datetime
 
 def parse_farmer_details(html_content):
@@ -11,7 +12,15 @@ def parse_farmer_details(html_content):
     Returns:
         dict: Dictionary containing date and list of farmer transactions
     """
-    soup = BeautifulSoup(html_content, 'lxml')
+    return extract_farmer_details(BeautifulSoup(html_content, 'lxml'))
+
+def extract_farmer_details(soup):
+    """
+    Extracts farmer transaction data from an already parsed farmer details page.
+    
+    Returns:
+        dict: Dictionary containing date and list of farmer transactions
+    """
     result = {
         'date': None,
         'transactions': []
@@ -58,7 +67,9 @@ def parse_farmer_details(html_content):
         # Fallback to original logic
         data_start_index = 8  # Based on our observation
     
-    # Process data rows
+    # Collect the cells of each column
+    # Columns: Serial No., Farmer ID, Farmer Name, Address, Quantity, Amount, Transaction Time
+    farmer_ids, farmer_names, villages, quantity_texts, amount_texts, transaction_times = [], [], [], [], [], []
     for i in range(data_start_index, len(rows)):
         row = rows[i]
         cells = row.find_all('td')
@@ -68,42 +79,29 @@ def parse_farmer_details(html_content):
             continue
             
         # Based on the structure, we need at least 7 cells (0-indexed)
-        # Columns: Serial No., Farmer ID, Farmer Name, Address, Quantity, Amount, Transaction Time
         if len(cells) >= 7:
-            # Extract farmer registration/ID (column 1) - masked
-            farmer_id = cells[1].get_text(strip=True)
-            
-            # Extract farmer name (column 2)
-            farmer_name = cells[2].get_text(strip=True)
-            
-            # Extract village/address (column 3)
-            village = cells[3].get_text(strip=True)
-            
-            # Extract quantity (column 4)
-            quantity_str = cells[4].get_text(strip=True)
-            try:
-                quantity = float(''.join(c for c in quantity_str if c.isdigit() or c == '.'))
-            except ValueError:
-                quantity = 0.0
-            
-            # Extract amount (column 5)
-            amount_str = cells[5].get_text(strip=True)
-            try:
-                # Remove currency symbol and commas
-                amount = float(''.join(c for c in amount_str if c.isdigit() or c == '.'))
-            except ValueError:
-                amount = 0.0
-            
-            # Extract transaction time (column 6)
-            transaction_time = cells[6].get_text(strip=True)
-            
-            result['transactions'].append({
-                'farmer_id': farmer_id,
-                'farmer_name': farmer_name,
-                'village': village,
-                'quantity': quantity,
-                'amount': amount,
-                'transaction_time': transaction_time
-            })
+            # Farmer registration/ID (column 1) - masked
+            farmer_ids.append(cells[1].get_text(strip=True))
+            farmer_names.append(cells[2].get_text(strip=True))
+            villages.append(cells[3].get_text(strip=True))
+            quantity_texts.append(cells[4].get_text(strip=True))
+            amount_texts.append(cells[5].get_text(strip=True))
+            transaction_times.append(cells[6].get_text(strip=True))
+    
+    # Normalize the quantity and amount columns in one call each
+    for farmer_id, farmer_name, village, quantity, amount, transaction_time in zip(
+        farmer_ids, farmer_names, villages,
+        normalize_amount_column(quantity_texts),
+        normalize_amount_column(amount_texts),
+        transaction_times
+    ):
+        result['transactions'].append({
+            'farmer_id': farmer_id,
+            'farmer_name': farmer_name,
+            'village': village,
+            'quantity': quantity,
+            'amount': amount,
+            'transaction_time': transaction_time
+        })
     
     return result
\ No newline at end of file
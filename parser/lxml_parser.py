@@ -0,0 +1,270 @@
+# lxml-native table extraction for the tblSample pages
+
+from lxml import etree, html
+from urllib.parse import urljoin
+from ..core.constants import DATE_FORMAT
+from ..normalizer.dates import normalize_date_column
+from ..normalizer.numbers import normalize_amount_column, normalize_count_column
+from .detector import detect_from_rows
+from datetime import datetime
+
+# Pages are handed over as text; parse them as UTF-8 whatever their meta tag says
+_HTML_PARSER = html.HTMLParser(encoding='utf-8')
+
+# Elements whose text BeautifulSoup's get_text() leaves out
+_SKIPPED_TAGS = frozenset(('script', 'style', 'template'))
+
+def parse_document(html_content):
+    """
+    Parses a page into an lxml tree.
+    
+    Returns:
+        Element: Root element, or None for an empty document
+    """
+    try:
+        return html.document_fromstring(html_content.encode('utf-8'), parser=_HTML_PARSER)
+    except etree.ParserError:
+        return None
+
+def _find_by_id(root, tag, element_id):
+    if root is None:
+        return None
+    return root.find(f".//{tag}[@id='{element_id}']")
+
+def _append_text(element, parts):
+    if not isinstance(element.tag, str) or element.tag in _SKIPPED_TAGS:
+        return
+    if element.text:
+        text = element.text.strip()
+        if text:
+            parts.append(text)
+    for child in element:
+        _append_text(child, parts)
+        if child.tail:
+            text = child.tail.strip()
+            if text:
+                parts.append(text)
+
+def _text(element):
+    """
+    Same as BeautifulSoup's get_text(strip=True): every text node stripped,
+    empty ones dropped, joined without a separator.
+    """
+    if not len(element):
+        # Most cells hold a single text node
+        return element.text.strip() if element.text else ''
+    parts = []
+    _append_text(element, parts)
+    return ''.join(parts)
+
+def _first_link(element):
+    return next(element.iter('a'), None)
+
+def _row_text(row):
+    return ''.join(_text(cell) for cell in row.iter('td', 'th'))
+
+def _find_data_start(rows, header_text, fallback_index):
+    """
+    Finds the first data row: two rows below the row whose cells contain
+    header_text (the column number row sits in between).
+    """
+    for i, row in enumerate(rows):
+        if header_text in _row_text(row):
+            return i + 2
+    return fallback_index
+
+def detect_document_type(root):
+    """
+    Detects the type of an already parsed page.
+    
+    Returns:
+        str: One of 'centre_list', 'datewise_summary', 'farmer_details', or 'unknown'
+    """
+    table = _find_by_id(root, 'table', 'tblSample')
+    if table is None:
+        return 'unknown'
+    return detect_from_rows(_row_text(row) for row in table.iter('tr'))
+
+def parse_centre_list(html_content, base_url):
+    """
+    Parses the centre list page and extracts centre information.
+    
+    Returns:
+        list: List of dictionaries containing centre information
+    """
+    return extract_centre_list(parse_document(html_content), base_url)
+
+def extract_centre_list(root, base_url):
+    """
+    Extracts centre information from an already parsed centre list page.
+    
+    Returns:
+        list: List of dictionaries containing centre information
+    """
+    centres = []
+    table = _find_by_id(root, 'table', 'tblSample')
+    if table is None:
+        print("Warning: Could not find centre list table")
+        return centres
+    
+    rows = list(table.iter('tr'))
+    data_start_index = _find_data_start(rows, 'क्रय केंद्र का नाम', 9)
+    
+    # The last row contains totals
+    for row in rows[data_start_index:len(rows) - 1]:
+        cells = list(row.iter('td'))
+        if len(cells) >= 6:
+            link_tag = _first_link(cells[1])
+            if link_tag is not None:
+                centres.append({
+                    'name': _text(link_tag),
+                    'url': urljoin(base_url, link_tag.get('href'))
+                })
+    
+    return centres
+
+def parse_datewise_summary(html_content, base_url):
+    """
+    Parses the date-wise summary page and extracts date-wise procurement data.
+    
+    Returns:
+        dict: Dictionary containing centre information and list of date-wise summaries
+    """
+    return extract_datewise_summary(parse_document(html_content), base_url)
+
+def extract_datewise_summary(root, base_url):
+    """
+    Extracts date-wise procurement data from an already parsed date-wise summary page.
+    
+    Returns:
+        dict: Dictionary containing centre information and list of date-wise summaries
+    """
+    result = {
+        'centre_name': None,
+        'dates': []
+    }
+    
+    header_div = _find_by_id(root, 'div', 'ctl00_ContentPlaceHolder1_PnlHeader')
+    if header_div is not None:
+        header_text = _text(header_div)
+        if 'क्रय केंद्र का नाम :' in header_text:
+            parts = header_text.split('क्रय केंद्र का नाम :')
+            if len(parts) > 1:
+                result['centre_name'] = parts[1].split('जनपद :')[0].strip()
+    
+    table = _find_by_id(root, 'table', 'tblSample')
+    if table is None:
+        print("Warning: Could not find date-wise summary table")
+        return result
+    
+    rows = list(table.iter('tr'))
+    data_start_index = _find_data_start(rows, 'तिथि', 10)
+    
+    # Columns: Serial No., Date, Farmer Count, Quantity, Amount
+    date_texts, count_texts, quantity_texts, amount_texts, details_urls = [], [], [], [], []
+    # The last row contains totals
+    for row in rows[data_start_index:len(rows) - 1]:
+        cells = list(row.iter('td'))
+        if len(cells) >= 5:
+            date_texts.append(_text(cells[1]))
+            count_texts.append(_text(cells[2]))
+            quantity_texts.append(_text(cells[3]))
+            amount_texts.append(_text(cells[4]))
+            date_link = _first_link(cells[1])
+            details_urls.append(None if date_link is None else urljoin(base_url, date_link.get('href')))
+    
+    # Each column is normalized in one call
+    for date_str, formatted_date, farmer_count, quantity, amount, farmer_details_url in zip(
+        date_texts,
+        normalize_date_column(date_texts),
+        normalize_count_column(count_texts),
+        normalize_amount_column(quantity_texts),
+        normalize_amount_column(amount_texts),
+        details_urls
+    ):
+        if formatted_date is None:
+            print(f"Warning: Invalid date format: {date_str}")
+            continue
+        result['dates'].append({
+            'date': formatted_date,
+            'farmer_count': farmer_count,
+            'quantity': quantity,
+            'amount': amount,
+            'details_url': farmer_details_url
+        })
+    
+    return result
+
+def parse_farmer_details(html_content):
+    """
+    Parses the farmer details page and extracts farmer transaction data.
+    
+    Returns:
+        dict: Dictionary containing date and list of farmer transactions
+    """
+    return extract_farmer_details(parse_document(html_content))
+
+def extract_farmer_details(root):
+    """
+    Extracts farmer transaction data from an already parsed farmer details page.
+    
+    Returns:
+        dict: Dictionary containing date and list of farmer transactions
+    """
+    result = {
+        'date': None,
+        'transactions': []
+    }
+    
+    header_div = _find_by_id(root, 'div', 'ctl00_ContentPlaceHolder1_PnlHeader')
+    if header_div is not None:
+        header_text = _text(header_div)
+        if 'क्रय दिनांक:' in header_text:
+            parts = header_text.split('क्रय दिनांक:')
+            if len(parts) > 1:
+                date_str = parts[1].split()[0].strip()
+                try:
+                    result['date'] = datetime.strptime(date_str, '%d/%m/%Y').strftime(DATE_FORMAT)
+                except ValueError:
+                    print(f"Warning: Invalid date format: {date_str}")
+    
+    table = _find_by_id(root, 'table', 'tblSample')
+    if table is None:
+        print("Warning: Could not find farmer details table")
+        return result
+    
+    rows = list(table.iter('tr'))
+    data_start_index = _find_data_start(rows, 'किसान का नाम', 8)
+    
+    # Columns: Serial No., Farmer ID, Farmer Name, Address, Quantity, Amount, Transaction Time
+    farmer_ids, farmer_names, villages, quantity_texts, amount_texts, transaction_times = [], [], [], [], [], []
+    # The last row contains totals
+    for row in rows[data_start_index:len(rows) - 1]:
+        cells = list(row.iter('td'))
+        if len(cells) >= 7:
+            farmer_ids.append(_text(cells[1]))
+            farmer_names.append(_text(cells[2]))
+            villages.append(_text(cells[3]))
+            quantity_texts.append(_text(cells[4]))
+            amount_texts.append(_text(cells[5]))
+            transaction_times.append(_text(cells[6]))
+    
+    # Each numeric column is normalized in one call
+    result['transactions'] = [
+        {
+            'farmer_id': farmer_id,
+            'farmer_name': farmer_name,
+            'village': village,
+            'quantity': quantity,
+            'amount': amount,
+            'transaction_time': transaction_time
+        }
+        for farmer_id, farmer_name, village, quantity, amount, transaction_time in zip(
+            farmer_ids, farmer_names, villages,
+            normalize_amount_column(quantity_texts),
+            normalize_amount_column(amount_texts),
+            transaction_times
+        )
+    ]
+    
+    return result
\ No newline at end of file
@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 """
 Full Sync Script for UPEOS System
-Parallel processing implementation for fast, complete data synchronization
+Parallel processing implementation for fast, complete data synchronization.
+Pages flow through a staged pipeline: rate-limited fetcher threads, a process
+pool for parsing and a single writer thread. Work is drained from the persistent sync job queue, so an interrupted run
+resumes where it stopped the next time the script starts.
 """
 
 import time
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import signal
 import threading
 
 # Configure logging
@@ -17,12 +21,20 @@ logging.basicConfig(
 logger = logging.getLogger("FullSync")
 
 class FullSyncEngine:
-    def __init__(self, max_workers=8, detail_workers_per_centre=3):
+    def __init__(self, max_workers=8, detail_workers_per_centre=3, sync_mode=None, parse_workers=None,
+                 fetch_mode="threads", max_connections=10):
         self.max_workers = max_workers
+        self.parse_workers = parse_workers
+        # In async mode max_workers is the number of fetches in flight on one thread
+        self.fetch_mode = fetch_mode
+        self.max_connections = max_connections
+        self.sync_mode = sync_mode
         self.detail_workers_per_centre = detail_workers_per_centre
-        self.rate_limiter = RateLimiter()
         # Use thread-local storage for database connections
         self.local = threading.local()
+        # Every pipeline run, so their page reports can be combined
+        self.pipelines = []
+        self.stop_event = threading.Event()
         
     @property
     def db(self):
@@ -33,28 +45,12 @@ class FullSyncEngine:
         return self.local.db
     
     @property
-    def sync_engine(self):
-        """Thread-local sync engine"""
-        if not hasattr(self.local, 'sync_engine'):
-            from upeos.sync.engine import SyncEngine
-            self.local.sync_engine = SyncEngine(self.db)
-        return self.local.sync_engine
-    
-    @property
-    def centre_repo(self):
-        """Thread-local centre repository"""
-        if not hasattr(self.local, 'centre_repo'):
-            from upeos.db.repositories.centre_repo import CentreRepository
-            self.local.centre_repo = CentreRepository(self.db)
-        return self.local.centre_repo
-    
-    @property
-    def summary_repo(self):
-        """Thread-local summary repository"""
-        if not hasattr(self.local, 'summary_repo'):
-            from upeos.db.repositories.summary_repo import SummaryRepository
-            self.local.summary_repo = SummaryRepository(self.db)
-        return self.local.summary_repo
+    def job_queue(self):
+        """Thread-local sync job queue"""
+        if not hasattr(self.local, 'job_queue'):
+            from upeos.sync.jobs import SyncJobQueue
+            self.local.job_queue = SyncJobQueue(self.db)
+        return self.local.job_queue
     
     def run_full_sync(self):
         """Main entry point for full synchronization"""
@@ -62,149 +58,157 @@ class FullSyncEngine:
         start_time = time.time()
         
         try:
-            # Phase 1: Discover all centres (in main thread)
-            logger.info("Phase 1: Discovering all centres...")
-            from upeos.sync.engine import SyncEngine
-            from upeos.db.connection import DatabaseConnection
-            
-            # Create a new connection for the main thread
-            main_db = DatabaseConnection()
-            main_sync_engine = SyncEngine(main_db)
-            centre_count = main_sync_engine.sync_all_centres()
-            main_sync_engine.close()
-            main_db.close()
-            logger.info(f"Discovered {centre_count} centres")
-            
-            # Phase 2: Get all centres from DB
-            main_db = DatabaseConnection()
-            from upeos.db.repositories.centre_repo import CentreRepository
-            main_centre_repo = CentreRepository(main_db)
-            centres = main_centre_repo.get_all_centres()
-            main_db.close()
-            logger.info(f"Retrieved {len(centres)} centres from database")
+            # Start a new run, or resume the jobs left by an interrupted one
+            if self.job_queue.start_run(self.sync_mode):
+                logger.info("Queued a new sync run")
+            else:
+                logger.info(f"Resuming interrupted sync run: {self.job_queue.get_status()}")
             
-            # Phase 3: Process all centres in parallel
-            logger.info("Phase 3: Processing centres in parallel...")
-            self.process_centres_parallel(centres)
-            
-            # Phase 4: Process farmer details for all dates
-            logger.info("Phase 4: Processing farmer details...")
-            self.process_all_farmer_details(centres)
+            self.drain_jobs()
             
             end_time = time.time()
-            logger.info(f"Full synchronization completed in {end_time - start_time:.2f} seconds")
+            if self.stop_event.is_set():
+                logger.info(f"Synchronization stopped after {end_time - start_time:.2f} seconds; remaining jobs resume on the next run")
+            else:
+                logger.info(f"Full synchronization completed in {end_time - start_time:.2f} seconds")
+            self.prune_archive()
+            self.log_report()
+            
+            status = self.job_queue.get_status()
+            if status['FAILED']:
+                logger.warning(f"{status['FAILED']} sync jobs failed after all attempts")
             
         except Exception as e:
             logger.error(f"Error during full sync: {e}")
             raise
     
-    def process_centres_parallel(self, centres):
-        """Process all centres in parallel to fetch date-wise summaries"""
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all centre processing tasks
-            future_to_centre = {
-                executor.submit(self.process_centre_summaries, centre): centre 
-                for centre in centres
-            }
-            
-            # Collect results as they complete
-            completed = 0
-            for future in as_completed(future_to_centre):
-                centre = future_to_centre[future]
-                try:
-                    count = future.result()
-                    completed += 1
-                    logger.info(f"Completed {centre['name']}: {count} date entries")
-                    logger.info(f"Progress: {completed}/{len(centres)} centres")
-                except Exception as e:
-                    logger.error(f"Error processing centre {centre['name']}: {e}")
+    def drain_jobs(self):
+        """Process queued sync jobs through the fetch -> parse -> write pipeline until the queue is empty"""
+        from upeos.sync.pipeline import SyncPipeline
+        pipeline = SyncPipeline(
+            fetch_workers=self.max_workers,
+            parse_workers=self.parse_workers,
+            stop_event=self.stop_event,
+            fetch_mode=self.fetch_mode,
+            max_connections=self.max_connections
+        )
+        self.pipelines.append(pipeline)
+        pipeline.run()
     
-    def process_centre_summaries(self, centre):
-        """Process a single centre to fetch all date-wise summaries"""
-        # Rate limiting
-        self.rate_limiter.wait_if_needed("eproc.up.gov.in")
-        
-        # Fetch and save date-wise summaries
-        count = self.sync_engine.sync_centre_datewise_data(centre['name'])
-        return count
+    def prune_archive(self):
+        """Apply the page archive's retention policy and log its size"""
+        from upeos.archive.page_archive import PageArchive
+        archive = PageArchive(self.db)
+        if not archive.enabled:
+            return
+        pruned = archive.prune()
+        stats = archive.get_stats()
+        logger.info(
+            f"Page archive: {stats['pages']} pages, {stats['versions']} versions, "
+            f"{stats['contents']} distinct contents in {stats['stored_bytes'] / 1024 / 1024:.2f} MB; "
+            f"pruned {pruned['versions_deleted']} versions and {pruned['files_deleted']} files"
+        )
     
-    def process_all_farmer_details(self, centres):
-        """Process farmer details for all centres and dates"""
-        # Get all dates for all centres
-        total_dates = 0
-        
-        # Get summaries using main thread connection
-        from upeos.db.connection import DatabaseConnection
-        from upeos.db.repositories.summary_repo import SummaryRepository
-        main_db = DatabaseConnection()
-        main_summary_repo = SummaryRepository(main_db)
-        
-        all_tasks = []
-        for centre in centres:
-            summaries = main_summary_repo.get_summaries_by_centre(centre['id'])
-            total_dates += len(summaries)
-            for summary in summaries:
-                all_tasks.append((centre['name'], summary['date']))
-        
-        main_db.close()
-        
-        logger.info(f"Processing farmer details for {total_dates} dates across {len(centres)} centres")
-        
-        # Process in parallel
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_task = {
-                executor.submit(self.process_date_farmer_details, centre_name, date): (centre_name, date)
-                for centre_name, date in all_tasks
-            }
-            
-            # Collect results
-            processed_dates = 0
-            for future in as_completed(future_to_task):
-                centre_name, date = future_to_task[future]
-                try:
-                    count = future.result()
-                    processed_dates += 1
-                    logger.info(f"Completed farmer details for {centre_name} on {date}: {count} transactions")
-                    logger.info(f"Farmer details progress: {processed_dates}/{total_dates} dates")
-                except Exception as e:
-                    logger.error(f"Error processing farmer details for {centre_name} on {date}: {e}")
+    def stop(self):
+        """Ask workers to stop after their current job; the run resumes on the next start"""
+        self.stop_event.set()
     
-    def process_date_farmer_details(self, centre_name, date):
-        """Process farmer details for a specific centre and date"""
-        # Rate limiting
-        self.rate_limiter.wait_if_needed("eproc.up.gov.in")
-        
-        # Fetch and save farmer details
-        count = self.sync_engine.sync_farmer_details(centre_name, date)
-        return count
+    def get_report(self):
+        """Combine the page counters and wall time of every pipeline used in this run"""
+        report = {'wall_seconds': 0.0}
+        for pipeline in self.pipelines:
+            for key, value in pipeline.get_report().items():
+                report[key] = report.get(key, 0) + value
+            report['wall_seconds'] += pipeline.elapsed_seconds
+        return report
     
-    def cleanup(self):
-        """Cleanup resources"""
-        # Clean up thread-local resources
-        if hasattr(self.local, 'sync_engine'):
-            self.local.sync_engine.close()
+    def log_report(self):
+        """Log the combined page counters, pipeline stage throughput and rate limiting"""
+        report = self.get_report()
+        logger.info(
+            f"Pages fetched: {report.get('pages_fetched', 0)}, "
+            f"unchanged (skipped): {report.get('pages_unchanged', 0)}, "
+            f"written: {report.get('pages_written', 0)}"
+        )
+        logger.info(
+            f"Downloaded {report.get('bytes_downloaded', 0) / 1024 / 1024:.2f} MB in {report['wall_seconds']:.1f}s; "
+            f"{report.get('pages_not_modified', 0)} pages answered 304 Not Modified"
+        )
+        logger.info(
+            f"Rows written: {report.get('rows_written', 0)} in {report.get('write_seconds', 0.0):.2f}s of database writes; "
+            f"{report.get('rows_unchanged', 0)} unchanged farmer transactions left alone"
+        )
+        for pipeline in self.pipelines:
+            stats = pipeline.get_stats()
+            for name, stage in stats['stages'].items():
+                logger.info(
+                    f"Stage {name}: {stage['items']} pages, {stage['per_second']:.2f} pages/s, "
+                    f"{stage['utilisation']:.0%} busy across {stage['workers']} workers"
+                )
+            logger.info("Queue depths: " + ", ".join(
+                f"{name} mean {depth['mean']:.1f} max {depth['max']}" for name, depth in stats['queues'].items()
+            ))
+            freshness = stats['freshness']
+            if freshness['today_fresh_after_seconds'] is not None:
+                logger.info(
+                    f"Today's data fresh after {freshness['today_fresh_after_seconds']:.1f}s "
+                    f"({freshness['open_pages_synced']} OPEN pages synced)"
+                )
+            else:
+                logger.warning(f"Today's data not fully fresh: {freshness['open_jobs_outstanding']} OPEN jobs outstanding")
+        from upeos.fetcher.rate_limiter import get_rate_limiter
+        rate_limiter = get_rate_limiter()
+        pacing = rate_limiter.pacer.get_state()
+        for host, metrics in rate_limiter.get_metrics().items():
+            logger.info(
+                f"Rate limit {host}: {metrics['requests']} requests, "
+                f"waiting {metrics['wait_seconds']:.1f}s (max {metrics['max_wait_seconds']:.1f}s), "
+                f"fetching {metrics['fetch_seconds']:.1f}s"
+            )
+            if host in pacing:
+                logger.info(
+                    f"Pacing {host}: {pacing[host]['delay_seconds']:.2f}s between requests, "
+                    f"slowed down {pacing[host]['decreases']} times "
+                    f"({pacing[host]['errors']} errors, {pacing[host]['slow_responses']} slow responses)"
+                )
+    
+    def release_thread_resources(self):
+        """Close the current thread's database connection"""
         if hasattr(self.local, 'db'):
             self.local.db.close()
-        logger.info("Cleanup completed")
-
-class RateLimiter:
-    def __init__(self):
-        self.domain_last_request = {}
-        self.min_delay = 1.0  # seconds
-        self.lock = threading.Lock()
+        self.local.__dict__.clear()
     
-    def wait_if_needed(self, domain):
-        with self.lock:
-            last_req = self.domain_last_request.get(domain, 0)
-            elapsed = time.time() - last_req
-            if elapsed < self.min_delay:
-                time.sleep(self.min_delay - elapsed)
-            self.domain_last_request[domain] = time.time()
+    def cleanup(self):
+        """Cleanup resources"""
+        # Pipeline threads release their own resources when they finish
+        self.release_thread_resources()
+        logger.info("Cleanup completed")
 
 def main():
     """Main function to run full sync"""
+    from upeos.sync.planner import SYNC_MODES
+    from upeos.sync.pipeline import FETCH_MODES, FETCH_MODE_THREADS, FETCH_MODE_ASYNC
+    parser = argparse.ArgumentParser(description="Run a UPEOS synchronization")
+    parser.add_argument("--mode", choices=SYNC_MODES, default=None,
+                        help="Which farmer-detail pages to fetch (defaults to default_sync_mode in sync.yaml)")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="Processes used to parse pages (defaults to the CPU count)")
+    parser.add_argument("--fetch-mode", choices=FETCH_MODES, default=FETCH_MODE_THREADS,
+                        help="Fetch with a pool of threads, or with asyncio coroutines on one thread")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Fetches in flight: fetcher threads, or coroutines in async mode (default 8 / 100)")
+    parser.add_argument("--max-connections", type=int, default=10,
+                        help="Keep-alive connection pool size in async mode")
+    args = parser.parse_args()
+    
+    concurrency = args.concurrency or (100 if args.fetch_mode == FETCH_MODE_ASYNC else 8)
     logger.info("Initializing full sync engine...")
-    sync_engine = FullSyncEngine(max_workers=8, detail_workers_per_centre=3)
+    sync_engine = FullSyncEngine(max_workers=concurrency, detail_workers_per_centre=3, sync_mode=args.mode,
+                                 parse_workers=args.parse_workers, fetch_mode=args.fetch_mode,
+                                 max_connections=args.max_connections)
+    
+    # Finish in-flight jobs on SIGTERM; the remaining queue is resumed next run
+    signal.signal(signal.SIGTERM, lambda signum, frame: sync_engine.stop())
     
     try:
         sync_engine.run_full_sync()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Database rebuild script for UPEOS System
+Re-parses the newest archived version of every page with a process pool and
+bulk-loads the results into a fresh database, which then replaces the live
+one. Used after a parser fix, instead of refetching every page from the site.
+Stop syncs and the API server while rebuilding in place.
+"""
+
+import logging
+import argparse
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+)
+logger = logging.getLogger("Rebuild")
+
+def main():
+    """Main function to rebuild the database from the page archive"""
+    from upeos.archive.rebuild import ArchiveRebuilder
+    parser = argparse.ArgumentParser(description="Rebuild the UPEOS database from the raw page archive")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="Processes used to parse pages (defaults to the CPU count)")
+    parser.add_argument("--parser-backend", choices=["lxml", "bs4"], default=None,
+                        help="Page parser implementation (defaults to parser_backend in config/settings.yaml)")
+    parser.add_argument("--output", default=None,
+                        help="Where to build the fresh database (defaults to <database>.rebuild)")
+    parser.add_argument("--no-swap", action="store_true",
+                        help="Leave the rebuilt database at --output instead of replacing the live one")
+    args = parser.parse_args()
+    
+    rebuilder = ArchiveRebuilder(parse_workers=args.parse_workers, parser_backend=args.parser_backend)
+    logger.info(
+        f"Rebuilding {rebuilder.db_path} from the page archive with {rebuilder.parse_workers} "
+        f"{rebuilder.parser_backend} parse workers..."
+    )
+    report = rebuilder.rebuild(output_path=args.output, swap=not args.no_swap)
+    
+    parsed = report['pages_parsed']
+    logger.info(
+        f"Parsed {sum(parsed.values())} pages ({', '.join(f'{count} {page_type}' for page_type, count in parsed.items())}) "
+        f"in {report['parse_seconds']:.1f}s of {report['seconds']:.1f}s"
+    )
+    logger.info(
+        f"Loaded {report['centres']} centres, {report['summaries']} date-wise summaries "
+        f"and {report['transactions']} farmer transactions into {report['database']}"
+    )
+    if report['pages_unmatched']:
+        logger.warning(f"{report['pages_unmatched']} archived pages did not match any centre or date and were skipped")
+    if report['pages_failed']:
+        logger.warning(f"{report['pages_failed']} archived pages failed to parse:")
+        for error in report['errors']:
+            logger.warning(f"  {error['url']}: {error['error']}")
+
+if __name__ == "__main__":
+    main()
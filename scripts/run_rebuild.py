@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Runner script for the database rebuild
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from upeos.scripts.rebuild import main
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
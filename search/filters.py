@@ -1,5 +1,7 @@
 # Filter parsing & validation
 
+from ..normalizer.dates import validate_date_format
+
 class SearchFilters:
     """
     Manages parsing and validation of search filters.
@@ -75,16 +77,20 @@ class SearchFilters:
         if 'from_date' in self.filters:
             from_date = self.filters['from_date']
             if isinstance(from_date, str) and len(from_date.strip()) > 0:
-                # Basic validation - in a real implementation, we would validate the date format
-                self.parsed_filters['from_date'] = from_date.strip()
+                if validate_date_format(from_date.strip()):
+                    self.parsed_filters['from_date'] = from_date.strip()
+                else:
+                    self.errors.append("Invalid from_date filter: must be in DD/MM/YYYY format")
             else:
                 self.errors.append("Invalid from_date filter: must be a non-empty string")
         
         if 'to_date' in self.filters:
             to_date = self.filters['to_date']
             if isinstance(to_date, str) and len(to_date.strip()) > 0:
-                # Basic validation - in a real implementation, we would validate the date format
-                self.parsed_filters['to_date'] = to_date.strip()
+                if validate_date_format(to_date.strip()):
+                    self.parsed_filters['to_date'] = to_date.strip()
+                else:
+                    self.errors.append("Invalid to_date filter: must be in DD/MM/YYYY format")
             else:
                 self.errors.append("Invalid to_date filter: must be a non-empty string")
     
@@ -1,5 +1,7 @@
 # SQL query builder
 
+from ..utils.timeutils import date_to_ordinal
+
 class SQLQueryBuilder:
     """
     Builds SQL queries for searching and filtering data.
@@ -61,15 +63,15 @@ class SQLQueryBuilder:
         
         # Add date filters
         if 'from_date' in filters:
-            query += " AND ft.date >= ?"
-            params.append(filters['from_date'])
+            query += " AND ft.date_ordinal >= ?"
+            params.append(date_to_ordinal(filters['from_date']))
         
         if 'to_date' in filters:
-            query += " AND ft.date <= ?"
-            params.append(filters['to_date'])
+            query += " AND ft.date_ordinal <= ?"
+            params.append(date_to_ordinal(filters['to_date']))
         
         # Order by date descending and farmer name
-        query += " ORDER BY ft.date DESC, ft.farmer_name"
+        query += " ORDER BY ft.date_ordinal DESC, ft.farmer_name"
         
         return query, params
     
@@ -94,12 +96,12 @@ class SQLQueryBuilder:
         
         # Add date filters
         if 'from_date' in filters:
-            query += " AND ft.date >= ?"
-            params.append(filters['from_date'])
+            query += " AND ft.date_ordinal >= ?"
+            params.append(date_to_ordinal(filters['from_date']))
         
         if 'to_date' in filters:
-            query += " AND ft.date <= ?"
-            params.append(filters['to_date'])
+            query += " AND ft.date_ordinal <= ?"
+            params.append(date_to_ordinal(filters['to_date']))
         
         # Order by village name
         query += " ORDER BY ft.village"
@@ -158,14 +160,14 @@ class SQLQueryBuilder:
         
         # Date filters
         if 'from_date' in filters:
-            query += " AND ft.date >= ?"
-            params.append(filters['from_date'])
+            query += " AND ft.date_ordinal >= ?"
+            params.append(date_to_ordinal(filters['from_date']))
         
         if 'to_date' in filters:
-            query += " AND ft.date <= ?"
-            params.append(filters['to_date'])
+            query += " AND ft.date_ordinal <= ?"
+            params.append(date_to_ordinal(filters['to_date']))
         
         # Order by date descending and farmer name
-        query += " ORDER BY ft.date DESC, ft.farmer_name"
+        query += " ORDER BY ft.date_ordinal DESC, ft.farmer_name"
         
         return query, params
\ No newline at end of file
@@ -31,6 +31,21 @@ class DeltaChecker:
         # Compare hashes
         return new_html_hash != previous_html_hash
     
+    def compare(self, new_html_content, previous_html_hash):
+        """
+        Hashes new HTML content once and compares it with a previous hash.
+        
+        Args:
+            new_html_content (str): New HTML content
+            previous_html_hash (str): Previous HTML hash
+            
+        Returns:
+            tuple: (new_html_hash, changed)
+        """
+        new_html_hash = compute_html_hash(new_html_content)
+        changed = not previous_html_hash or new_html_hash != previous_html_hash
+        return new_html_hash, changed
+    
     def get_content_hash(self, html_content):
         """
         Gets the hash of HTML content.
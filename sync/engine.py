@@ -1,15 +1,15 @@
 # Sync orchestration logic
 
 from ..fetcher.client import HTTPClient
-from ..parser.detector import detect_page_type
-from ..parser.centre_parser import parse_centre_list
-from ..parser.datewise_parser import parse_datewise_summary
-from ..parser.farmer_parser import parse_farmer_details
+from ..parser.backends import get_parser_backend
 from ..db.repositories.centre_repo import CentreRepository
 from ..db.repositories.summary_repo import SummaryRepository
 from ..db.repositories.farmer_repo import FarmerRepository
-from ..utils.hashing import compute_html_hash
-from ..core.constants import BASE_URL
+from ..db.repositories.change_repo import TransactionChangeRepository
+from ..db.repositories.page_repo import PageRepository
+from ..archive.page_archive import PageArchive
+from .delta import DeltaChecker
+from ..fetcher.urls import get_base_url
 from ..config.settings import Settings
 import time
 
@@ -23,113 +23,292 @@ class SyncEngine:
         self.centre_repo = CentreRepository(db_connection)
         self.summary_repo = SummaryRepository(db_connection)
         self.farmer_repo = FarmerRepository(db_connection)
-        self.http_client = HTTPClient()
+        self.change_repo = TransactionChangeRepository(db_connection)
+        self.page_repo = PageRepository(db_connection)
+        self.delta_checker = DeltaChecker()
+        self.archive = PageArchive(db_connection)
+        self.parser = get_parser_backend()
+        self._http_client = None
         self.settings = Settings()
+        self.report = {
+            'pages_fetched': 0,
+            'pages_unchanged': 0,
+            'pages_written': 0,
+            'pages_not_modified': 0,
+            'bytes_downloaded': 0,
+            'rows_written': 0,
+            'rows_unchanged': 0,
+            'write_seconds': 0.0
+        }
     
-    def sync_all_centres(self):
+    @property
+    def http_client(self):
         """
-        Synchronizes all centres from the government website.
+        HTTP client, created on first use so engines that only store pages never open a session.
         """
-        print("Starting sync of all centres...")
+        if self._http_client is None:
+            self._http_client = HTTPClient()
+        return self._http_client
+    
+    def fetch_page(self, url, force=False, page_type=None):
+        """
+        Fetches a page and checks it against the stored copy, without writing
+        to the database.
+        
+        The request is conditional when validators (ETag, Last-Modified) are
+        stored for the page, and a 304 Not Modified response counts as
+        unchanged. Pages from servers that ignore validators are compared by
+        content hash instead. Transient failures are retried according to
+        the page type's retry policy.
+        
+        Returns:
+            tuple: (html_content, html_hash, changed, validators), with
+                   html_content None for a 304 response
+        """
+        page, validators = self._get_stored_validators(url, force)
+        response = self.http_client.get(url, page_type=page_type, **validators)
+        return self._check_response(response, page, force)
+    
+    async def fetch_page_async(self, async_client, url, force=False, page_type=None):
+        """
+        Same as fetch_page, using an AsyncHTTPClient so many fetches can wait
+        on the network concurrently on one thread.
+        
+        Returns:
+            tuple: (html_content, html_hash, changed, validators)
+        """
+        page, validators = self._get_stored_validators(url, force)
+        response = await async_client.get(url, page_type=page_type, **validators)
+        return self._check_response(response, page, force)
+    
+    def _get_stored_validators(self, url, force):
+        """
+        Looks up the stored copy of a page and the validators to send for it.
+        
+        Returns:
+            tuple: (page record or None, dict with etag and last_modified)
+        """
+        page = self.page_repo.get_page(url)
+        conditional = bool(page and page['html_hash']) and not force
+        return page, {
+            'etag': page['etag'] if conditional else None,
+            'last_modified': page['last_modified'] if conditional else None
+        }
+    
+    def _check_response(self, response, page, force):
+        """
+        Compares a response with the stored copy of the page.
+        
+        Returns:
+            tuple: (html_content, html_hash, changed, validators)
+        """
+        conditional = bool(page and page['html_hash']) and not force
+        self.report['pages_fetched'] += 1
+        self.report['bytes_downloaded'] += int(response.headers.get('Content-Length') or len(response.content))
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        
+        if conditional and response.status_code == 304:
+            self.report['pages_not_modified'] += 1
+            self.report['pages_unchanged'] += 1
+            return None, page['html_hash'], False, validators
         
-        # Fetch the main centre list page
-        response = self.http_client.get(BASE_URL)
         html_content = response.text
-        html_hash = compute_html_hash(html_content)
+        html_hash, changed = self.delta_checker.compare(html_content, page['html_hash'] if page else None)
+        # Keep the raw page, so data can be rebuilt without refetching it
+        self.archive.store_content(html_content, html_hash)
+        if not changed and not force:
+            self.report['pages_unchanged'] += 1
+            return html_content, html_hash, False, validators
+        
+        return html_content, html_hash, True, validators
+    
+    def _fetch_page(self, url, page_type, force=False, page_date=None):
+        """
+        Fetches a page and checks it against the stored copy.
         
-        # Parse the centre list
-        centres = parse_centre_list(html_content, BASE_URL)
+        Returns:
+            tuple: (html_content, html_hash, changed, validators)
+        """
+        html_content, html_hash, changed, validators = self.fetch_page(url, force, page_type)
+        if not changed:
+            # Same content as last time: skip parsing and writes
+            self.mark_page_unchanged(url, page_type, html_hash, validators, page_date)
+        return html_content, html_hash, changed, validators
+    
+    def mark_page_unchanged(self, url, page_type, html_hash, validators=None, page_date=None):
+        """
+        Records a check of a page whose content was unchanged.
+        """
+        validators = validators or {}
+        self.page_repo.mark_page_checked(url, **validators)
+        self.archive.record_version(url, page_type, html_hash, page_date, validators)
+    
+    def get_page_url(self, page_type, centre_name=None, date=None):
+        """
+        Resolves the URL of a page from the stored centres and summaries.
         
-        # Save centres to database
-        for centre in centres:
-            self.centre_repo.create_or_update_centre(
-                name=centre['name'],
-                url=centre['url']
-            )
+        Args:
+            page_type (str): 'centre_list', 'datewise_summary' or 'farmer_details'
+            centre_name (str, optional): Centre name
+            date (str, optional): Date in DD/MM/YYYY format
+            
+        Returns:
+            tuple: (url, centre), with url None if the page cannot be resolved
+        """
+        if page_type == 'centre_list':
+            return get_base_url(), None
+        
+        centre = self.centre_repo.get_centre_by_name(centre_name)
+        if not centre:
+            print(f"Centre not found: {centre_name}")
+            return None, None
         
-        print(f"Synced {len(centres)} centres")
+        if page_type == 'datewise_summary':
+            return centre['url'], centre
+        
+        summary = self.summary_repo.get_summary_by_centre_and_date(centre['id'], date)
+        if not summary or not summary['details_url']:
+            print(f"No details URL found for centre: {centre_name}, date: {date}")
+            return None, centre
+        return summary['details_url'], centre
+    
+    def _record_page(self, url, page_type, html_hash, validators=None, page_date=None):
+        """
+        Records the hash and validators of a page once its content has been
+        stored, and its archived version.
+        """
+        self.page_repo.record_page(url, page_type, html_hash, **(validators or {}))
+        self.archive.record_version(url, page_type, html_hash, page_date, validators)
+        self.report['pages_written'] += 1
+    
+    def get_report(self):
+        """
+        Returns the page counters accumulated by this engine.
+        """
+        return dict(self.report)
+    
+    def store_centre_list(self, centres, html_hash, validators=None):
+        """
+        Stores parsed centres and records the centre list page.
+        
+        Returns:
+            int: Number of centres
+        """
+        start_time = time.perf_counter()
+        with self.db_connection.transaction():
+            for centre in centres:
+                self.centre_repo.create_or_update_centre(
+                    name=centre['name'],
+                    url=centre['url']
+                )
+            self._record_page(get_base_url(), 'centre_list', html_hash, validators)
+        self.report['write_seconds'] += time.perf_counter() - start_time
+        self.report['rows_written'] += len(centres)
         return len(centres)
     
-    def sync_centre_datewise_data(self, centre_name):
+    def store_datewise_summary(self, centre, datewise_data, html_hash, validators=None):
+        """
+        Stores a centre's parsed date-wise summaries and records the page.
+        
+        Returns:
+            tuple: (number of entries, number of new or changed entries)
+        """
+        start_time = time.perf_counter()
+        with self.db_connection.transaction():
+            changed = self.summary_repo.upsert_summaries(centre['id'], datewise_data['dates'], html_hash)
+            self._record_page(centre['url'], 'datewise_summary', html_hash, validators)
+        self.report['write_seconds'] += time.perf_counter() - start_time
+        self.report['rows_written'] += len(datewise_data['dates'])
+        return len(datewise_data['dates']), changed
+    
+    def store_farmer_details(self, centre, date, details_url, farmer_data, html_hash, validators=None):
+        """
+        Updates a centre's farmer transactions for a date and records the page.
+        Only added and removed rows are written, and logged as a change.
+        
+        Returns:
+            int: Number of transactions stored
+        """
+        start_time = time.perf_counter()
+        with self.db_connection.transaction():
+            changes = self.farmer_repo.sync_transactions_for_day(
+                centre['id'], date, farmer_data['transactions']
+            )
+            if changes['added'] or changes['removed']:
+                self.change_repo.record_change(
+                    centre['id'], date, changes['added'], changes['removed'], changes['total'], html_hash
+                )
+            self._record_page(details_url, 'farmer_details', html_hash, validators, date)
+        self.report['write_seconds'] += time.perf_counter() - start_time
+        self.report['rows_written'] += changes['added'] + changes['removed']
+        self.report['rows_unchanged'] += changes['unchanged']
+        return changes['total']
+    
+    def sync_all_centres(self, force=False):
+        """
+        Synchronizes all centres from the government website.
+        """
+        print("Starting sync of all centres...")
+        
+        # Fetch the main centre list page
+        base_url = get_base_url()
+        html_content, html_hash, changed, validators = self._fetch_page(base_url, 'centre_list', force)
+        if not changed:
+            print("Centre list unchanged since last sync")
+            return 0
+        
+        # Parse the centre list and save centres to database
+        centres = self.parser.parse_expected('centre_list', html_content, base_url)
+        count = self.store_centre_list(centres, html_hash, validators)
+        
+        print(f"Synced {count} centres")
+        return count
+    
+    def sync_centre_datewise_data(self, centre_name, force=False):
         """
         Synchronizes date-wise data for a specific centre.
         """
         print(f"Starting sync of date-wise data for centre: {centre_name}")
         
-        # Get centre from database
-        centre = self.centre_repo.get_centre_by_name(centre_name)
-        if not centre:
-            print(f"Centre not found: {centre_name}")
+        url, centre = self.get_page_url('datewise_summary', centre_name)
+        if not url:
             return 0
         
         # Fetch the date-wise summary page
-        response = self.http_client.get(centre['url'])
-        html_content = response.text
-        html_hash = compute_html_hash(html_content)
-        
-        # Parse the date-wise summary
-        datewise_data = parse_datewise_summary(html_content, centre['url'])
-        
-        # Save date-wise summaries to database
-        count = 0
-        for date_entry in datewise_data['dates']:
-            self.summary_repo.create_or_update_summary(
-                centre_id=centre['id'],
-                date=date_entry['date'],
-                farmer_count=date_entry['farmer_count'],
-                quantity=date_entry['quantity'],
-                amount=date_entry['amount'],
-                details_url=date_entry['details_url'],
-                html_hash=html_hash
-            )
-            count += 1
+        html_content, html_hash, changed, validators = self._fetch_page(url, 'datewise_summary', force)
+        if not changed:
+            print(f"Date-wise page unchanged for centre: {centre_name}")
+            return 0
+        
+        # Parse the date-wise summary and save it in one transaction
+        datewise_data = self.parser.parse_expected('datewise_summary', html_content, url)
+        count, changed = self.store_datewise_summary(centre, datewise_data, html_hash, validators)
         
-        print(f"Synced {count} date-wise entries for centre: {centre_name}")
+        print(f"Synced {count} date-wise entries for centre: {centre_name} ({changed} changed)")
         return count
     
-    def sync_farmer_details(self, centre_name, date):
+    def sync_farmer_details(self, centre_name, date, force=False):
         """
         Synchronizes farmer details for a specific centre and date.
         """
         print(f"Starting sync of farmer details for centre: {centre_name}, date: {date}")
         
-        # Get centre from database
-        centre = self.centre_repo.get_centre_by_name(centre_name)
-        if not centre:
-            print(f"Centre not found: {centre_name}")
+        url, centre = self.get_page_url('farmer_details', centre_name, date)
+        if not url:
             return 0
         
-        # Get date-wise summary to get the details URL
-        summary = self.summary_repo.get_summary_by_centre_and_date(centre['id'], date)
-        if not summary or not summary['details_url']:
-            print(f"No details URL found for centre: {centre_name}, date: {date}")
+        # Fetch the farmer details page
+        html_content, html_hash, changed, validators = self._fetch_page(url, 'farmer_details', force, date)
+        if not changed:
+            print(f"Farmer details unchanged for centre: {centre_name}, date: {date}")
             return 0
         
-        # Fetch the farmer details page
-        response = self.http_client.get(summary['details_url'])
-        html_content = response.text
-        html_hash = compute_html_hash(html_content)
-        
-        # Parse the farmer details
-        farmer_data = parse_farmer_details(html_content)
-        
-        # Delete existing transactions for this centre and date to avoid duplicates
-        self.farmer_repo.delete_transactions_by_centre_and_date(centre['id'], date)
-        
-        # Save farmer transactions to database
-        count = 0
-        for transaction in farmer_data['transactions']:
-            self.farmer_repo.create_or_update_transaction(
-                centre_id=centre['id'],
-                date=date,
-                farmer_id=transaction['farmer_id'],
-                farmer_name=transaction['farmer_name'],
-                village=transaction['village'],
-                quantity=transaction['quantity'],
-                amount=transaction['amount'],
-                transaction_time=transaction['transaction_time']
-            )
-            count += 1
+        # Parse the farmer details and replace existing transactions for this centre and date
+        farmer_data = self.parser.parse_expected('farmer_details', html_content, url)
+        count = self.store_farmer_details(centre, date, url, farmer_data, html_hash, validators)
         
         print(f"Synced {count} farmer transactions for centre: {centre_name}, date: {date}")
         return count
@@ -138,4 +317,6 @@ class SyncEngine:
         """
         Closes the HTTP client.
         """
-        self.http_client.close()
\ No newline at end of file
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
@@ -66,7 +66,7 @@ class FreshnessManager:
         # Determine expected freshness based on data state
         data_state = self.determine_data_state(date)
         thresholds = self.sync_config.freshness_thresholds
-        threshold_hours = thresholds.get(data_state, thresholds['open'])
+        threshold_hours = thresholds.get(data_state.lower(), thresholds['open'])
         
         # Calculate time since last sync
         last_synced = datetime.strptime(summary['last_synced'], '%Y-%m-%d %H:%M:%S')
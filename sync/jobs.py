@@ -0,0 +1,192 @@
+# Durable sync job queue
+
+from ..db.repositories.job_repo import SyncJobRepository, JOB_STATE_PENDING, JOB_STATE_RUNNING
+from ..db.repositories.centre_repo import CentreRepository
+from ..config.settings import get_settings
+from ..fetcher.retry import get_retry_policy
+from ..core.constants import DATA_STATE_OPEN, DATA_STATE_CLOSING, DATA_STATE_CLOSED
+from ..utils.timeutils import date_to_ordinal
+from .planner import SyncPlanner
+
+# Job page types, processed in this order within a run
+JOB_CENTRE_LIST = "centre_list"
+JOB_DATEWISE_SUMMARY = "datewise_summary"
+JOB_FARMER_DETAILS = "farmer_details"
+
+# Claim priority per data state; lower runs first. The centre list goes
+# before everything else since it discovers all other work.
+JOB_PRIORITY_CENTRE_LIST = 0
+DATA_STATE_PRIORITIES = {
+    DATA_STATE_OPEN: 1,
+    DATA_STATE_CLOSING: 2,
+    DATA_STATE_CLOSED: 3
+}
+
+class SyncJobQueue:
+    """
+    Persistent queue of page fetches that makes sync runs resumable.
+    
+    A run starts with a single centre list job. Each finished job enqueues
+    its follow-up work: the centre list enqueues every centre's date-wise page
+    and each date-wise page enqueues the farmer-detail pages planned for it.
+    Progress is kept in the sync_jobs table, so an interrupted run resumes
+    where it stopped.
+    
+    Jobs are claimed by the data state of their page, so today's OPEN data
+    (date-wise pages and today's farmer details) is fetched before CLOSING
+    and CLOSED history. Within a state, centres take turns, each starting
+    with its stalest page.
+    """
+    
+    def __init__(self, db_connection, max_attempts=None):
+        self.job_repo = SyncJobRepository(db_connection)
+        self.centre_repo = CentreRepository(db_connection)
+        self.planner = SyncPlanner(db_connection)
+        self.max_attempts = max_attempts or get_settings().max_retries or 3
+    
+    def start_run(self, sync_mode=None):
+        """
+        Starts a new run, or resumes the unfinished one.
+        
+        Must only be called while no worker is draining the queue, since jobs
+        left RUNNING are assumed to belong to an interrupted run. Jobs that
+        failed in earlier runs are queued again with fresh attempts, so a
+        transient outage never leaves pages out for good.
+        
+        Args:
+            sync_mode (str, optional): Planner mode for farmer-detail pages
+            
+        Returns:
+            bool: True if a new run was started, False if resuming
+        """
+        self.job_repo.requeue_running_jobs()
+        resuming = self.job_repo.count_jobs_by_state()[JOB_STATE_PENDING] > 0
+        self.job_repo.requeue_failed_jobs()
+        if resuming:
+            return False
+        
+        self.job_repo.delete_done_jobs()
+        self.job_repo.enqueue_jobs([{
+            'job_key': JOB_CENTRE_LIST,
+            'page_type': JOB_CENTRE_LIST,
+            'sync_mode': sync_mode or self.planner.sync_config.default_sync_mode,
+            'data_state': DATA_STATE_OPEN,
+            'priority': JOB_PRIORITY_CENTRE_LIST
+        }])
+        return True
+    
+    def claim(self):
+        """
+        Claims the next pending job, or returns None if there is none.
+        """
+        return self.job_repo.claim_next_job()
+    
+    def has_unfinished_jobs(self):
+        """
+        Checks whether jobs are in flight (and may still enqueue follow-ups)
+        or waiting out a retry delay.
+        """
+        counts = self.job_repo.count_jobs_by_state()
+        return counts[JOB_STATE_RUNNING] > 0 or counts[JOB_STATE_PENDING] > 0
+    
+    def run_job(self, sync_engine, job):
+        """
+        Executes a claimed job and enqueues its follow-up jobs.
+        
+        Returns:
+            int: Count reported by the sync engine
+        """
+        if job['page_type'] == JOB_CENTRE_LIST:
+            count = sync_engine.sync_all_centres()
+        elif job['page_type'] == JOB_DATEWISE_SUMMARY:
+            count = sync_engine.sync_centre_datewise_data(job['centre_name'])
+        elif job['page_type'] == JOB_FARMER_DETAILS:
+            count = sync_engine.sync_farmer_details(job['centre_name'], job['date'])
+        else:
+            raise ValueError(f"Unknown job page type: {job['page_type']}")
+        self.enqueue_follow_ups(job)
+        return count
+    
+    def enqueue_follow_ups(self, job):
+        """
+        Enqueues the jobs that follow a finished job: every centre's date-wise
+        page after the centre list, and the planned farmer-detail pages after
+        a centre's date-wise page.
+        """
+        if job['page_type'] == JOB_CENTRE_LIST:
+            self.job_repo.enqueue_jobs([
+                {
+                    'job_key': f"{JOB_DATEWISE_SUMMARY}:{centre['id']}",
+                    'page_type': JOB_DATEWISE_SUMMARY,
+                    'centre_id': centre['id'],
+                    'centre_name': centre['name'],
+                    'sync_mode': job['sync_mode'],
+                    # Date-wise pages carry today's totals
+                    'data_state': DATA_STATE_OPEN,
+                    'priority': DATA_STATE_PRIORITIES[DATA_STATE_OPEN]
+                }
+                for centre in self.centre_repo.get_all_centres()
+            ])
+        elif job['page_type'] == JOB_DATEWISE_SUMMARY:
+            planned = self.planner.plan_farmer_details(job['sync_mode'], centre_id=job['centre_id'])
+            self.job_repo.enqueue_jobs([
+                {
+                    'job_key': f"{JOB_FARMER_DETAILS}:{item['centre_id']}:{item['date']}",
+                    'page_type': JOB_FARMER_DETAILS,
+                    'centre_id': item['centre_id'],
+                    'centre_name': item['centre_name'],
+                    'date': item['date'],
+                    'sync_mode': job['sync_mode'],
+                    'data_state': item['data_state'],
+                    'priority': DATA_STATE_PRIORITIES[item['data_state']],
+                    'centre_seq': centre_seq
+                }
+                for item, centre_seq in self._rank_by_staleness(planned)
+            ])
+    
+    def _rank_by_staleness(self, planned):
+        """
+        Numbers one centre's planned pages within each data state, stalest
+        first: never fetched, then least recently checked, then newest date.
+        
+        Returns:
+            list: (item, centre_seq) pairs
+        """
+        ranked = []
+        for data_state in DATA_STATE_PRIORITIES:
+            items = [item for item in planned if item['data_state'] == data_state]
+            items.sort(key=lambda item: date_to_ordinal(item['date']) or 0, reverse=True)
+            items.sort(key=lambda item: (item['last_checked'] is not None, item['last_checked'] or ''))
+            ranked.extend((item, centre_seq) for centre_seq, item in enumerate(items))
+        return ranked
+    
+    def complete(self, job):
+        """
+        Marks a job as done.
+        """
+        self.job_repo.mark_job_done(job['id'])
+    
+    def fail(self, job, error):
+        """
+        Records a failed attempt, keeping the job queued until it runs out of
+        attempts. A retried job waits for its page type's backoff delay.
+        
+        Returns:
+            bool: True if the job will be retried
+        """
+        retry = job['attempts'] < self.max_attempts
+        retry_delay = get_retry_policy(job['page_type']).get_delay(job['attempts']) if retry else 0
+        self.job_repo.mark_job_failed(job['id'], str(error), retry, retry_delay)
+        return retry
+    
+    def get_status(self, data_state=None):
+        """
+        Returns job counts per state, optionally only for pages in one data state.
+        """
+        return self.job_repo.count_jobs_by_state(data_state)
+    
+    def get_failed_jobs(self, limit=100):
+        """
+        Returns jobs that exhausted their attempts.
+        """
+        return self.job_repo.get_failed_jobs(limit)
@@ -0,0 +1,644 @@
+# Staged fetch -> parse -> write sync pipeline
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from ..db.connection import DatabaseConnection
+from ..core.constants import DATA_STATE_OPEN
+from ..db.repositories.job_repo import JOB_STATE_DONE
+from ..parser.backends import get_parser_backend
+from .engine import SyncEngine
+from .jobs import SyncJobQueue, JOB_CENTRE_LIST, JOB_DATEWISE_SUMMARY
+
+# Marks the end of a stage's input
+_STOP = object()
+
+# Fetch stage implementations
+FETCH_MODE_THREADS = "threads"
+FETCH_MODE_ASYNC = "async"
+FETCH_MODES = (FETCH_MODE_THREADS, FETCH_MODE_ASYNC)
+
+# How long a pipeline connection waits for another stage's write lock
+BUSY_TIMEOUT_SECONDS = 30
+
+# Claims failing in a row (on a locked database, say) before the sync stops
+MAX_CLAIM_FAILURES = 10
+
+# Attempts at recording a failed job before the writer gives up on it
+FAIL_JOB_ATTEMPTS = 3
+
+def parse_page_content(page_type, html_content, url, parser_backend=None):
+    """
+    Parses a fetched page. Runs in a worker process of the parse pool.
+    
+    The page type is checked against the detected one on the same parse, so
+    a page served in place of the requested one fails the job instead of
+    being stored.
+    
+    Args:
+        parser_backend (str, optional): Parser backend name; workers do not
+                                        see settings changed at runtime, so
+                                        callers pass the one they resolved
+    
+    Returns:
+        tuple: (parsed data, seconds spent parsing)
+    """
+    start_time = time.perf_counter()
+    parsed = get_parser_backend(parser_backend).parse_expected(page_type, html_content, url)
+    return parsed, time.perf_counter() - start_time
+
+class SyncPipeline:
+    """
+    Drains the sync job queue through three stages:
+    
+    - fetcher threads claim jobs and fetch pages through the shared rate
+      limiter (or, in async mode, one thread runs many fetcher coroutines
+      over a pooled keep-alive client);
+    - a process pool parses changed pages, off the GIL of the fetchers;
+    - a single writer thread stores results and finishes jobs, committing
+      several pages per transaction.
+    
+    Queues between the stages are bounded, so a slow stage holds back the
+    stages feeding it instead of buffering pages in memory.
+    """
+    
+    def __init__(self, fetch_workers=8, parse_workers=None, write_batch_size=50,
+                 db_factory=DatabaseConnection, stop_event=None, progress_interval=30,
+                 fetch_mode=FETCH_MODE_THREADS, max_connections=10):
+        if fetch_mode not in FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode: {fetch_mode}")
+        self.fetch_mode = fetch_mode
+        # Fetcher threads, or fetcher coroutines in async mode
+        self.fetch_workers = fetch_workers
+        self.max_connections = max_connections
+        self.parse_workers = parse_workers or os.cpu_count() or 2
+        # Resolved here, since parse workers only see the settings files
+        self.parser_backend = get_parser_backend().name
+        self.write_batch_size = write_batch_size
+        self.db_factory = db_factory
+        self.stop_event = stop_event or threading.Event()
+        self.progress_interval = progress_interval
+        
+        self.parse_queue = queue.Queue(maxsize=self.parse_workers * 2)
+        self.write_queue = queue.Queue()
+        # Pages handed to the parse pool and not yet written; bounds the write queue
+        self.parse_slots = threading.BoundedSemaphore(max(self.parse_workers * 2, write_batch_size))
+        self.parsing = 0
+        
+        self.sync_engines = []
+        self.stats = {
+            'fetch': {'items': 0, 'busy_seconds': 0.0, 'workers': fetch_workers},
+            'parse': {'items': 0, 'busy_seconds': 0.0, 'workers': self.parse_workers},
+            'write': {'items': 0, 'busy_seconds': 0.0, 'workers': 1, 'batches': 0}
+        }
+        self.queue_depths = {
+            name: {'max': 0, 'total': 0, 'samples': 0}
+            for name in ('parse_queue', 'parsing', 'write_queue')
+        }
+        self.elapsed_seconds = 0.0
+        # Time-to-freshness of today's (OPEN) data
+        self.freshness = {
+            'open_pages_synced': 0,
+            'last_open_synced_seconds': None,
+            'open_jobs_outstanding': 0
+        }
+        self._start_time = None
+        self._claim_failures = 0
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+    
+    def _add_stat(self, stage, items, seconds):
+        with self._lock:
+            self.stats[stage]['items'] += items
+            self.stats[stage]['busy_seconds'] += seconds
+    
+    def _open_resources(self):
+        """
+        Opens a database connection, sync engine and job queue for the calling thread.
+        """
+        db = self.db_factory()
+        # Fetchers claim jobs while the writer commits: with WAL readers do not
+        # wait for a commit, and writers wait their turn instead of failing fast
+        conn = db.get_connection()
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_SECONDS * 1000}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        sync_engine = SyncEngine(db)
+        with self._lock:
+            self.sync_engines.append(sync_engine)
+        return db, sync_engine, SyncJobQueue(db)
+    
+    def run(self):
+        """
+        Runs the pipeline until the job queue is drained or a stop is requested.
+        """
+        start_time = self._start_time = time.perf_counter()
+        self._done.clear()
+        
+        if self.fetch_mode == FETCH_MODE_ASYNC:
+            fetchers = [threading.Thread(target=self._async_fetch_thread, name="sync-fetch-async")]
+        else:
+            fetchers = [
+                threading.Thread(target=self._fetch_worker, name=f"sync-fetch-{i}")
+                for i in range(self.fetch_workers)
+            ]
+        dispatcher = threading.Thread(target=self._parse_dispatcher, name="sync-parse")
+        writer = threading.Thread(target=self._write_worker, name="sync-write")
+        monitor = threading.Thread(target=self._monitor, name="sync-monitor", daemon=True)
+        
+        for thread in fetchers + [dispatcher, writer, monitor]:
+            thread.start()
+        
+        for thread in fetchers:
+            thread.join()
+        self.parse_queue.put(_STOP)
+        dispatcher.join()
+        writer.join()
+        
+        self._done.set()
+        self.elapsed_seconds = time.perf_counter() - start_time
+    
+    def stop(self):
+        """
+        Stops claiming new jobs; pages already fetched are still parsed and written.
+        """
+        self.stop_event.set()
+    
+    def _fetch_worker(self):
+        """
+        Fetch stage: claims jobs and fetches their pages.
+        """
+        db, sync_engine, job_queue = self._open_resources()
+        try:
+            while not self.stop_event.is_set():
+                job, drained = self._claim(job_queue)
+                if drained:
+                    break
+                if job is None:
+                    time.sleep(0.2)
+                    continue
+                
+                start_time = time.perf_counter()
+                item = {'job': job, 'url': None, 'centre': None}
+                try:
+                    item['url'], item['centre'] = sync_engine.get_page_url(
+                        job['page_type'], job['centre_name'], job['date']
+                    )
+                    if item['url']:
+                        self._set_fetch_result(item, sync_engine.fetch_page(
+                            item['url'], page_type=job['page_type']
+                        ))
+                except Exception as e:
+                    item['error'] = e
+                self._add_stat('fetch', 1, time.perf_counter() - start_time)
+                self._route_fetched(item)
+        finally:
+            sync_engine.close()
+            db.close()
+    
+    def _async_fetch_thread(self):
+        """
+        Fetch stage in async mode: runs the fetcher coroutines on one event loop.
+        """
+        asyncio.run(self._async_fetch_main())
+    
+    async def _async_fetch_main(self):
+        """
+        Runs fetch_workers fetcher coroutines sharing one connection pool.
+        """
+        from ..fetcher.async_client import AsyncHTTPClient
+        db, sync_engine, job_queue = self._open_resources()
+        async_client = AsyncHTTPClient(self.max_connections)
+        try:
+            await asyncio.gather(*[
+                self._async_fetch_worker(sync_engine, job_queue, async_client)
+                for _ in range(self.fetch_workers)
+            ])
+        finally:
+            await async_client.close()
+            sync_engine.close()
+            db.close()
+    
+    async def _async_fetch_worker(self, sync_engine, job_queue, async_client):
+        """
+        Fetcher coroutine: claims jobs and fetches their pages. Database calls
+        are short and run on the event loop thread itself.
+        """
+        while not self.stop_event.is_set():
+            job, drained = self._claim(job_queue)
+            if drained:
+                break
+            if job is None:
+                await asyncio.sleep(0.2)
+                continue
+            
+            start_time = time.perf_counter()
+            item = {'job': job, 'url': None, 'centre': None}
+            try:
+                item['url'], item['centre'] = sync_engine.get_page_url(
+                    job['page_type'], job['centre_name'], job['date']
+                )
+                if item['url']:
+                    self._set_fetch_result(item, await sync_engine.fetch_page_async(
+                        async_client, item['url'], page_type=job['page_type']
+                    ))
+            except Exception as e:
+                item['error'] = e
+            self._add_stat('fetch', 1, time.perf_counter() - start_time)
+            
+            # Wait for room in the parse queue without blocking the event loop
+            while True:
+                try:
+                    self._route_fetched(item, block=False)
+                    break
+                except queue.Full:
+                    await asyncio.sleep(0.05)
+    
+    def _claim(self, job_queue):
+        """
+        Claims the next job for a fetcher. A claim that fails on the database
+        is rolled back and tried again later; after MAX_CLAIM_FAILURES
+        failures in a row the sync is stopped.
+        
+        Returns:
+            tuple: (claimed job or None, whether no job is left to claim)
+        """
+        try:
+            job = job_queue.claim()
+            # Jobs still in flight may enqueue follow-up work, and
+            # failed jobs may be waiting out their retry delay
+            drained = job is None and not job_queue.has_unfinished_jobs()
+        except Exception as e:
+            with self._lock:
+                self._claim_failures += 1
+                failures = self._claim_failures
+            if failures >= MAX_CLAIM_FAILURES:
+                print(f"Error: Failed to claim sync jobs {failures} times in a row, stopping the sync: {e}")
+                self.stop_event.set()
+            else:
+                print(f"Warning: Failed to claim a sync job, retrying: {e}")
+            return None, False
+        with self._lock:
+            self._claim_failures = 0
+        return job, drained
+    
+    def _set_fetch_result(self, item, result):
+        html_content, item['html_hash'], changed, item['validators'] = result
+        if changed:
+            item['html_content'] = html_content
+    
+    def _route_fetched(self, item, block=True):
+        """
+        Sends a fetched page to the parse queue, or straight to the writer if
+        it is unchanged, unresolvable or failed.
+        """
+        if 'html_content' in item:
+            self.parse_queue.put(item, block=block)
+        else:
+            self.write_queue.put(item)
+    
+    def _parse_dispatcher(self):
+        """
+        Parse stage: hands fetched pages to the process pool. Results reach the
+        writer in completion order.
+        
+        A page that cannot be submitted fails its own job; when a parse worker
+        dies (out of memory on a large page, say), the pool is replaced. The
+        writer always gets its stop marker, after every submitted page.
+        """
+        context = multiprocessing.get_context('spawn')
+        executor = ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=context)
+        item = None
+        try:
+            while True:
+                item = self.parse_queue.get()
+                if item is _STOP:
+                    item = None
+                    break
+                
+                self.parse_slots.acquire()
+                with self._lock:
+                    self.parsing += 1
+                html_content = item.pop('html_content')
+                try:
+                    future = executor.submit(
+                        parse_page_content, item['job']['page_type'], html_content, item['url'], self.parser_backend
+                    )
+                except BrokenProcessPool as e:
+                    print(f"Warning: Parse pool broke, starting a new one: {e}")
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=context)
+                    item['error'] = e
+                    self._parse_done(item)
+                    item = None
+                    continue
+                except Exception as e:
+                    item['error'] = e
+                    self._parse_done(item)
+                    item = None
+                    continue
+                future.add_done_callback(lambda future, item=item: self._parsed(item, future))
+                item = None
+        except Exception as e:
+            # Without a dispatcher the fetchers would block on the full parse
+            # queue: stop claiming jobs and fail the pages already queued
+            print(f"Error: Parse dispatcher failed, stopping the sync: {e}")
+            self.stop_event.set()
+            if item is not None:
+                self._fail_queued_page(item, e)
+            self._drain_parse_queue(e)
+        finally:
+            # Waits for the pages in the pool, whose callbacks queue them for the writer
+            executor.shutdown(wait=True)
+            self.write_queue.put(_STOP)
+    
+    def _drain_parse_queue(self, error):
+        """
+        Sends every page still waiting for the parse stage to the writer as failed.
+        """
+        while True:
+            item = self.parse_queue.get()
+            if item is _STOP:
+                return
+            self._fail_queued_page(item, error)
+    
+    def _fail_queued_page(self, item, error):
+        item.pop('html_content', None)
+        item['error'] = error
+        self.write_queue.put(item)
+    
+    def _parsed(self, item, future):
+        """
+        Moves a parsed page to the write queue.
+        """
+        try:
+            item['parsed'], seconds = future.result()
+            self._add_stat('parse', 1, seconds)
+        except Exception as e:
+            item['error'] = e
+        self._parse_done(item)
+    
+    def _parse_done(self, item):
+        """
+        Releases a page's place in the parse stage and sends it to the writer;
+        the writer frees its parse slot once the page is stored.
+        """
+        with self._lock:
+            self.parsing -= 1
+        item['parse_slot'] = True
+        self.write_queue.put(item)
+    
+    def _write_worker(self):
+        """
+        Write stage: stores pages and finishes their jobs in batched transactions.
+        
+        A batch that cannot be written fails its unfinished jobs and the writer
+        moves on. Should the writer itself fail, the sync is stopped and the
+        pages still queued for it are drained, so no stage waits on it.
+        """
+        stopping = False
+        try:
+            db, sync_engine, job_queue = self._open_resources()
+            try:
+                while not stopping:
+                    batch = [self.write_queue.get()]
+                    while len(batch) < self.write_batch_size:
+                        try:
+                            batch.append(self.write_queue.get_nowait())
+                        except queue.Empty:
+                            break
+                    if _STOP in batch:
+                        stopping = True
+                        batch.remove(_STOP)
+                    if not batch:
+                        continue
+                    
+                    start_time = time.perf_counter()
+                    try:
+                        self._write_batch(db, sync_engine, job_queue, batch)
+                    except Exception as e:
+                        print(f"Error: Failed to write a batch of {len(batch)} pages: {e}")
+                        self._fail_batch(job_queue, batch, e)
+                    finally:
+                        for item in batch:
+                            if item.get('parse_slot'):
+                                self.parse_slots.release()
+                    
+                    self._add_stat('write', len(batch), time.perf_counter() - start_time)
+                    with self._lock:
+                        self.stats['write']['batches'] += 1
+                
+                try:
+                    counts = job_queue.get_status(DATA_STATE_OPEN)
+                    self.freshness['open_jobs_outstanding'] = sum(
+                        count for state, count in counts.items() if state != JOB_STATE_DONE
+                    )
+                except Exception as e:
+                    print(f"Warning: Failed to count outstanding OPEN jobs: {e}")
+            finally:
+                sync_engine.close()
+                db.close()
+        except Exception as e:
+            print(f"Error: Sync writer failed, stopping the sync: {e}")
+            self.stop_event.set()
+            if not stopping:
+                self._drain_write_queue()
+    
+    def _write_batch(self, db, sync_engine, job_queue, batch):
+        """
+        Stores a batch of pages in one transaction and fails the jobs of pages
+        that could not be fetched or parsed. Pages whose job is finished are
+        marked 'finished'.
+        """
+        pages = []
+        for item in batch:
+            if 'error' in item:
+                self._archive_failed_page(sync_engine, item)
+                self._fail_job(job_queue, item['job'], item['error'])
+                item['finished'] = True
+            else:
+                pages.append(item)
+        # Counters of pages written before a failure would survive the rollback
+        report_before = dict(sync_engine.report)
+        try:
+            with db.transaction():
+                for item in pages:
+                    self._write_item(sync_engine, job_queue, item)
+            written = pages
+            for item in pages:
+                item['finished'] = True
+        except Exception:
+            # Retry the batch page by page so one bad page only fails its own job
+            sync_engine.report.update(report_before)
+            written = []
+            for item in pages:
+                try:
+                    with db.transaction():
+                        self._write_item(sync_engine, job_queue, item)
+                    written.append(item)
+                except Exception as e:
+                    self._fail_job(job_queue, item['job'], e)
+                item['finished'] = True
+        self._record_freshness(written)
+    
+    def _fail_batch(self, job_queue, batch, error):
+        """
+        Fails the jobs a failed batch left unfinished. A job left RUNNING would
+        keep the fetchers waiting for it, so if its failure cannot be recorded
+        either, the sync is stopped and the next run requeues the job.
+        """
+        for item in batch:
+            if item.get('finished'):
+                continue
+            for attempt in range(1, FAIL_JOB_ATTEMPTS + 1):
+                try:
+                    self._fail_job(job_queue, item['job'], error)
+                    break
+                except Exception as e:
+                    if attempt == FAIL_JOB_ATTEMPTS:
+                        print(f"Error: Failed to record a failed sync job, stopping the sync: {e}")
+                        self.stop_event.set()
+                    else:
+                        time.sleep(1.0)
+    
+    def _drain_write_queue(self):
+        """
+        Frees the parse slots of the pages left for a failed writer, up to its stop marker.
+        """
+        while True:
+            item = self.write_queue.get()
+            if item is _STOP:
+                return
+            if item.get('parse_slot'):
+                self.parse_slots.release()
+    
+    def _write_item(self, sync_engine, job_queue, item):
+        """
+        Stores one page and finishes its job.
+        """
+        job = item['job']
+        if 'parsed' in item:
+            if job['page_type'] == JOB_CENTRE_LIST:
+                sync_engine.store_centre_list(item['parsed'], item['html_hash'], item['validators'])
+            elif job['page_type'] == JOB_DATEWISE_SUMMARY:
+                sync_engine.store_datewise_summary(item['centre'], item['parsed'], item['html_hash'], item['validators'])
+            else:
+                sync_engine.store_farmer_details(
+                    item['centre'], job['date'], item['url'], item['parsed'], item['html_hash'],
+                    item['validators']
+                )
+        elif item['url']:
+            # Same content as last time: only the check time changes
+            sync_engine.mark_page_unchanged(
+                item['url'], job['page_type'], item['html_hash'], item['validators'], job['date']
+            )
+        
+        job_queue.enqueue_follow_ups(job)
+        job_queue.complete(job)
+    
+    def _record_freshness(self, written):
+        """
+        Notes when the latest page of today's (OPEN) data was stored or found unchanged.
+        """
+        open_pages = sum(1 for item in written if item['job'].get('data_state') == DATA_STATE_OPEN)
+        if open_pages:
+            with self._lock:
+                self.freshness['open_pages_synced'] += open_pages
+                self.freshness['last_open_synced_seconds'] = time.perf_counter() - self._start_time
+    
+    def _archive_failed_page(self, sync_engine, item):
+        """
+        Records the archived version of a page that was fetched but could not
+        be parsed, so it can be re-parsed from the archive once the parser is fixed.
+        """
+        if not item.get('html_hash'):
+            return
+        try:
+            sync_engine.archive.record_version(
+                item['url'], item['job']['page_type'], item['html_hash'],
+                item['job']['date'], item.get('validators')
+            )
+        except Exception as e:
+            print(f"Warning: Failed to archive {item['url']}: {e}")
+    
+    def _fail_job(self, job_queue, job, error):
+        """
+        Records a failed attempt for a job.
+        """
+        label = " ".join(str(part) for part in (job['page_type'], job['centre_name'], job['date']) if part)
+        retry = job_queue.fail(job, error)
+        print(f"Error processing {label} (attempt {job['attempts']}, {'will retry' if retry else 'giving up'}): {error}")
+    
+    def _sample_queue_depths(self):
+        with self._lock:
+            depths = {
+                'parse_queue': self.parse_queue.qsize(),
+                'parsing': self.parsing,
+                'write_queue': self.write_queue.qsize()
+            }
+            for name, depth in depths.items():
+                sample = self.queue_depths[name]
+                sample['max'] = max(sample['max'], depth)
+                sample['total'] += depth
+                sample['samples'] += 1
+        return depths
+    
+    def _monitor(self):
+        """
+        Samples queue depths every second and prints them periodically.
+        """
+        last_print = time.perf_counter()
+        while not self._done.wait(1.0):
+            depths = self._sample_queue_depths()
+            if self.progress_interval and time.perf_counter() - last_print >= self.progress_interval:
+                last_print = time.perf_counter()
+                print(
+                    f"Pipeline: fetched {self.stats['fetch']['items']}, parsed {self.stats['parse']['items']}, "
+                    f"written {self.stats['write']['items']}; parse queue {depths['parse_queue']}, "
+                    f"parsing {depths['parsing']}, write queue {depths['write_queue']}"
+                )
+    
+    def get_report(self):
+        """
+        Combines the page counters of every sync engine used by the pipeline.
+        """
+        report = {}
+        with self._lock:
+            for sync_engine in self.sync_engines:
+                for key, value in sync_engine.get_report().items():
+                    report[key] = report.get(key, 0) + value
+        return report
+    
+    def get_stats(self):
+        """
+        Returns per-stage throughput and utilisation, queue depths, and the
+        time-to-freshness of today's data: seconds from the start of the run
+        until the last OPEN page was stored or found unchanged, or None while OPEN jobs are
+        still queued or failed.
+        
+        Returns:
+            dict: 'elapsed_seconds', 'stages', 'queues' and 'freshness'
+        """
+        elapsed = self.elapsed_seconds or 1e-9
+        with self._lock:
+            stages = {}
+            for name, stat in self.stats.items():
+                stages[name] = dict(stat)
+                stages[name]['per_second'] = stat['items'] / elapsed
+                stages[name]['utilisation'] = stat['busy_seconds'] / (elapsed * stat['workers'])
+            queues = {
+                name: {
+                    'max': sample['max'],
+                    'mean': sample['total'] / sample['samples'] if sample['samples'] else 0.0
+                }
+                for name, sample in self.queue_depths.items()
+            }
+            freshness = dict(self.freshness)
+        freshness['today_fresh_after_seconds'] = (
+            freshness['last_open_synced_seconds'] if not freshness['open_jobs_outstanding'] else None
+        )
+        return {'elapsed_seconds': self.elapsed_seconds, 'stages': stages, 'queues': queues, 'freshness': freshness}
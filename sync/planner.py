@@ -0,0 +1,108 @@
+# Freshness-driven incremental sync planning
+
+from datetime import date as date_cls
+from ..config.sync import SyncConfig
+from ..core.constants import DATA_STATE_OPEN, DATA_STATE_CLOSING, DATA_STATE_CLOSED
+
+# Sync modes named in config/sync.yaml
+SYNC_MODE_MISSING_ONLY = "missing_only"
+SYNC_MODE_STALE_ONLY = "stale_only"
+SYNC_MODE_FULL = "full"
+
+SYNC_MODES = (SYNC_MODE_MISSING_ONLY, SYNC_MODE_STALE_ONLY, SYNC_MODE_FULL)
+
+class SyncPlanner:
+    """
+    Plans which farmer-detail pages need fetching from the current DB state.
+    """
+    
+    def __init__(self, db_connection):
+        self.db_conn = db_connection
+        self.sync_config = SyncConfig()
+    
+    def plan_farmer_details(self, mode=None, today=None, centre_id=None):
+        """
+        Returns the (centre, date) pairs whose farmer-detail page should be fetched.
+        
+        The data state of each date follows FreshnessManager.determine_data_state:
+        today or later is OPEN, the previous six days are CLOSING and anything
+        older is CLOSED. Everything is decided in a single query.
+        
+        Args:
+            mode (str, optional): 'missing_only' (never fetched), 'stale_only'
+                (never fetched or past its freshness threshold) or 'full'.
+                Defaults to the configured default_sync_mode.
+            today (date, optional): Reference date, defaults to the current date
+            centre_id (int, optional): Only plan dates of this centre
+            
+        Returns:
+            list: Planned items with centre_id, centre_name, date, details_url,
+                  data_state and last_checked
+        """
+        mode = mode or self.sync_config.default_sync_mode
+        if mode not in SYNC_MODES:
+            raise ValueError(f"Unknown sync mode: {mode}")
+        
+        today_ordinal = (today or date_cls.today()).toordinal()
+        closing_start = today_ordinal - 6
+        
+        query = """
+        SELECT
+            c.id,
+            c.name,
+            ds.date,
+            ds.details_url,
+            CASE
+                WHEN ds.date_ordinal >= ? THEN ?
+                WHEN ds.date_ordinal >= ? THEN ?
+                ELSE ?
+            END AS data_state,
+            ph.last_checked
+        FROM datewise_summaries ds
+        JOIN centres c ON ds.centre_id = c.id
+        LEFT JOIN page_hashes ph ON ph.url = ds.details_url
+        WHERE ds.details_url IS NOT NULL
+        """
+        params = [
+            today_ordinal, DATA_STATE_OPEN,
+            closing_start, DATA_STATE_CLOSING,
+            DATA_STATE_CLOSED
+        ]
+        
+        if centre_id:
+            query += " AND ds.centre_id = ?"
+            params.append(centre_id)
+        
+        if mode == SYNC_MODE_MISSING_ONLY:
+            query += " AND ph.last_checked IS NULL"
+        elif mode == SYNC_MODE_STALE_ONLY:
+            thresholds = self.sync_config.freshness_thresholds
+            query += """
+            AND (
+                ph.last_checked IS NULL
+                OR (ds.date_ordinal >= ? AND ph.last_checked < datetime('now', ?))
+                OR (ds.date_ordinal >= ? AND ds.date_ordinal < ? AND ph.last_checked < datetime('now', ?))
+                OR (ds.date_ordinal < ? AND ph.last_checked < datetime('now', ?))
+            )
+            """
+            params.extend([
+                today_ordinal, f"-{thresholds['open']} hours",
+                closing_start, today_ordinal, f"-{thresholds['closing']} hours",
+                closing_start, f"-{thresholds['closed']} hours"
+            ])
+        
+        query += " ORDER BY c.name, ds.date_ordinal"
+        
+        results = self.db_conn.execute_query(query, params)
+        
+        return [
+            {
+                'centre_id': row[0],
+                'centre_name': row[1],
+                'date': row[2],
+                'details_url': row[3],
+                'data_state': row[4],
+                'last_checked': row[5]
+            }
+            for row in results
+        ]
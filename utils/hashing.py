@@ -47,4 +47,23 @@ def compute_file_hash(file_path):
         return sha256_hash.hexdigest()
     except IOError as e:
         print(f"Error reading file {file_path}: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def compute_row_fingerprint(values):
+    """
+    Computes a fingerprint of a database row's values.
+    
+    Values are typed, so '12' and 12 differ, and the result is the same for
+    parsed values and the values read back from SQLite.
+    
+    Args:
+        values (iterable): Column values of the row
+        
+    Returns:
+        str: 128-bit BLAKE2b hash of the values
+    """
+    fingerprint = hashlib.blake2b(digest_size=16)
+    for value in values:
+        fingerprint.update(repr(value).encode('utf-8'))
+        fingerprint.update(b'\x1f')
+    return fingerprint.hexdigest()
\ No newline at end of file
@@ -1,6 +1,7 @@
 # Time helpers
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 from ..core.constants import DATE_FORMAT
 
 def get_current_timestamp():
@@ -27,6 +28,48 @@ def parse_date(date_str):
     except ValueError:
         return None
 
+@lru_cache(maxsize=4096)
+def date_to_ordinal(date_str):
+    """
+    Converts a DD/MM/YYYY date string to its proleptic Gregorian day ordinal.
+    
+    Day ordinals sort chronologically, unlike DD/MM/YYYY text, and are stored
+    alongside the text date so range filters can use an index. Results are
+    cached: every stored row converts its date, and the dates repeat.
+    
+    Args:
+        date_str (str): Date string in DD/MM/YYYY format
+        
+    Returns:
+        int: Day ordinal or None if invalid
+    """
+    date_obj = parse_date(date_str) if date_str else None
+    if not date_obj:
+        return None
+    return date_obj.toordinal()
+
+def range_bound_ordinal(date_str, name):
+    """
+    Converts the bound of a date range filter to its day ordinal.
+    
+    Unlike date_to_ordinal, a malformed date is an error here: compared with
+    NULL, the filter would silently match no rows.
+    
+    Args:
+        date_str (str): Date string in DD/MM/YYYY format
+        name (str): Name of the filter, for the error message
+        
+    Returns:
+        int: Day ordinal
+    
+    Raises:
+        ValueError: If the date is not a valid DD/MM/YYYY date
+    """
+    ordinal = date_to_ordinal(date_str)
+    if ordinal is None:
+        raise ValueError(f"Invalid {name}: must be in DD/MM/YYYY format")
+    return ordinal
+
 def format_date(date_obj):
     """
     Formats a datetime object to DD/MM/YYYY string format.